@@ -13,7 +13,7 @@ if BASE_DIR not in sys.path:
 
 from app.core.config import get_settings
 from app.db.base import Base
-from app.models import skill  # noqa: F401
+from app.models import llm_cache, skill  # noqa: F401
 
 config = context.config
 
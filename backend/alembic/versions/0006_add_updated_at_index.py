@@ -0,0 +1,24 @@
+"""add skills.updated_at index
+
+Revision ID: 0006_add_updated_at_index
+Revises: 0005_add_performance_indexes
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_add_updated_at_index"
+down_revision = "0005_add_performance_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets the in-process search index poll for rows changed since its watermark.
+    op.create_index("ix_skills_updated_at", "skills", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_skills_updated_at", table_name="skills")
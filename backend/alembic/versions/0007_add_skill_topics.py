@@ -0,0 +1,53 @@
+"""add skill_topics join table
+
+Revision ID: 0007_add_skill_topics
+Revises: 0006_add_updated_at_index
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_add_skill_topics"
+down_revision = "0006_add_updated_at_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    skill_topics = op.create_table(
+        "skill_topics",
+        sa.Column(
+            "skill_id",
+            sa.Integer(),
+            sa.ForeignKey("skills.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("topic", sa.String(length=100), primary_key=True),
+    )
+    op.create_index(
+        "ix_skill_topics_topic_skill",
+        "skill_topics",
+        ["topic", "skill_id"],
+        unique=False,
+    )
+
+    # Backfill from the denormalized comma-separated column.
+    conn = op.get_bind()
+    rows = []
+    for skill_id, topics in conn.execute(sa.text("SELECT id, topics FROM skills")):
+        seen = set()
+        for item in (topics or "").split(","):
+            topic = item.strip().lower()
+            if topic and topic not in seen:
+                seen.add(topic)
+                rows.append({"skill_id": skill_id, "topic": topic})
+    if rows:
+        op.bulk_insert(skill_topics, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_skill_topics_topic_skill", table_name="skill_topics")
+    op.drop_table("skill_topics")
@@ -0,0 +1,41 @@
+"""add skill_related table
+
+Revision ID: 0008_add_skill_related
+Revises: 0007_add_skill_topics
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0008_add_skill_related"
+down_revision = "0007_add_skill_topics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by the tasks.related_refresh Celery task; empty until first run.
+    op.create_table(
+        "skill_related",
+        sa.Column(
+            "skill_id",
+            sa.Integer(),
+            sa.ForeignKey("skills.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("rank", sa.Integer(), primary_key=True),
+        sa.Column(
+            "related_id",
+            sa.Integer(),
+            sa.ForeignKey("skills.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("skill_related")
@@ -0,0 +1,27 @@
+"""add skills.sync_fingerprint
+
+Revision ID: 0009_add_sync_fingerprint
+Revises: 0008_add_skill_related
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009_add_sync_fingerprint"
+down_revision = "0008_add_skill_related"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows; the next sync fills it in.
+    op.add_column(
+        "skills", sa.Column("sync_fingerprint", sa.String(length=64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("skills", "sync_fingerprint")
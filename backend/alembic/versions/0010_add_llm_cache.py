@@ -0,0 +1,45 @@
+"""add llm_cache table
+
+Revision ID: 0010_add_llm_cache
+Revises: 0009_add_sync_fingerprint
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010_add_llm_cache"
+down_revision = "0009_add_sync_fingerprint"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache",
+        sa.Column("model", sa.String(length=100), primary_key=True),
+        sa.Column("prompt_version", sa.String(length=32), primary_key=True),
+        sa.Column("input_hash", sa.String(length=64), primary_key=True),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_llm_cache_last_used_at", "llm_cache", ["last_used_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_last_used_at", table_name="llm_cache")
+    op.drop_table("llm_cache")
@@ -0,0 +1,34 @@
+"""add skills.translation_failures and skills.translation_retry_at
+
+Revision ID: 0011_add_translation_backoff
+Revises: 0010_add_llm_cache
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0011_add_translation_backoff"
+down_revision = "0010_add_llm_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "skills",
+        sa.Column(
+            "translation_failures", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column(
+        "skills",
+        sa.Column("translation_retry_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("skills", "translation_retry_at")
+    op.drop_column("skills", "translation_failures")
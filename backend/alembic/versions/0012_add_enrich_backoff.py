@@ -0,0 +1,32 @@
+"""add skills.enrich_failures and skills.enrich_retry_at
+
+Revision ID: 0012_add_enrich_backoff
+Revises: 0011_add_translation_backoff
+Create Date: 2026-10-17
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0012_add_enrich_backoff"
+down_revision = "0011_add_translation_backoff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "skills",
+        sa.Column("enrich_failures", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "skills",
+        sa.Column("enrich_retry_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("skills", "enrich_retry_at")
+    op.drop_column("skills", "enrich_failures")
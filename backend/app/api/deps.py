@@ -0,0 +1,17 @@
+import hmac
+
+from fastapi import HTTPException, Request
+
+from app.core.config import get_settings
+
+
+def require_internal_token(request: Request) -> None:
+    """Require ``Authorization: Bearer $INTERNAL_METRICS_TOKEN``.
+
+    Denies every request while the token is unset, so operator endpoints are
+    never public by accident.
+    """
+    expected = get_settings().internal_metrics_token
+    token = request.headers.get("Authorization", "")
+    if not expected or not hmac.compare_digest(token, f"Bearer {expected}"):
+        raise HTTPException(status_code=403, detail="Forbidden")
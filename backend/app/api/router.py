@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import facets, health, metrics, skills, stats
+from app.api.routes import facets, health, internal, metrics, skills, stats
 
 api_router = APIRouter()
 api_router.include_router(health.router)
@@ -8,3 +8,4 @@ api_router.include_router(metrics.router)
 api_router.include_router(skills.router)
 api_router.include_router(facets.router)
 api_router.include_router(stats.router)
+api_router.include_router(internal.router)
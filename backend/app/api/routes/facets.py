@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, Query, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.cache import cache_control
+from app.core.cache import cache_control, catalog_etag, etag, response_cache
 from app.core.config import get_settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.schemas.facets import FacetItem, FacetList
 from app.services.facets_service import (
-    list_top_languages,
-    list_top_owners,
-    list_top_topics,
+    list_top_languages_async,
+    list_top_owners_async,
+    list_top_topics_async,
 )
 
 router = APIRouter(prefix="/facets", tags=["facets"])
@@ -16,42 +16,51 @@ router = APIRouter(prefix="/facets", tags=["facets"])
 
 @router.get("/topics", response_model=FacetList)
 @cache_control(3600)  # Cache for 1 hour
-def list_topics(
+@etag(catalog_etag)
+@response_cache(3600, FacetList)
+async def list_topics(
+    request: Request,
     response: Response,
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db),  # noqa: B008
+    db: AsyncSession = Depends(get_async_db),  # noqa: B008
     settings=Depends(get_settings),  # noqa: B008
 ) -> FacetList:
     items = [
         FacetItem(value=value, count=count)
-        for value, count in list_top_topics(db, limit, settings)
+        for value, count in await list_top_topics_async(db, limit, settings)
     ]
     return FacetList(items=items)
 
 
 @router.get("/languages", response_model=FacetList)
 @cache_control(3600)  # Cache for 1 hour
-def list_languages(
+@etag(catalog_etag)
+@response_cache(3600, FacetList)
+async def list_languages(
+    request: Request,
     response: Response,
     limit: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db),  # noqa: B008
+    db: AsyncSession = Depends(get_async_db),  # noqa: B008
 ) -> FacetList:
     items = [
         FacetItem(value=value, count=count)
-        for value, count in list_top_languages(db, limit)
+        for value, count in await list_top_languages_async(db, limit)
     ]
     return FacetList(items=items)
 
 
 @router.get("/owners", response_model=FacetList)
 @cache_control(3600)  # Cache for 1 hour
-def list_owners(
+@etag(catalog_etag)
+@response_cache(3600, FacetList)
+async def list_owners(
+    request: Request,
     response: Response,
     limit: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db),  # noqa: B008
+    db: AsyncSession = Depends(get_async_db),  # noqa: B008
 ) -> FacetList:
     items = [
         FacetItem(value=value, count=count)
-        for value, count in list_top_owners(db, limit)
+        for value, count in await list_top_owners_async(db, limit)
     ]
     return FacetList(items=items)
@@ -7,5 +7,5 @@ router = APIRouter(prefix="/health", tags=["health"])
 
 @router.get("")
 @cache_control(60)  # Cache for 1 minute
-def health(response: Response) -> dict:
+async def health(response: Response) -> dict:
     return {"status": "ok"}
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import require_internal_token
+from app.core import query_stats
+from app.middleware.timing import render_prometheus
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_internal_token)],
+)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        render_prometheus() + query_stats.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
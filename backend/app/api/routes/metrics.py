@@ -1,26 +1,56 @@
-from fastapi import APIRouter, Header, Response
+from typing import Literal
 
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import require_internal_token
 from app.core.cache import cache_control
 from app.core.config import get_settings
-from app.schemas.metrics import MetricsOut
-from app.services.metrics_service import get_metrics, track_skill_visit, track_visit
+from app.core.database import get_db
+from app.schemas.metrics import (
+    MetricsOut,
+    TrendingSkill,
+    TrendingSkillList,
+    UVWindowOut,
+)
+from app.schemas.skill import SkillOut
+from app.services.metrics_service import (
+    UV_MAX_WINDOW_DAYS,
+    get_metrics,
+    get_trending_skills,
+    get_uv,
+    metrics_buffer,
+    track_skill_visit,
+    track_visit,
+)
+from app.services.skill_service import load_skills_in_order
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
 
+# Beacons only append to the in-process metrics buffer, so they run on the
+# event loop; with the buffer disabled they write Redis synchronously and are
+# moved to the threadpool like the Redis-reading routes below.
 @router.post("/track")
-def track_metrics(x_visitor_id: str | None = Header(default=None)) -> dict:
+async def track_metrics(x_visitor_id: str | None = Header(default=None)) -> dict:
     settings = get_settings()
-    track_visit(settings, x_visitor_id)
+    if settings.metrics_buffer_enabled:
+        track_visit(settings, x_visitor_id)
+    else:
+        await run_in_threadpool(track_visit, settings, x_visitor_id)
     return {"ok": True}
 
 
 @router.post("/skills/{skill_id}/track")
-def track_skill_metrics(
+async def track_skill_metrics(
     skill_id: int, x_visitor_id: str | None = Header(default=None)
 ) -> dict:
     settings = get_settings()
-    track_skill_visit(settings, skill_id, x_visitor_id)
+    if settings.metrics_buffer_enabled:
+        track_skill_visit(settings, skill_id, x_visitor_id)
+    else:
+        await run_in_threadpool(track_skill_visit, settings, skill_id, x_visitor_id)
     return {"ok": True}
 
 
@@ -30,3 +60,43 @@ def read_metrics(response: Response) -> MetricsOut:
     settings = get_settings()
     pv, uv = get_metrics(settings)
     return MetricsOut(pv=pv, uv=uv)
+
+
+@router.get("/uv", response_model=UVWindowOut)
+@cache_control(300)
+def read_uv(
+    response: Response,
+    days: int = Query(default=7, ge=1, le=UV_MAX_WINDOW_DAYS),
+    skill_id: int | None = Query(default=None),
+) -> UVWindowOut:
+    settings = get_settings()
+    return UVWindowOut(
+        days=days, uv=get_uv(settings, days, skill_id), skill_id=skill_id
+    )
+
+
+@router.get("/skills/top", response_model=TrendingSkillList)
+@cache_control(60)
+def read_top_skills(
+    response: Response,
+    window: Literal["24h", "7d"] = Query("24h"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),  # noqa: B008
+) -> TrendingSkillList:
+    settings = get_settings()
+    ranked = get_trending_skills(settings, window, limit)
+    scores = dict(ranked)
+    skills = load_skills_in_order(db, [skill_id for skill_id, _ in ranked])
+    return TrendingSkillList(
+        window=window,
+        items=[
+            TrendingSkill(score=scores[skill.id], skill=SkillOut.model_validate(skill))
+            for skill in skills
+        ],
+    )
+
+
+@router.get("/buffer", dependencies=[Depends(require_internal_token)])
+def read_metrics_buffer() -> dict:
+    """Write-behind buffer counters for this process."""
+    return metrics_buffer.stats()
@@ -1,24 +1,39 @@
 from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.cache import cache_control
+from app.core.cache import cache_control, catalog_etag, etag, response_cache
 from app.core.config import get_settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.schemas.skill import SkillList, SkillOut
 from app.services.github_service import sync_github_skills
 from app.services.skill_service import (
-    get_related_skills,
-    get_skill_by_full_name,
-    search_skills,
+    get_skill_by_full_name_async,
+    get_skill_version_async,
+    lookup_related_skills_async,
+    search_skills_page_async,
 )
+from app.tasks.github_sync import send_post_sync_tasks
 
 router = APIRouter(prefix="/skills", tags=["skills"])
 
 
+async def _skill_etag(kwargs: dict) -> str | None:
+    # A cached body only changes with the catalog version, so with the response
+    # cache on that is the token and a cache hit never touches the database.
+    if get_settings().response_cache_enabled:
+        token = await catalog_etag(kwargs)
+        if token is not None:
+            return token
+    full_name = f"{kwargs['owner']}/{kwargs['repo']}"
+    return await get_skill_version_async(kwargs["db"], full_name)
+
+
 @router.get("", response_model=SkillList)
-def list_skills(
+@response_cache(60, SkillList)
+async def list_skills(
     q: str | None = None,
     topic: str | None = None,
     language: str | None = None,
@@ -26,31 +41,46 @@ def list_skills(
     sort: Literal["stars", "newest"] = Query("stars"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),  # noqa: B008
+    cursor: str | None = None,
+    count: Literal["exact", "cached", "none"] = Query("exact"),
+    db: AsyncSession = Depends(get_async_db),  # noqa: B008
 ):
-    total, items = search_skills(
-        db,
-        q,
-        topic=topic,
-        language=language,
-        owner=owner,
-        sort=sort,
-        limit=limit,
-        offset=offset,
+    try:
+        page = await search_skills_page_async(
+            db,
+            q,
+            topic=topic,
+            language=language,
+            owner=owner,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count=count,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    return SkillList(
+        total=page.total,
+        items=page.items,
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
     )
-    return SkillList(total=total, items=items)
 
 
 @router.get("/{owner}/{repo}", response_model=SkillOut)
 @cache_control(86400)  # Cache for 24 hours
-def read_skill(
+@etag(_skill_etag)
+@response_cache(86400, SkillOut)
+async def read_skill(
+    request: Request,
     response: Response,
     owner: str,
     repo: str,
-    db: Session = Depends(get_db),  # noqa: B008
+    db: AsyncSession = Depends(get_async_db),  # noqa: B008
 ) -> SkillOut:
     full_name = f"{owner}/{repo}"
-    skill = get_skill_by_full_name(db, full_name)
+    skill = await get_skill_by_full_name_async(db, full_name)
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     return skill
@@ -58,18 +88,21 @@ def read_skill(
 
 @router.get("/{owner}/{repo}/related", response_model=SkillList)
 @cache_control(3600)  # Cache for 1 hour
-def related_skills(
+@etag(catalog_etag)
+@response_cache(3600, SkillList)
+async def related_skills(
+    request: Request,
     response: Response,
     owner: str,
     repo: str,
     limit: int = Query(6, ge=1, le=20),
-    db: Session = Depends(get_db),  # noqa: B008
+    db: AsyncSession = Depends(get_async_db),  # noqa: B008
 ) -> SkillList:
     full_name = f"{owner}/{repo}"
-    skill = get_skill_by_full_name(db, full_name)
+    skill = await get_skill_by_full_name_async(db, full_name)
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
-    items = get_related_skills(db, skill, limit=limit)
+    items = await lookup_related_skills_async(db, skill, limit=limit)
     return SkillList(total=len(items), items=items)
 
 
@@ -85,5 +118,8 @@ def sync_skills(
         token = request.headers.get("X-Sync-Token")
         if token != settings.sync_api_token:
             raise HTTPException(status_code=403, detail="Forbidden")
-    count = sync_github_skills(db, settings)
-    return {"synced": count}
+    report = sync_github_skills(db, settings)
+    # Related skills and translations run as the same follow-up tasks as
+    # the scheduled sync.
+    send_post_sync_tasks(report, settings)
+    return report.as_dict()
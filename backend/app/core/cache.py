@@ -1,10 +1,39 @@
-"""Cache control utilities for HTTP responses."""
+"""Cache utilities for HTTP responses.
 
+``cache_control`` sets the ``Cache-Control`` header for CDNs and browsers.
+``response_cache`` additionally caches the serialized body server-side in an
+in-process LRU backed by Redis, keyed by route, normalized parameters and the
+catalog version, so a sync or enrich commit (which bumps the version) makes
+every older entry unreachable.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import wraps
 from typing import Any
 
-from fastapi import Response
+from fastapi import Request, Response
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import Settings, get_settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "catalog:version"
+# Requests re-read the shared version at most this often.
+CATALOG_VERSION_POLL_SECONDS = 1.0
+RESPONSE_CACHE_KEY = "cache:resp:{digest}"
+# Followers wait this long for the in-flight leader before computing anyway.
+SINGLE_FLIGHT_WAIT_SECONDS = 10.0
 
 
 def cache_control(max_age: int) -> Callable:
@@ -41,11 +70,338 @@ def cache_control(max_age: int) -> Callable:
             return result
 
         # Return appropriate wrapper based on whether function is async
-        import inspect
-
         if inspect.iscoroutinefunction(func):
             return async_wrapper
         else:
             return sync_wrapper
 
     return decorator
+
+
+_version_lock = threading.Lock()
+_local_version = 0
+_version_cache: tuple[float, str | None] | None = None
+# Set when a bump could not reach Redis; replayed on the next successful read
+# so validators issued before the outage stop matching.
+_bump_pending = False
+
+
+def get_catalog_version(settings: Settings | None = None) -> str | None:
+    """Shared catalog version, or None while Redis is unavailable.
+
+    Every worker reads the same ``catalog:version`` key, so the value is safe
+    to use as a validator across processes.
+    """
+    global _version_cache, _bump_pending
+    now = time.monotonic()
+    cached = _version_cache
+    if cached is not None and now - cached[0] < CATALOG_VERSION_POLL_SECONDS:
+        return cached[1]
+    version: str | None = None
+    client = get_redis_client(settings)
+    if client:
+        try:
+            if _bump_pending:
+                client.incr(CATALOG_VERSION_KEY)
+                _bump_pending = False
+            version = client.get(CATALOG_VERSION_KEY) or "0"
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("catalog version read failed: %s", exc)
+    _version_cache = (now, version)
+    return version
+
+
+async def get_catalog_version_async(settings: Settings | None = None) -> str | None:
+    """``get_catalog_version`` for the event loop; polls Redis in a thread."""
+    cached = _version_cache
+    if (
+        cached is not None
+        and time.monotonic() - cached[0] < CATALOG_VERSION_POLL_SECONDS
+    ):
+        return cached[1]
+    return await run_in_threadpool(get_catalog_version, settings)
+
+
+def _cache_version(version: str | None) -> str:
+    # Without Redis only the in-process tier is in use, so this process's own
+    # bump counter is enough to invalidate it. Never used as a validator.
+    return version if version is not None else f"local.{_local_version}"
+
+
+def bump_catalog_version(settings: Settings | None = None) -> None:
+    """Call after committing skill changes; invalidates cached responses."""
+    global _local_version, _version_cache, _bump_pending
+    with _version_lock:
+        _local_version += 1
+        _version_cache = None
+    client = get_redis_client(settings)
+    if client:
+        try:
+            client.incr(CATALOG_VERSION_KEY)
+            return
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("catalog version bump failed: %s", exc)
+    _bump_pending = True
+
+
+class _LRUCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int, max_size: int) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_lru = _LRUCache()
+_flight_lock = threading.Lock()
+_flights: dict[str, threading.Event] = {}
+_async_flights: dict[str, asyncio.Future] = {}
+
+
+def clear_response_cache() -> None:
+    """Drop the in-process tier (the Redis tier expires by TTL/version)."""
+    _lru.clear()
+
+
+def _cache_key(name: str, kwargs: dict[str, Any], version: str) -> str:
+    # Only plain query/path values take part; db sessions, settings and the
+    # Response object are dependencies, not request parameters.
+    params = {
+        key: value
+        for key, value in sorted(kwargs.items())
+        if isinstance(value, str | int | float | bool)
+    }
+    raw = json.dumps(
+        [name, version, params],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return RESPONSE_CACHE_KEY.format(digest=hashlib.sha1(raw.encode()).hexdigest())
+
+
+def _read(key: str, ttl: int, settings: Settings) -> Any | None:
+    value = _lru.get(key)
+    if value is not None:
+        return value
+    return _read_redis(key, ttl, settings)
+
+
+def _read_redis(key: str, ttl: int, settings: Settings) -> Any | None:
+    client = get_redis_client(settings)
+    if not client:
+        return None
+    try:
+        raw = client.get(key)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("response cache read failed: %s", exc)
+        return None
+    if raw is None:
+        return None
+    value = json.loads(raw)
+    _lru.set(key, value, ttl, settings.response_cache_size)
+    return value
+
+
+def _write(key: str, value: Any, ttl: int, settings: Settings) -> None:
+    _lru.set(key, value, ttl, settings.response_cache_size)
+    _write_redis(key, value, ttl, settings)
+
+
+def _write_redis(key: str, value: Any, ttl: int, settings: Settings) -> None:
+    client = get_redis_client(settings)
+    if not client:
+        return
+    try:
+        client.setex(key, ttl, json.dumps(value, separators=(",", ":")))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("response cache write failed: %s", exc)
+
+
+def response_cache(ttl: int, model: type[BaseModel]) -> Callable:
+    """
+    Decorator caching a read endpoint's body server-side for *ttl* seconds.
+
+    The result is serialized through *model* (the route's response model) and
+    cached as JSON, so hits skip both the database and ORM loading. For async
+    endpoints the in-process tier is checked on the event loop and only the
+    Redis round trips run in the threadpool. Exceptions (e.g. 404) are never
+    cached. Concurrent misses for the same key in one process are collapsed:
+    one request computes, the rest wait for it.
+
+    Usage:
+        @router.get("/endpoint", response_model=Item)
+        @cache_control(3600)
+        @response_cache(3600, Item)
+        def my_endpoint(response: Response, db: Session = Depends(get_db)):
+            ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        def serialize(result: Any) -> Any:
+            return model.model_validate(result).model_dump(mode="json")
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            settings = get_settings()
+            if not settings.response_cache_enabled:
+                return func(*args, **kwargs)
+            key = _cache_key(
+                name, kwargs, _cache_version(get_catalog_version(settings))
+            )
+            cached = _read(key, ttl, settings)
+            if cached is not None:
+                return cached
+
+            with _flight_lock:
+                event = _flights.get(key)
+                leader = event is None
+                if leader:
+                    event = _flights[key] = threading.Event()
+            if not leader:
+                event.wait(SINGLE_FLIGHT_WAIT_SECONDS)
+                cached = _lru.get(key)
+                if cached is not None:
+                    return cached
+                return func(*args, **kwargs)
+            try:
+                value = serialize(func(*args, **kwargs))
+                _write(key, value, ttl, settings)
+                return value
+            finally:
+                with _flight_lock:
+                    _flights.pop(key, None)
+                event.set()
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            settings = get_settings()
+            if not settings.response_cache_enabled:
+                return await func(*args, **kwargs)
+            version = await get_catalog_version_async(settings)
+            key = _cache_key(name, kwargs, _cache_version(version))
+            cached = _lru.get(key)
+            if cached is None:
+                cached = await run_in_threadpool(_read_redis, key, ttl, settings)
+            if cached is not None:
+                return cached
+
+            flight = _async_flights.get(key)
+            if flight is not None:
+                result = await asyncio.shield(flight)
+                if result is not None:
+                    return result
+                # The leader failed (e.g. 404); compute our own answer.
+                return await func(*args, **kwargs)
+            flight = asyncio.get_running_loop().create_future()
+            _async_flights[key] = flight
+            value = None
+            try:
+                value = serialize(await func(*args, **kwargs))
+                _lru.set(key, value, ttl, settings.response_cache_size)
+                await run_in_threadpool(_write_redis, key, value, ttl, settings)
+                return value
+            finally:
+                _async_flights.pop(key, None)
+                flight.set_result(value)
+
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
+        return sync_wrapper
+
+    return decorator
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110): ignore the W/ prefix on both sides.
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+def etag(compute: Callable[[dict[str, Any]], Any]) -> Callable:
+    """
+    Decorator adding a weak ETag and answering If-None-Match with 304.
+
+    *compute* receives the endpoint kwargs and returns a change token (or
+    None to skip validation, e.g. when the resource does not exist); async
+    endpoints may pass a coroutine function. The token
+    is checked before the endpoint runs, so a match skips the query and
+    serialization entirely. The endpoint must accept ``request`` and
+    ``response`` parameters; place this under ``cache_control``.
+    """
+
+    def respond(kwargs: dict[str, Any], token: str | None) -> Response | None:
+        request: Request | None = kwargs.get("request")
+        response: Response | None = kwargs.get("response")
+        if request is None or response is None or token is None:
+            return None
+        digest = hashlib.sha1(
+            f"{request.url.path}?{request.url.query}|{token}".encode()
+        ).hexdigest()[:20]
+        value = f'W/"{digest}"'
+        response.headers["ETag"] = value
+        if not _etag_matches(request.headers.get("if-none-match"), value):
+            return None
+        headers = {"ETag": value}
+        if "Cache-Control" in response.headers:
+            headers["Cache-Control"] = response.headers["Cache-Control"]
+        return Response(status_code=304, headers=headers)
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = compute(kwargs)
+            if inspect.isawaitable(token):
+                token = await token
+            not_modified = respond(kwargs, token)
+            if not_modified is not None:
+                return not_modified
+            return await func(*args, **kwargs)
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            not_modified = respond(kwargs, compute(kwargs))
+            if not_modified is not None:
+                return not_modified
+            return func(*args, **kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
+        return sync_wrapper
+
+    return decorator
+
+
+async def catalog_etag(_kwargs: dict[str, Any]) -> str | None:
+    """ETag token for responses derived from the whole catalog.
+
+    None (no ETag) while the shared version is unavailable: a per-process
+    fallback would give each worker a different validator.
+    """
+    return await get_catalog_version_async()
@@ -1,10 +1,20 @@
+import logging
 import sys
+from contextvars import Token
 from datetime import timedelta
 
 from celery import Celery
-from celery.signals import beat_init
+from celery.signals import beat_init, task_postrun, task_prerun
 
 from app.core.config import get_settings
+from app.core.query_stats import (
+    QueryStats,
+    query_registry,
+    start_tracking,
+    stop_tracking,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def _running_under_pytest() -> bool:
@@ -25,6 +35,9 @@ def _get_backend_url() -> str:
     return settings.celery_result_backend or settings.redis_url
 
 
+# Per-skill enrichment runs on its own queue so LLM latency never delays sync.
+ENRICH_QUEUE = "enrich"
+
 celery_app = Celery(
     "agentskill",
     broker=_get_broker_url(),
@@ -54,6 +67,10 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_max_tasks_per_child=100,
     beat_schedule=beat_schedule,
+    task_routes={
+        "tasks.enrich_one": {"queue": ENRICH_QUEUE},
+        "tasks.enrich_publish": {"queue": ENRICH_QUEUE},
+    },
 )
 
 
@@ -64,6 +81,27 @@ def _trigger_sync_on_start(**_kwargs):  # type: ignore[no-untyped-def]
     celery_app.send_task("tasks.github_sync", countdown=30)
 
 
+# Open query stats per task run; eager runs nest, so contexts unwind LIFO.
+_task_queries: dict[str, tuple[QueryStats, Token]] = {}
+
+
+@task_prerun.connect
+def _start_task_queries(task_id=None, **_kwargs):  # type: ignore[no-untyped-def]
+    _task_queries[task_id] = start_tracking()
+
+
+@task_postrun.connect
+def _finish_task_queries(task_id=None, task=None, **_kwargs):  # type: ignore[no-untyped-def]
+    entry = _task_queries.pop(task_id, None)
+    if entry is None:
+        return
+    stats, token = entry
+    stop_tracking(token)
+    name = getattr(task, "name", None) or "unknown"
+    query_registry.record("task", name, stats)
+    logger.info("task %s ran %s queries in %.1fms", name, stats.queries, stats.total_ms)
+
+
 if _running_under_pytest():
     celery_app.conf.update(
         task_always_eager=True,
@@ -72,4 +110,6 @@ if _running_under_pytest():
 
 
 import app.tasks.github_sync  # noqa: E402,F401
+import app.tasks.related_refresh  # noqa: E402,F401
 import app.tasks.skill_enrich  # noqa: E402,F401
+import app.tasks.translate_descriptions  # noqa: E402,F401
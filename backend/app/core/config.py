@@ -9,11 +9,23 @@ class Settings(BaseSettings):
 
     app_env: str = "development"
     database_url: str = "sqlite+pysqlite:///./agentskill.db"
+    # Defaults to database_url with its async driver (aiosqlite/aiomysql).
+    database_async_url: str | None = None
     redis_url: str = "redis://localhost:6379/0"
+    # Shared pool in app.core.redis_client; the breaker skips Redis while down.
+    redis_max_connections: int = 50
+    redis_socket_timeout: float = 0.5
+    redis_health_check_interval: int = 30
+    redis_breaker_threshold: int = 3
+    redis_breaker_cooldown: float = 30.0
 
-    # Database connection pool settings
-    db_pool_size: int = 20
-    db_pool_max_overflow: int = 10
+    # Database connection pool settings. Each process opens up to
+    # db_pool_size + db_pool_max_overflow sync connections plus
+    # db_async_pool_size + db_async_pool_max_overflow async ones.
+    db_pool_size: int = 10
+    db_pool_max_overflow: int = 5
+    db_async_pool_size: int = 10
+    db_async_pool_max_overflow: int = 5
     db_pool_recycle: int = 3600
     db_pool_timeout: int = 30
     db_echo: bool = False
@@ -26,6 +38,8 @@ class Settings(BaseSettings):
     github_max_pages: int = 5
     github_max_results: int = 300
     github_rate_limit_buffer: int = 2
+    github_sync_concurrency: int = 4
+    github_etag_cache: bool = True
     github_newest_window_days: int = 7
     github_newest_max_pages: int = 2
     github_newest_max_results: int = 100
@@ -45,8 +59,45 @@ class Settings(BaseSettings):
     deepseek_api_url: str = "https://api.deepseek.com"
     deepseek_model: str = "deepseek-chat"
 
+    # Description translation runs as a separate stage after each sync.
+    translation_batch_size: int = 20
+    translation_concurrency: int = 4
+    translation_requests_per_minute: int = 60
+    translation_backlog_limit: int = 500
+
+    # Persistent LLM output cache (llm_cache table), evicted least recently used.
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 50000
+
     enrich_interval_minutes: int = 180
-    enrich_batch_size: int = 5
+    # Most skills one dispatcher run adds to the enrich queue.
+    enrich_batch_size: int = 500
+
+    # Related skills precomputed per skill after each sync (API max limit).
+    related_top_n: int = 20
+
+    # Free-text search backend: "index" (in-process inverted index) or "sql".
+    search_engine: str = "index"
+    search_index_refresh_seconds: int = 30
+
+    # Server-side cache of read endpoint bodies (app.core.cache.response_cache).
+    response_cache_enabled: bool = True
+    response_cache_size: int = 1024
+
+    # Write-behind buffer for /metrics/track beacons (see metrics_service).
+    metrics_buffer_enabled: bool = True
+    metrics_flush_interval: float = 1.0
+    metrics_flush_size: int = 500
+    metrics_buffer_max_events: int = 50000
+
+    # Request latency histograms (app.middleware.timing), scraped from
+    # /api/internal/metrics; set the token to require "Authorization: Bearer".
+    slow_request_seconds: float = 1.0
+    internal_metrics_token: str | None = None
+    # SQL statement counts/time per request and task (app.core.query_stats);
+    # headers add X-DB-Queries/X-DB-Time to responses, for debugging only.
+    slow_query_seconds: float = 0.2
+    query_stats_headers: bool = False
 
     cors_origins: str = Field(default="http://localhost:3000,http://localhost:8083")
 
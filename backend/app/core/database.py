@@ -1,8 +1,12 @@
+from collections.abc import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 from app.core.config import get_settings
+from app.core.query_stats import instrument_engine
 
 settings = get_settings()
 
@@ -24,10 +28,9 @@ if not settings.database_url.startswith("sqlite"):
 else:
     # SQLite-specific configuration
     engine_kwargs["connect_args"] = {"check_same_thread": False}
-    if ":memory:" in settings.database_url:
-        engine_kwargs["poolclass"] = StaticPool
 
 engine = create_engine(settings.database_url, **engine_kwargs)
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -38,3 +41,55 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async drivers for the same databases; routes use these so a request waits
+# on the event loop instead of holding a threadpool thread.
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "mysql": "aiomysql"}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:")
+        or parsed.query.get("mode") == "memory"
+    )
+
+
+_async_url = settings.database_async_url or async_database_url(settings.database_url)
+# Each in-memory SQLite connection is its own empty database, so async routes
+# would never see what the sync engine writes.
+if _is_sqlite_memory(_async_url):
+    raise ValueError(
+        "in-memory SQLite cannot be shared with the async engine; "
+        "use a file database (sqlite:///path.db)"
+    )
+
+async_engine_kwargs = {
+    key: value for key, value in engine_kwargs.items() if key != "connect_args"
+}
+if "pool_size" in async_engine_kwargs:
+    # Its own share of the connection budget, not a second copy of the sync one.
+    async_engine_kwargs["pool_size"] = settings.db_async_pool_size
+    async_engine_kwargs["max_overflow"] = settings.db_async_pool_max_overflow
+async_engine = create_async_engine(_async_url, **async_engine_kwargs)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,213 @@
+"""SQL statement counts and DB time per request and per Celery task.
+
+``instrument_engine`` hooks ``before/after_cursor_execute`` on an engine.
+Each statement is added to the ``QueryStats`` of the unit of work currently
+open in ``track_queries`` (a context variable, so it follows the request into
+threadpool-run sync routes and into the greenlets the async engine uses) and
+to a per-process aggregate keyed by ``(kind, name)``: ``("http", "GET
+/api/skills")`` or ``("task", "tasks.github_sync")``. Statements outside any
+unit of work (startup, scripts) are aggregated under ``("other", "-")``.
+
+Statements slower than ``slow_query_seconds`` are logged with a fingerprint
+of the normalised SQL, so repeats of one query shape group together however
+their literals and ``IN`` lists differ.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+OTHER = ("other", "-")
+
+_STATEMENT_PREVIEW = 500
+_START_KEY = "query_stats_start"
+
+
+@dataclass(slots=True)
+class QueryStats:
+    queries: int = 0
+    total_ns: int = 0
+    slow: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_ns / 1e6
+
+
+@dataclass(slots=True)
+class _Aggregate:
+    runs: int = 0
+    queries: int = 0
+    total_ns: int = 0
+    slow: int = 0
+    max_queries: int = 0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+class QueryStatsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], _Aggregate] = {}
+
+    def record(self, kind: str, name: str, stats: QueryStats) -> None:
+        with self._lock:
+            aggregate = self._series.get((kind, name))
+            if aggregate is None:
+                aggregate = self._series[(kind, name)] = _Aggregate()
+            aggregate.runs += 1
+            aggregate.queries += stats.queries
+            aggregate.total_ns += stats.total_ns
+            aggregate.slow += stats.slow
+            aggregate.max_queries = max(aggregate.max_queries, stats.queries)
+
+    def snapshot(self) -> dict[tuple[str, str], _Aggregate]:
+        with self._lock:
+            return {
+                key: _Aggregate(
+                    value.runs,
+                    value.queries,
+                    value.total_ns,
+                    value.slow,
+                    value.max_queries,
+                )
+                for key, value in sorted(self._series.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+query_registry = QueryStatsRegistry()
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def start_tracking() -> tuple[QueryStats, Token[QueryStats | None]]:
+    """Open a unit of work; pass the token to ``stop_tracking`` to close it."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def stop_tracking(token: Token[QueryStats | None]) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context into a fresh QueryStats."""
+    stats, token = start_tracking()
+    try:
+        yield stats
+    finally:
+        stop_tracking(token)
+
+
+_LITERALS = re.compile(
+    r"'(?:[^']|'')*'"  # quoted strings
+    r"|\b0x[0-9a-f]+\b"  # hex
+    r"|\b\d+(?:\.\d+)?\b"  # numbers
+    r"|%\(\w+\)s|%s|:\w+|\?",  # bound parameter placeholders
+    re.IGNORECASE,
+)
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    normalized = _LITERALS.sub("?", statement)
+    normalized = _IN_LIST.sub("(?+)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip().lower()
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Short stable id for a query shape, independent of literal values."""
+    normalized = normalize_statement(statement)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter_ns())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter_ns() - starts.pop()
+    slow = elapsed >= _slow_query_ns()
+    if slow:
+        logger.warning(
+            "Slow query %s took %.1fms: %s",
+            statement_fingerprint(statement),
+            elapsed / 1e6,
+            _WHITESPACE.sub(" ", statement)[:_STATEMENT_PREVIEW],
+        )
+    stats = _current.get()
+    if stats is None:
+        query_registry.record(*OTHER, QueryStats(1, elapsed, int(slow)))
+        return
+    stats.queries += 1
+    stats.total_ns += elapsed
+    if slow:
+        stats.slow += 1
+
+
+def _slow_query_ns() -> float:
+    seconds = get_settings().slow_query_seconds
+    return seconds * 1e9 if seconds > 0 else float("inf")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement *engine* executes (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def render_prometheus() -> str:
+    """Render the per-route/per-task aggregates in Prometheus text format."""
+    series = query_registry.snapshot()
+    metrics = (
+        ("db_units_total", "counter", "Requests or tasks observed.", "runs"),
+        ("db_queries_total", "counter", "SQL statements executed.", "queries"),
+        ("db_query_seconds_total", "counter", "Time spent in SQL.", "total_ns"),
+        ("db_slow_queries_total", "counter", "Statements over the slow log.", "slow"),
+        (
+            "db_queries_per_unit_max",
+            "gauge",
+            "Most statements in one request or task.",
+            "max_queries",
+        ),
+    )
+    lines: list[str] = []
+    for name, kind, help_text, field in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (unit_kind, unit_name), aggregate in series.items():
+            value = getattr(aggregate, field)
+            if field == "total_ns":
+                value = f"{value / 1e9:.6g}"
+            escaped = unit_name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{name}{{kind="{unit_kind}",name="{escaped}"}} {value}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,170 @@
+"""Process-wide Redis client with a shared pool and a circuit breaker.
+
+Every caller gets the same ``redis.Redis`` backed by one connection pool, so
+hot paths (metrics beacons, facet lookups) reuse connections instead of
+building a client per call. Sockets have short timeouts and idle connections
+are health-checked before reuse.
+
+When connecting or a command fails with a connection error or timeout
+``redis_breaker_threshold`` times in a row the breaker
+opens and ``get_redis_client`` returns None for ``redis_breaker_cooldown``
+seconds; callers already treat None as "Redis unavailable" and fall back.
+After the cooldown one caller is let through to probe Redis again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import redis
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            # Half-open: let the next attempt probe; a failure re-opens.
+            self._opened_at = None
+            self._failures = self.threshold - 1
+            return True
+
+    def record_success(self) -> None:
+        if self._failures or self._opened_at is not None:
+            with self._lock:
+                self._failures = 0
+                self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    "redis circuit opened after %s failures; retry in %ss",
+                    self._failures,
+                    self.cooldown,
+                )
+
+
+def _breaker_connection(
+    base: type[redis.Connection], breaker: CircuitBreaker
+) -> type[redis.Connection]:
+    """Subclass *base* so connects and commands report to *breaker*.
+
+    Only a reply to a caller's command counts as success, not the handshake
+    replies read while connecting: a server that accepts connections but
+    never answers commands must still open the breaker. ``connect`` and the health
+    check run inside ``send_packed_command``; the ``_breaker_counted`` flag
+    keeps one failure from being recorded twice.
+    """
+
+    def guarded(call, *args, **kwargs):  # type: ignore[no-untyped-def]
+        try:
+            return call(*args, **kwargs)
+        except (redis.ConnectionError, redis.TimeoutError) as exc:
+            if not getattr(exc, "_breaker_counted", False):
+                exc._breaker_counted = True  # type: ignore[attr-defined]
+                breaker.record_failure()
+            raise
+
+    class BreakerConnection(base):  # type: ignore[misc,valid-type]
+        _connecting = False
+
+        def connect(self) -> None:
+            self._connecting = True
+            try:
+                guarded(super().connect)
+            finally:
+                self._connecting = False
+
+        def send_packed_command(self, command, check_health=True):  # type: ignore[no-untyped-def]
+            guarded(super().send_packed_command, command, check_health)
+
+        def read_response(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            response = guarded(super().read_response, *args, **kwargs)
+            if not self._connecting:
+                breaker.record_success()
+            return response
+
+    return BreakerConnection
+
+
+_lock = threading.Lock()
+_client: redis.Redis | None = None
+_client_url: str | None = None
+_breaker: CircuitBreaker | None = None
+
+
+def _build(settings: Settings) -> tuple[redis.Redis, CircuitBreaker]:
+    breaker = CircuitBreaker(
+        settings.redis_breaker_threshold, settings.redis_breaker_cooldown
+    )
+    pool = redis.ConnectionPool.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        max_connections=settings.redis_max_connections,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        health_check_interval=settings.redis_health_check_interval,
+    )
+    pool.connection_class = _breaker_connection(pool.connection_class, breaker)
+    return redis.Redis(connection_pool=pool), breaker
+
+
+def get_redis_client(settings: Settings | None = None) -> redis.Redis | None:
+    """Return the shared client, or None if Redis is unavailable."""
+    global _client, _client_url, _breaker
+    settings = settings or get_settings()
+    if _client is None or _client_url != settings.redis_url:
+        with _lock:
+            if _client is None or _client_url != settings.redis_url:
+                try:
+                    client, breaker = _build(settings)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("redis init failed: %s", exc)
+                    return None
+                if _client is not None:
+                    _client.close()
+                _client, _client_url, _breaker = client, settings.redis_url, breaker
+    if _breaker is not None and not _breaker.allow():
+        return None
+    return _client
+
+
+def reset_redis_client() -> None:
+    """Drop the shared client and its pool (tests, forked workers)."""
+    global _client, _client_url, _breaker
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = _client_url = _breaker = None
+
+
+def use_redis_client(client: redis.Redis, settings: Settings | None = None) -> None:
+    """Install *client* as the shared client (load tests with fakeredis)."""
+    global _client, _client_url, _breaker
+    settings = settings or get_settings()
+    with _lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client, _client_url, _breaker = client, settings.redis_url, None
@@ -5,9 +5,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.core.database import engine
+from app.core.database import async_engine, engine
 from app.db.base import Base
+from app.middleware.query_stats import QueryStatsMiddleware
 from app.middleware.timing import TimingMiddleware
+from app.services.metrics_service import metrics_buffer
 
 
 def create_app() -> FastAPI:
@@ -17,6 +19,8 @@ def create_app() -> FastAPI:
     async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine)
         yield
+        metrics_buffer.stop()
+        await async_engine.dispose()
 
     app = FastAPI(
         title="agentskill.work API",
@@ -27,6 +31,9 @@ def create_app() -> FastAPI:
 
     app.include_router(api_router, prefix="/api")
 
+    # Count SQL statements per request (inside timing, so both see the route)
+    app.add_middleware(QueryStatsMiddleware)
+
     # Add timing middleware for performance monitoring
     app.add_middleware(TimingMiddleware)
 
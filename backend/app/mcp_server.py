@@ -15,13 +15,20 @@ import logging
 
 from mcp.server.fastmcp import FastMCP
 
+from app.core.config import get_settings
 from app.core.database import SessionLocal
 from app.services.facets_service import (
     list_top_languages,
     list_top_owners,
     list_top_topics,
 )
-from app.services.skill_service import get_skill_by_full_name, search_skills
+from app.services.metrics_service import TRENDING_WINDOWS, get_trending_skills
+from app.services.skill_service import (
+    COUNT_STRATEGIES,
+    get_skill_by_full_name,
+    load_skills_in_order,
+    search_skills_page,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +49,8 @@ def search_claude_skills(
     sort: str = "stars",
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
+    count: str = "cached",
 ) -> str:
     """Search Claude Skill repositories.
 
@@ -53,26 +62,39 @@ def search_claude_skills(
         sort: Sort order — "stars" (default) or "newest".
         limit: Max results to return (1-50, default 20).
         offset: Pagination offset.
+        cursor: Opaque ``next_cursor`` from a previous call; cheaper than
+            a large offset for deep pages.
+        count: How to compute ``total`` — "cached" (default), "exact", or
+            "none" to skip counting and rely on ``has_more``.
 
     Returns:
-        JSON with total count and skill items.
+        JSON with total count, has_more, skill items and the next page cursor.
     """
+    if count not in COUNT_STRATEGIES:
+        count = "cached"
     limit = max(1, min(limit, 50))
     db = SessionLocal()
     try:
-        total, items = search_skills(
-            db,
-            query=query,
-            topic=topic,
-            language=language,
-            owner=owner,
-            sort=sort,
-            limit=limit,
-            offset=offset,
-        )
+        try:
+            page = search_skills_page(
+                db,
+                query=query,
+                topic=topic,
+                language=language,
+                owner=owner,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                count=count,
+            )
+        except ValueError:
+            return json.dumps({"error": "Invalid cursor"})
         return json.dumps(
             {
-                "total": total,
+                "total": page.total,
+                "has_more": page.has_more,
+                "next_cursor": page.next_cursor,
                 "items": [
                     {
                         "full_name": s.full_name,
@@ -86,7 +108,7 @@ def search_claude_skills(
                         "summary_en": s.summary_en,
                         "summary_zh": s.summary_zh,
                     }
-                    for s in items
+                    for s in page.items
                 ],
             },
             ensure_ascii=False,
@@ -193,6 +215,44 @@ def list_owners(limit: int = 20) -> str:
         db.close()
 
 
+@mcp.tool()
+def list_trending_skills(window: str = "24h", limit: int = 10) -> str:
+    """List the most viewed skills on agentskill.work right now.
+
+    Args:
+        window: "24h" (hourly buckets, default) or "7d" (daily buckets);
+            recent views weigh more than older ones.
+        limit: Max skills to return (1-50, default 10).
+
+    Returns:
+        JSON array of skills with their decayed view score.
+    """
+    if window not in TRENDING_WINDOWS:
+        window = "24h"
+    limit = max(1, min(limit, 50))
+    ranked = get_trending_skills(get_settings(), window, limit)
+    scores = dict(ranked)
+    db = SessionLocal()
+    try:
+        skills = load_skills_in_order(db, [skill_id for skill_id, _ in ranked])
+        return json.dumps(
+            [
+                {
+                    "full_name": s.full_name,
+                    "description": s.description,
+                    "stars": s.stars,
+                    "language": s.language,
+                    "html_url": s.html_url,
+                    "score": scores[s.id],
+                }
+                for s in skills
+            ],
+            ensure_ascii=False,
+        )
+    finally:
+        db.close()
+
+
 # ---------------------------------------------------------------------------
 # Resources
 # ---------------------------------------------------------------------------
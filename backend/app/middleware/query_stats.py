@@ -0,0 +1,49 @@
+"""Per-request SQL statement counts (see ``app.core.query_stats``)."""
+
+from __future__ import annotations
+
+from app.core.config import get_settings
+from app.core.query_stats import query_registry, start_tracking, stop_tracking
+from app.middleware.timing import UNMATCHED_ROUTE
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware counting SQL statements per request.
+
+    Features:
+    - Aggregates statement count and DB time per route template
+    - With ``query_stats_headers`` on, adds X-DB-Queries and X-DB-Time (ms)
+      covering the statements run before the response started
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.headers = get_settings().query_stats_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_tracking()
+        send_wrapper = send
+        if self.headers:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Time"] = f"{stats.total_ms:.1f}"
+                await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking(token)
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            query_registry.record(
+                "http", f"{scope.get('method', 'GET')} {route}", stats
+            )
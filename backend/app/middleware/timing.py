@@ -1,41 +1,216 @@
-"""Timing middleware for performance monitoring."""
+"""Request timing middleware and per-route latency histograms.
 
+``TimingMiddleware`` is plain ASGI (no ``BaseHTTPMiddleware`` task/stream
+wrapping). It stamps ``X-Process-Time`` on the response start message, then
+records the full request duration into a histogram keyed by method and the
+templated route path (``/api/skills/{owner}/{repo}``, not the raw URL), so
+label cardinality stays bounded. Unmatched paths share one ``<unmatched>``
+series.
+
+``render_prometheus`` exposes the histograms in the Prometheus text format
+together with p50/p95/p99 estimated from the buckets.
+"""
+
+from __future__ import annotations
+
+import bisect
 import logging
+import threading
 import time
+from collections.abc import Iterable
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from app.core.config import get_settings
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds in seconds; dense below 250 ms where most API requests land.
+BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.15,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+UNMATCHED_ROUTE = "<unmatched>"
+
+_BUCKETS_NS = tuple(int(bound * 1e9) for bound in BUCKETS)
+
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram of durations in nanoseconds."""
+
+    __slots__ = ("counts", "count", "sum_ns")
+
+    def __init__(self) -> None:
+        # One slot per bound plus the +Inf overflow bucket (non-cumulative).
+        self.counts = [0] * (len(_BUCKETS_NS) + 1)
+        self.count = 0
+        self.sum_ns = 0
+
+    def observe(self, elapsed_ns: int) -> None:
+        self.counts[bisect.bisect_left(_BUCKETS_NS, elapsed_ns)] += 1
+        self.count += 1
+        self.sum_ns += elapsed_ns
+
+    def quantile(self, q: float) -> float:
+        """Estimate quantile *q* in seconds, interpolating within a bucket.
+
+        Same approach as PromQL ``histogram_quantile``; observations in the
+        +Inf bucket report the highest finite bound.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            if index == len(BUCKETS):
+                return BUCKETS[-1]
+            upper = BUCKETS[index]
+            if bucket_count and seen + bucket_count >= rank:
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        return BUCKETS[-1]
+
+
+class LatencyRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], LatencyHistogram] = {}
+
+    def observe(self, method: str, route: str, elapsed_ns: int) -> None:
+        key = (method, route)
+        with self._lock:
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = LatencyHistogram()
+            histogram.observe(elapsed_ns)
+
+    def snapshot(self) -> list[tuple[str, str, LatencyHistogram]]:
+        with self._lock:
+            items = sorted(self._series.items())
+            copies = []
+            for (method, route), histogram in items:
+                copy = LatencyHistogram()
+                copy.counts = list(histogram.counts)
+                copy.count = histogram.count
+                copy.sum_ns = histogram.sum_ns
+                copies.append((method, route, copy))
+        return copies
 
-class TimingMiddleware(BaseHTTPMiddleware):
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+latency_registry = LatencyRegistry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return f"{value:.6g}"
+
+
+def render_prometheus(
+    series: Iterable[tuple[str, str, LatencyHistogram]] | None = None,
+) -> str:
+    """Render the request latency histograms in Prometheus text format."""
+    series = latency_registry.snapshot() if series is None else list(series)
+    lines = [
+        "# HELP http_request_duration_seconds HTTP request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    quantile_lines = [
+        "# HELP http_request_duration_quantile_seconds "
+        "Latency quantiles estimated from the histogram buckets.",
+        "# TYPE http_request_duration_quantile_seconds gauge",
+    ]
+    for method, route, histogram in series:
+        labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS, histogram.counts, strict=False):
+            cumulative += bucket_count
+            lines.append(
+                f"http_request_duration_seconds_bucket{{{labels},"
+                f'le="{_format(bound)}"}} {cumulative}'
+            )
+        lines.append(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+            f"{histogram.count}"
+        )
+        lines.append(
+            f"http_request_duration_seconds_sum{{{labels}}} "
+            f"{_format(histogram.sum_ns / 1e9)}"
+        )
+        lines.append(
+            f"http_request_duration_seconds_count{{{labels}}} {histogram.count}"
+        )
+        for q in QUANTILES:
+            quantile_lines.append(
+                f'http_request_duration_quantile_seconds{{{labels},quantile="{q}"}} '
+                f"{_format(histogram.quantile(q))}"
+            )
+    return "\n".join(lines + quantile_lines) + "\n"
+
+
+class TimingMiddleware:
     """
-    Middleware to track API response times.
+    Pure ASGI middleware tracking API response times.
 
     Features:
-    - Adds X-Process-Time header with elapsed time in seconds
-    - Logs slow requests (>1s) as warnings
+    - Adds X-Process-Time header (seconds until the response starts)
+    - Records per-route latency histograms in ``latency_registry``
+    - Logs requests slower than ``slow_request_seconds`` as warnings
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        start_time = time.time()
-
-        # Process the request
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.slow_request_ns = int(get_settings().slow_request_seconds * 1e9)
 
-        # Calculate elapsed time
-        process_time = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Add timing header
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
+        start = time.perf_counter_ns()
 
-        # Log slow requests
-        if process_time > 1.0:
-            logger.warning(
-                f"Slow request: {request.method} {request.url.path} "
-                f"took {process_time:.2f}s"
-            )
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter_ns() - start
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = f"{elapsed / 1e9:.3f}"
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope.get("method", "GET")
+            latency_registry.observe(method, path, elapsed)
+            if elapsed > self.slow_request_ns:
+                logger.warning(
+                    "Slow request: %s %s took %.2fs",
+                    method,
+                    scope.get("path", ""),
+                    elapsed / 1e9,
+                )
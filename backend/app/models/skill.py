@@ -1,6 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, Text, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -31,6 +41,18 @@ class Skill(Base):
     seo_description_en: Mapped[str | None] = mapped_column(Text)
     seo_description_zh: Mapped[str | None] = mapped_column(Text)
     content_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # sha256 of the GitHub-owned columns, used by sync to skip unchanged repos.
+    sync_fingerprint: Mapped[str | None] = mapped_column(String(64))
+    # Failed translation attempts in a row; the row is skipped until retry_at.
+    translation_failures: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+    translation_retry_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
+    # Same backoff for enrichment the LLM answers without a usable payload.
+    enrich_failures: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    enrich_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     last_pushed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     repo_created_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), index=True
@@ -42,8 +64,38 @@ class Skill(Base):
         DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True,
     )
     fetched_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+
+class SkillTopic(Base):
+    """Normalized (skill, topic) pairs; ``Skill.topics`` stays for display."""
+
+    __tablename__ = "skill_topics"
+    __table_args__ = (Index("ix_skill_topics_topic_skill", "topic", "skill_id"),)
+
+    skill_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True
+    )
+    topic: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+
+class SkillRelated(Base):
+    """Precomputed top-N related skills, refreshed by ``tasks.related_refresh``."""
+
+    __tablename__ = "skill_related"
+
+    skill_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    related_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("skills.id", ondelete="CASCADE")
+    )
+    score: Mapped[int] = mapped_column(Integer)
@@ -1,6 +1,24 @@
 from pydantic import BaseModel
 
+from app.schemas.skill import SkillOut
+
 
 class MetricsOut(BaseModel):
     pv: int
     uv: int
+
+
+class UVWindowOut(BaseModel):
+    days: int
+    uv: int
+    skill_id: int | None = None
+
+
+class TrendingSkill(BaseModel):
+    score: float
+    skill: SkillOut
+
+
+class TrendingSkillList(BaseModel):
+    window: str
+    items: list[TrendingSkill]
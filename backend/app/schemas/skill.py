@@ -37,5 +37,8 @@ class SkillOut(SkillBase):
 
 
 class SkillList(BaseModel):
-    total: int
+    # None when the caller asked to skip counting (count=none).
+    total: int | None
     items: list[SkillOut]
+    has_more: bool = False
+    next_cursor: str | None = None
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class CoverageOut(BaseModel):
+    total: int
+    description_zh: int
+    summary_zh: int
+    seo_title_zh: int
+    description_zh_pct: float
+    summary_zh_pct: float
+    seo_title_zh_pct: float
@@ -0,0 +1,70 @@
+"""Shared cache of ``search_skills`` totals keyed by the normalized filters."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from app.core.config import Settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_KEY = "cache:skill_counts"
+COUNT_CACHE_TTL = 3600
+
+
+def count_cache_field(
+    query: str | None,
+    topic: str | None,
+    language: str | None,
+    owner: str | None,
+) -> str:
+    """Normalize filters the same way search_skills applies them."""
+    return json.dumps(
+        [
+            (query or "").lower(),
+            (topic or "").strip().lower(),
+            (language or "").strip().lower(),
+            (owner or "").strip().lower(),
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def get_cached_count(settings: Settings, field: str) -> int | None:
+    client = get_redis_client(settings)
+    if not client:
+        return None
+    try:
+        cached = client.hget(COUNT_CACHE_KEY, field)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("count cache read failed: %s", exc)
+        return None
+    return int(cached) if cached is not None else None
+
+
+def set_cached_count(settings: Settings, field: str, total: int) -> None:
+    client = get_redis_client(settings)
+    if not client:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.hset(COUNT_CACHE_KEY, field, total)
+        # The whole hash expires as a safety net; commits invalidate it sooner.
+        pipe.expire(COUNT_CACHE_KEY, COUNT_CACHE_TTL, nx=True)
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("count cache write failed: %s", exc)
+
+
+def invalidate_counts(settings: Settings) -> None:
+    """Drop every cached total; called after sync/enrich commits."""
+    client = get_redis_client(settings)
+    if not client:
+        return
+    try:
+        client.delete(COUNT_CACHE_KEY)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("count cache invalidation failed: %s", exc)
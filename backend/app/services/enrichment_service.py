@@ -6,12 +6,17 @@ import re
 from typing import Any
 
 import httpx
+from sqlalchemy.orm import Session
 
 from app.core.config import Settings
 from app.models.skill import Skill
+from app.services import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Part of the LLM cache key; bump when the prompt or payload shape changes.
+ENRICHMENT_PROMPT_VERSION = "enrich-v1"
+
 _CLAUDE_SKILL_VARIANTS = re.compile("(?i)claude\\s*\\u6280\\u80fd")
 
 
@@ -126,7 +131,18 @@ def _coerce_payload(raw: dict[str, Any]) -> dict[str, Any] | None:
     return payload
 
 
-def generate_enrichment(skill: Skill, settings: Settings) -> dict[str, Any] | None:
+def generate_enrichment(
+    skill: Skill,
+    settings: Settings,
+    db: Session | None = None,
+    *,
+    raise_http_errors: bool = False,
+) -> dict[str, Any] | None:
+    """Return a coerced enrichment payload, or None if it cannot be produced.
+
+    With *raise_http_errors*, transport/HTTP failures propagate so the caller
+    can retry them; otherwise they are logged and reported as None.
+    """
     if not settings.deepseek_api_key:
         return None
 
@@ -152,6 +168,17 @@ def generate_enrichment(skill: Skill, settings: Settings) -> dict[str, Any] | No
         else None,
     }
 
+    cache_input = json.dumps(input_payload, sort_keys=True)
+    if db is not None:
+        cached = llm_cache.get_cached(
+            db, settings, ENRICHMENT_PROMPT_VERSION, cache_input
+        )
+        if cached is not None:
+            # Cached payloads were coerced before storing; re-check defensively.
+            cached_obj = _extract_json_object(cached)
+            if cached_obj and (coerced := _coerce_payload(cached_obj)):
+                return coerced
+
     system_prompt = (
         "You generate SEO-friendly, factual content for a GitHub repository page. "
         "You MUST only use the provided metadata; do NOT invent features. "
@@ -185,6 +212,8 @@ def generate_enrichment(skill: Skill, settings: Settings) -> dict[str, Any] | No
             response.raise_for_status()
             data = response.json()
     except httpx.HTTPError as exc:
+        if raise_http_errors:
+            raise
         logger.warning("enrichment request failed: %s", exc)
         return None
 
@@ -207,4 +236,12 @@ def generate_enrichment(skill: Skill, settings: Settings) -> dict[str, Any] | No
         logger.warning("enrichment returned invalid payload for %s", skill.full_name)
         return None
 
+    if db is not None:
+        llm_cache.store(
+            db,
+            settings,
+            ENRICHMENT_PROMPT_VERSION,
+            cache_input,
+            json.dumps(coerced, ensure_ascii=False),
+        )
     return coerced
@@ -4,12 +4,15 @@ import json
 import logging
 from collections import Counter
 
-import redis
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import Settings
-from app.models.skill import Skill
+from app.core.database import SessionLocal
+from app.core.redis_client import get_redis_client
+from app.models.skill import Skill, SkillTopic
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +24,6 @@ def _normalize(value: str | None) -> str | None:
     return trimmed or None
 
 
-def _get_redis_client(settings: Settings) -> redis.Redis | None:
-    """Get Redis client instance."""
-    try:
-        return redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("redis init failed: %s", exc)
-        return None
-
-
 def list_top_languages(db: Session, limit: int) -> list[tuple[str, int]]:
     """List top languages using SQL GROUP BY for optimal performance."""
     stmt = (
@@ -85,47 +79,88 @@ def list_top_owners(db: Session, limit: int) -> list[tuple[str, int]]:
         return counter.most_common(limit)
 
 
+TOPICS_CACHE_KEY = "facets:topics:{limit}"
+TOPICS_CACHE_TTL = 3600
+
+
+def _get_cached_topics(
+    settings: Settings | None, limit: int
+) -> list[tuple[str, int]] | None:
+    client = get_redis_client(settings) if settings else None
+    if not client:
+        return None
+    try:
+        cached = client.get(TOPICS_CACHE_KEY.format(limit=limit))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to get topics from cache: %s", exc)
+        return None
+    return json.loads(cached) if cached else None
+
+
+def _set_cached_topics(
+    settings: Settings | None, limit: int, result: list[tuple[str, int]]
+) -> None:
+    client = get_redis_client(settings) if settings else None
+    if not client:
+        return
+    try:
+        client.setex(
+            TOPICS_CACHE_KEY.format(limit=limit), TOPICS_CACHE_TTL, json.dumps(result)
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to cache topics: %s", exc)
+
+
+def _query_top_topics(db: Session, limit: int) -> list[tuple[str, int]]:
+    stmt = (
+        select(SkillTopic.topic, func.count().label("count"))
+        .group_by(SkillTopic.topic)
+        .order_by(func.count().desc(), SkillTopic.topic)
+        .limit(limit)
+    )
+    return [(row.topic, row.count) for row in db.execute(stmt).all()]
+
+
 def list_top_topics(
     db: Session, limit: int, settings: Settings | None = None
 ) -> list[tuple[str, int]]:
     """
-    List top topics using Python processing with Redis caching.
-
-    Note: This requires Python processing because topics are stored as
-    comma-separated strings. For better performance, consider normalizing
-    to a skill_topics join table in the future.
+    List top topics using SQL GROUP BY over skill_topics, with Redis caching.
     """
-    # Try to get from cache first
-    cache_key = f"facets:topics:{limit}"
-    if settings:
-        client = _get_redis_client(settings)
-        if client:
-            try:
-                cached = client.get(cache_key)
-                if cached:
-                    return json.loads(cached)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Failed to get topics from cache: %s", exc)
-
-    # Compute from database
-    rows = db.execute(select(Skill.topics)).scalars().all()
-    counter: Counter[str] = Counter()
-    for topics in rows:
-        value = _normalize(topics)
-        if not value:
-            continue
-        for topic in value.split(","):
-            item = topic.strip()
-            if not item:
-                continue
-            counter[item] += 1
-    result = counter.most_common(limit)
+    cached = _get_cached_topics(settings, limit)
+    if cached is not None:
+        return cached
+    result = _query_top_topics(db, limit)
+    _set_cached_topics(settings, limit, result)
+    return result
 
-    # Cache the result for 1 hour
-    if settings and client:
-        try:
-            client.setex(cache_key, 3600, json.dumps(result))
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to cache topics: %s", exc)
 
+async def list_top_languages_async(
+    db: AsyncSession, limit: int
+) -> list[tuple[str, int]]:
+    return await db.run_sync(list_top_languages, limit)
+
+
+def _list_top_owners_in_thread(limit: int) -> list[tuple[str, int]]:
+    with SessionLocal() as db:
+        return list_top_owners(db, limit)
+
+
+async def list_top_owners_async(db: AsyncSession, limit: int) -> list[tuple[str, int]]:
+    if db.bind.dialect.name == "mysql":
+        return await db.run_sync(list_top_owners, limit)
+    # The fallback loads every full_name and counts in Python; keep that CPU
+    # work off the event loop.
+    return await run_in_threadpool(_list_top_owners_in_thread, limit)
+
+
+async def list_top_topics_async(
+    db: AsyncSession, limit: int, settings: Settings | None = None
+) -> list[tuple[str, int]]:
+    # Redis round trips go to the threadpool; only the query runs on the loop.
+    cached = await run_in_threadpool(_get_cached_topics, settings, limit)
+    if cached is not None:
+        return cached
+    result = await db.run_sync(_query_top_topics, limit)
+    await run_in_threadpool(_set_cached_topics, settings, limit, result)
     return result
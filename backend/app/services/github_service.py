@@ -1,15 +1,48 @@
+import asyncio
+import hashlib
+import json
 import logging
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 
 import httpx
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.cache import bump_catalog_version
 from app.core.config import Settings
+from app.core.redis_client import get_redis_client
 from app.models.skill import Skill
-from app.services.translation_service import translate_to_zh
+from app.services.count_cache import invalidate_counts
+from app.services.search_index import refresh_search_index
+from app.services.topic_service import replace_skill_topics
 
 GITHUB_API_URL = "https://api.github.com/search/repositories"
 MAX_PER_PAGE = 100
+# The search API only serves the first 1000 results of any query.
+GITHUB_SEARCH_RESULT_CAP = 1000
+
+# Max repo_ids per IN (...) lookup during sync.
+SYNC_LOOKUP_CHUNK = 500
+
+SEARCH_CACHE_KEY = "github:search:{digest}"
+SEARCH_CACHE_TTL = 86400 * 7
+# Repo fields read by sync_github_skills; everything else is dropped.
+SYNC_REPO_FIELDS = (
+    "id",
+    "name",
+    "full_name",
+    "description",
+    "html_url",
+    "stargazers_count",
+    "forks_count",
+    "language",
+    "topics",
+    "created_at",
+    "updated_at",
+    "pushed_at",
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +81,178 @@ def _should_stop_for_rate_limit(
     return True
 
 
-def _fetch_github_search(
+def _search_headers(settings: Settings) -> dict[str, str]:
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if settings.github_token:
+        headers["Authorization"] = f"Bearer {settings.github_token}"
+    return headers
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code not in {403, 429}:
+        return False
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    retry_after = response.headers.get("Retry-After")
+    if remaining != "0" and not retry_after:
+        return False
+    reset_at = _parse_rate_limit_reset(response.headers.get("X-RateLimit-Reset"))
+    logger.warning(
+        (
+            "github rate limit hit (status=%s, remaining=%s, "
+            "reset=%s, retry_after=%s), stop sync"
+        ),
+        response.status_code,
+        remaining,
+        reset_at.isoformat() if reset_at else "unknown",
+        retry_after or "unknown",
+    )
+    return True
+
+
+class _RateLimitBudget:
+    """Shared search quota for one sync run.
+
+    Requests run concurrently, so a request is only started while the last
+    reported ``X-RateLimit-Remaining`` minus the requests already in flight
+    stays above ``github_rate_limit_buffer``.
+    """
+
+    def __init__(self, buffer: int) -> None:
+        self.buffer = buffer
+        self.remaining: int | None = None
+        self.reset_at: datetime | None = None
+        self.in_flight = 0
+        self.exhausted = False
+
+    def try_acquire(self) -> bool:
+        if self.exhausted:
+            return False
+        if self.remaining is not None and (
+            _should_stop_for_rate_limit(
+                str(self.remaining - self.in_flight), self.reset_at, self.buffer
+            )
+        ):
+            self.exhausted = True
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, response: httpx.Response | None) -> None:
+        self.in_flight -= 1
+        if response is None:
+            return
+        try:
+            remaining = int(response.headers["X-RateLimit-Remaining"])
+        except (KeyError, ValueError):
+            return
+        # Responses may arrive out of order; the lowest count is the newest.
+        if self.remaining is None or remaining < self.remaining:
+            self.remaining = remaining
+            self.reset_at = _parse_rate_limit_reset(
+                response.headers.get("X-RateLimit-Reset")
+            )
+
+
+class SearchPageCache:
+    """ETag + trimmed payload per search page, stored in Redis.
+
+    Lets sync send ``If-None-Match`` and reuse the cached page on 304, which
+    GitHub does not count against the rate limit. Goes through the shared
+    client (pool, timeouts, circuit breaker) in the threadpool.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    @staticmethod
+    def _key(params: dict) -> str:
+        raw = json.dumps(params, sort_keys=True)
+        digest = hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return SEARCH_CACHE_KEY.format(digest=digest)
+
+    def _get(self, params: dict) -> tuple[str, dict] | None:
+        client = get_redis_client(self._settings)
+        if not client:
+            return None
+        try:
+            cached = client.get(self._key(params))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("github search cache read failed: %s", exc)
+            return None
+        if not cached:
+            return None
+        entry = json.loads(cached)
+        return entry["etag"], entry["payload"]
+
+    def _set(self, params: dict, etag: str, payload: dict) -> None:
+        client = get_redis_client(self._settings)
+        if not client:
+            return
+        entry = json.dumps({"etag": etag, "payload": payload})
+        try:
+            client.set(self._key(params), entry, ex=SEARCH_CACHE_TTL)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("github search cache write failed: %s", exc)
+
+    async def get(self, params: dict) -> tuple[str, dict] | None:
+        return await run_in_threadpool(self._get, params)
+
+    async def set(self, params: dict, etag: str, payload: dict) -> None:
+        await run_in_threadpool(self._set, params, etag, payload)
+
+
+def _trim_payload(data: dict) -> dict:
+    """Keep only what sync reads, so cached pages stay small."""
+    return {
+        "total_count": data.get("total_count", 0),
+        "items": [
+            {field: item.get(field) for field in SYNC_REPO_FIELDS}
+            for item in data.get("items", [])
+        ],
+    }
+
+
+@dataclass
+class _SearchRun:
+    """State shared by every request of one sync run."""
+
+    client: httpx.AsyncClient
+    budget: _RateLimitBudget
+    semaphore: asyncio.Semaphore
+    cache: SearchPageCache | None = None
+
+
+async def _fetch_search_page(run: _SearchRun, params: dict) -> dict | None:
+    cached = await run.cache.get(params) if run.cache else None
+    headers = {"If-None-Match": cached[0]} if cached else None
+    async with run.semaphore:
+        if not run.budget.try_acquire():
+            return None
+        response = None
+        try:
+            response = await run.client.get(
+                GITHUB_API_URL, params=params, headers=headers
+            )
+        finally:
+            run.budget.release(response)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    if _is_rate_limited(response):
+        run.budget.exhausted = True
+        return None
+    response.raise_for_status()
+    data = _trim_payload(response.json())
+    etag = response.headers.get("ETag")
+    if run.cache and etag:
+        await run.cache.set(params, etag, data)
+    return data
+
+
+async def _fetch_github_search(
+    run: _SearchRun,
     settings: Settings,
     *,
     query: str,
@@ -57,107 +261,207 @@ def _fetch_github_search(
     max_pages: int,
     max_results: int,
 ) -> list[dict]:
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    if settings.github_token:
-        headers["Authorization"] = f"Bearer {settings.github_token}"
-
     per_page = min(settings.github_search_per_page, MAX_PER_PAGE)
     max_pages = max(1, max_pages)
     max_results = max(1, max_results)
-    results: list[dict] = []
-
-    with httpx.Client(timeout=30) as client:
-        for page in range(1, max_pages + 1):
-            params = {
-                "q": query,
-                "sort": sort,
-                "order": order,
-                "per_page": per_page,
-                "page": page,
-            }
-            response = client.get(GITHUB_API_URL, headers=headers, params=params)
-
-            if response.status_code in {403, 429}:
-                remaining = response.headers.get("X-RateLimit-Remaining")
-                reset_at = _parse_rate_limit_reset(
-                    response.headers.get("X-RateLimit-Reset")
-                )
-                retry_after = response.headers.get("Retry-After")
-                if remaining == "0" or retry_after:
-                    logger.warning(
-                        (
-                            "github rate limit hit (status=%s, remaining=%s, "
-                            "reset=%s, retry_after=%s), stop sync"
-                        ),
-                        response.status_code,
-                        remaining,
-                        reset_at.isoformat() if reset_at else "unknown",
-                        retry_after or "unknown",
-                    )
-                    break
-            response.raise_for_status()
-            data = response.json()
-            items = data.get("items", [])
-            if not items:
-                break
-            results.extend(items)
-
-            if len(results) >= max_results:
-                results = results[:max_results]
-                break
-
-            if len(items) < per_page:
-                break
-
-            remaining = response.headers.get("X-RateLimit-Remaining")
-            reset_at = _parse_rate_limit_reset(
-                response.headers.get("X-RateLimit-Reset")
+
+    def params(page: int) -> dict:
+        return {
+            "q": query,
+            "sort": sort,
+            "order": order,
+            "per_page": per_page,
+            "page": page,
+        }
+
+    # The first page tells us how many pages exist; the rest run concurrently.
+    first = await _fetch_search_page(run, params(1))
+    if not first:
+        return []
+    results: list[dict] = list(first.get("items", []))
+    available = min(
+        int(first.get("total_count") or 0), GITHUB_SEARCH_RESULT_CAP, max_results
+    )
+    pages = min(max_pages, -(-available // per_page))
+    if len(results) >= per_page and pages > 1:
+        rest = await asyncio.gather(
+            *(_fetch_search_page(run, params(page)) for page in range(2, pages + 1))
+        )
+        for data in rest:
+            if data:
+                results.extend(data.get("items", []))
+    return results[:max_results]
+
+
+def _newest_query(settings: Settings) -> str:
+    window_days = max(1, settings.github_newest_window_days)
+    since = (datetime.now(UTC) - timedelta(days=window_days)).date().isoformat()
+    return f"({settings.github_search_query}) created:>={since}"
+
+
+async def _no_repos() -> list[dict]:
+    return []
+
+
+async def _fetch_sync_streams(
+    settings: Settings,
+    *,
+    include_stars: bool = True,
+    include_newest: bool = True,
+    transport: httpx.AsyncBaseTransport | None = None,
+    cache: SearchPageCache | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Fetch the "by stars" and "by newest" searches over one pooled client."""
+    concurrency = max(1, settings.github_sync_concurrency)
+    if cache is None and settings.github_etag_cache:
+        cache = SearchPageCache(settings)
+    async with httpx.AsyncClient(
+        headers=_search_headers(settings),
+        timeout=30,
+        limits=httpx.Limits(max_connections=concurrency),
+        transport=transport,
+    ) as client:
+        run = _SearchRun(
+            client=client,
+            budget=_RateLimitBudget(settings.github_rate_limit_buffer),
+            semaphore=asyncio.Semaphore(concurrency),
+            cache=cache,
+        )
+        by_stars = (
+            _fetch_github_search(
+                run,
+                settings,
+                query=settings.github_search_query,
+                sort="stars",
+                order="desc",
+                max_pages=settings.github_max_pages,
+                max_results=settings.github_max_results,
+            )
+            if include_stars
+            else _no_repos()
+        )
+        by_newest = (
+            _fetch_github_search(
+                run,
+                settings,
+                query=_newest_query(settings),
+                sort="updated",
+                order="desc",
+                max_pages=settings.github_newest_max_pages,
+                max_results=settings.github_newest_max_results,
             )
-            if _should_stop_for_rate_limit(
-                remaining, reset_at, settings.github_rate_limit_buffer
-            ):
-                break
+            if include_newest
+            else _no_repos()
+        )
+        repos_by_stars, repos_by_newest = await asyncio.gather(by_stars, by_newest)
+    return repos_by_stars, repos_by_newest
 
-    return results
+
+def fetch_sync_repos(settings: Settings) -> tuple[list[dict], list[dict]]:
+    include_newest = (
+        settings.github_newest_max_results > 0 and settings.github_newest_max_pages > 0
+    )
+    return asyncio.run(_fetch_sync_streams(settings, include_newest=include_newest))
 
 
 def fetch_github_repos(settings: Settings) -> list[dict]:
-    return _fetch_github_search(
-        settings,
-        query=settings.github_search_query,
-        sort="stars",
-        order="desc",
-        max_pages=settings.github_max_pages,
-        max_results=settings.github_max_results,
-    )
+    repos, _ = asyncio.run(_fetch_sync_streams(settings, include_newest=False))
+    return repos
 
 
 def fetch_github_newest_repos(settings: Settings) -> list[dict]:
-    window_days = max(1, settings.github_newest_window_days)
-    since = (datetime.now(UTC) - timedelta(days=window_days)).date().isoformat()
-    query = f"({settings.github_search_query}) created:>={since}"
-    return _fetch_github_search(
-        settings,
-        query=query,
-        sort="updated",
-        order="desc",
-        max_pages=settings.github_newest_max_pages,
-        max_results=settings.github_newest_max_results,
-    )
-
+    _, repos = asyncio.run(_fetch_sync_streams(settings, include_stars=False))
+    return repos
+
+
+def _repo_values(repo: dict) -> dict:
+    """Map a GitHub search item onto the Skill columns sync owns."""
+    return {
+        "name": repo.get("name", ""),
+        "full_name": repo.get("full_name", ""),
+        "description": repo.get("description"),
+        "html_url": repo.get("html_url", ""),
+        "stars": repo.get("stargazers_count", 0),
+        "forks": repo.get("forks_count", 0),
+        "language": repo.get("language"),
+        "topics": ",".join(repo.get("topics", []) or []),
+        "repo_created_at": _parse_datetime(repo.get("created_at")),
+        "repo_updated_at": _parse_datetime(repo.get("updated_at")),
+        "last_pushed_at": _parse_datetime(repo.get("pushed_at")),
+    }
 
-def sync_github_skills(db: Session, settings: Settings) -> int:
-    repos: list[dict] = []
-    repos_by_stars = fetch_github_repos(settings)
-    repos.extend(repos_by_stars)
 
-    repos_by_newest: list[dict] = []
-    if settings.github_newest_max_results > 0 and settings.github_newest_max_pages > 0:
-        repos_by_newest = fetch_github_newest_repos(settings)
-        repos.extend(repos_by_newest)
+def _repo_fingerprint(values: dict) -> str:
+    """Stable hash of the columns sync owns; equal hashes mean no change."""
+    canonical = {
+        key: (
+            value.astimezone(UTC).isoformat() if isinstance(value, datetime) else value
+        )
+        for key, value in values.items()
+    }
+    raw = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _same_value(current: object, new: object) -> bool:
+    # MySQL/SQLite hand back naive UTC datetimes; GitHub timestamps are aware.
+    if isinstance(current, datetime) and isinstance(new, datetime):
+        if current.tzinfo is not None:
+            current = current.astimezone(UTC).replace(tzinfo=None)
+        if new.tzinfo is not None:
+            new = new.astimezone(UTC).replace(tzinfo=None)
+    return current == new
+
+
+@dataclass
+class SyncReport:
+    """Outcome of one sync run; ``changed_skill_ids`` drives invalidation."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    changed_skill_ids: list[int] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def as_dict(self) -> dict:
+        return {
+            "synced": self.total,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+        }
+
+
+def _lookup_fingerprints(
+    db: Session, repo_ids: list[int]
+) -> dict[int, tuple[int, str | None]]:
+    """Return ``{repo_id: (skill_id, fingerprint)}`` in chunked IN queries."""
+    found: dict[int, tuple[int, str | None]] = {}
+    for start in range(0, len(repo_ids), SYNC_LOOKUP_CHUNK):
+        chunk = repo_ids[start : start + SYNC_LOOKUP_CHUNK]
+        stmt = select(Skill.repo_id, Skill.id, Skill.sync_fingerprint).where(
+            Skill.repo_id.in_(chunk)
+        )
+        for repo_id, skill_id, fingerprint in db.execute(stmt):
+            found[repo_id] = (skill_id, fingerprint)
+    return found
+
+
+def _load_skills(db: Session, skill_ids: list[int]) -> dict[int, Skill]:
+    loaded: dict[int, Skill] = {}
+    for start in range(0, len(skill_ids), SYNC_LOOKUP_CHUNK):
+        chunk = skill_ids[start : start + SYNC_LOOKUP_CHUNK]
+        for skill in db.query(Skill).filter(Skill.id.in_(chunk)):
+            loaded[skill.id] = skill
+    return loaded
+
+
+def sync_github_skills(db: Session, settings: Settings) -> SyncReport:
+    repos_by_stars, repos_by_newest = fetch_sync_repos(settings)
+    repos = [*repos_by_stars, *repos_by_newest]
 
     logger.info(
         "github sync fetched repos: by_stars=%s, by_newest=%s, combined=%s",
@@ -166,7 +470,7 @@ def sync_github_skills(db: Session, settings: Settings) -> int:
         len(repos),
     )
 
-    count = 0
+    report = SyncReport()
     deduped: dict[int, dict] = {}
 
     for repo in repos:
@@ -176,35 +480,59 @@ def sync_github_skills(db: Session, settings: Settings) -> int:
         # Keep the latest seen payload for the repo; fields overlap and are safe.
         deduped[int(repo_id)] = repo
 
-    for repo in deduped.values():
-        repo_id = repo.get("id")
-        if repo_id is None:
-            continue
-
-        skill = db.query(Skill).filter(Skill.repo_id == repo_id).first()
-        if not skill:
-            skill = Skill(repo_id=repo_id)
+    # Compare fingerprints first; only changed rows are loaded in full.
+    known = _lookup_fingerprints(db, list(deduped))
+    pending: dict[int, tuple[dict, str]] = {}
+    new_skills: list[Skill] = []
+    for repo_id, repo in deduped.items():
+        values = _repo_values(repo)
+        fingerprint = _repo_fingerprint(values)
+        if repo_id not in known:
+            skill = Skill(repo_id=repo_id, sync_fingerprint=fingerprint, **values)
             db.add(skill)
-
-        skill.name = repo.get("name", "")
-        skill.full_name = repo.get("full_name", "")
-        description = repo.get("description")
-        skill.description = description
-        skill.html_url = repo.get("html_url", "")
-        skill.stars = repo.get("stargazers_count", 0)
-        skill.forks = repo.get("forks_count", 0)
-        skill.language = repo.get("language")
-        skill.topics = ",".join(repo.get("topics", []) or [])
-        skill.repo_created_at = _parse_datetime(repo.get("created_at"))
-        skill.repo_updated_at = _parse_datetime(repo.get("updated_at"))
-        skill.last_pushed_at = _parse_datetime(repo.get("pushed_at"))
-
-        if description and not skill.description_zh:
-            translated = translate_to_zh(description, settings)
-            if translated:
-                skill.description_zh = translated
-
-        count += 1
-
+            new_skills.append(skill)
+            continue
+        skill_id, stored = known[repo_id]
+        if stored == fingerprint:
+            report.unchanged += 1
+            continue
+        pending[skill_id] = (values, fingerprint)
+
+    changed: list[Skill] = []
+    topics_changed: list[Skill] = list(new_skills)
+    for skill_id, skill in _load_skills(db, list(pending)).items():
+        values, fingerprint = pending[skill_id]
+        # Only assign columns that actually changed to keep UPDATEs narrow.
+        updates = {
+            key: value
+            for key, value in values.items()
+            if not _same_value(getattr(skill, key), value)
+        }
+        for key, value in updates.items():
+            setattr(skill, key, value)
+        skill.sync_fingerprint = fingerprint
+        if "topics" in updates:
+            topics_changed.append(skill)
+        changed.append(skill)
+
+    # New skills need ids before their skill_topics rows can be written.
+    db.flush()
+    replace_skill_topics(db, topics_changed)
+    # Read ids before commit: commit expires every instance, and touching
+    # skill.id afterwards would reload each row with its own SELECT.
+    report.changed_skill_ids = [skill.id for skill in [*new_skills, *changed]]
     db.commit()
-    return count
+
+    report.inserted = len(new_skills)
+    report.updated = len(changed)
+    logger.info(
+        "github sync wrote: inserted=%s, updated=%s, unchanged=%s",
+        report.inserted,
+        report.updated,
+        report.unchanged,
+    )
+    if report.changed_skill_ids:
+        refresh_search_index(db, report.changed_skill_ids)
+        invalidate_counts(settings)
+        bump_catalog_version(settings)
+    return report
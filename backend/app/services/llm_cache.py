@@ -0,0 +1,277 @@
+"""Persistent cache of LLM outputs keyed by ``(model, prompt_version, input)``.
+
+Inputs are stored as their sha256 so identical descriptions (forks, templates)
+and unchanged enrichment inputs are answered without an API call. Bumping a
+caller's prompt version starts a fresh key space; old rows age out through the
+size-bounded LRU eviction.
+
+Cache reads and writes open their own session on the engine ``db`` is bound
+to, i.e. a separate pooled connection and transaction, so a cache failure
+never rolls back the caller's transaction.
+
+Writes are one bulk upsert that keeps a row's ``hits``. Hit counts and
+``last_used_at`` are buffered in process and flushed in batches; the table is
+only counted once this process's running estimate of its size passes the
+bound, and eviction then trims to ``LOW_WATER`` of it in one ``DELETE``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+from app.models.llm_cache import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_CHUNK = 500
+HIT_FLUSH_SIZE = 200
+HIT_FLUSH_SECONDS = 60.0
+# Eviction trims to this fraction of the bound so it runs once per ~10% of
+# new rows rather than on every store at capacity.
+LOW_WATER = 0.9
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+_state_lock = threading.Lock()
+_pending_hits: dict[tuple[str, str, str], int] = {}
+_pending_since = 0.0
+_rows_estimate: int | None = None
+
+
+def input_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _count(**deltas: int) -> None:
+    with _stats_lock:
+        for key, delta in deltas.items():
+            _stats[key] += delta
+
+
+def cache_stats() -> dict[str, int]:
+    """Hit/miss/eviction counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_cached_many(
+    db: Session, settings: Settings, prompt_version: str, inputs: Iterable[str]
+) -> dict[str, str]:
+    """Return ``{input: cached_value}`` for the inputs already in the cache."""
+    by_hash = {input_hash(text): text for text in inputs}
+    if not by_hash or not settings.llm_cache_enabled:
+        return {}
+
+    found: dict[str, str] = {}
+    hashes = list(by_hash)
+    try:
+        with Session(bind=db.get_bind()) as cache_db:
+            for start in range(0, len(hashes), LOOKUP_CHUNK):
+                chunk = hashes[start : start + LOOKUP_CHUNK]
+                rows = cache_db.execute(
+                    select(LLMCacheEntry.input_hash, LLMCacheEntry.value).where(
+                        LLMCacheEntry.model == settings.deepseek_model,
+                        LLMCacheEntry.prompt_version == prompt_version,
+                        LLMCacheEntry.input_hash.in_(chunk),
+                    )
+                )
+                for digest, value in rows:
+                    found[by_hash[digest]] = value
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("llm cache read failed: %s", exc)
+        _count(misses=len(by_hash))
+        return {}
+
+    _count(hits=len(found), misses=len(by_hash) - len(found))
+    if found and _add_hits(
+        (settings.deepseek_model, prompt_version, digest)
+        for digest, text in by_hash.items()
+        if text in found
+    ):
+        try:
+            with Session(bind=db.get_bind()) as cache_db:
+                flush_hits(cache_db)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("llm cache hit flush failed: %s", exc)
+    return found
+
+
+def get_cached(
+    db: Session, settings: Settings, prompt_version: str, text: str
+) -> str | None:
+    return get_cached_many(db, settings, prompt_version, [text]).get(text)
+
+
+def store_many(
+    db: Session, settings: Settings, prompt_version: str, values: dict[str, str]
+) -> None:
+    """Insert or refresh cached values, then evict beyond the size bound."""
+    if not values or not settings.llm_cache_enabled:
+        return
+    now = datetime.now(tz=UTC)
+    rows = [
+        {
+            "model": settings.deepseek_model,
+            "prompt_version": prompt_version,
+            "input_hash": input_hash(text),
+            "value": value,
+            "last_used_at": now,
+        }
+        for text, value in values.items()
+    ]
+    evicted = 0
+    try:
+        with Session(bind=db.get_bind()) as cache_db:
+            cache_db.execute(_upsert(cache_db.get_bind().dialect.name), rows)
+            cache_db.commit()
+            if _may_exceed(len(rows), settings.llm_cache_max_entries):
+                flush_hits(cache_db)
+                evicted = evict(cache_db, settings.llm_cache_max_entries)
+                cache_db.commit()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("llm cache write failed: %s", exc)
+        return
+    if evicted:
+        _count(evictions=evicted)
+
+
+def store(
+    db: Session, settings: Settings, prompt_version: str, text: str, value: str
+) -> None:
+    store_many(db, settings, prompt_version, {text: value})
+
+
+def _upsert(dialect: str):  # type: ignore[no-untyped-def]
+    """INSERT that refreshes ``value``/``last_used_at`` of existing keys only."""
+    if dialect == "mysql":
+        stmt = mysql.insert(LLMCacheEntry)
+        return stmt.on_duplicate_key_update(
+            value=stmt.inserted.value, last_used_at=stmt.inserted.last_used_at
+        )
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(LLMCacheEntry)
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            LLMCacheEntry.model,
+            LLMCacheEntry.prompt_version,
+            LLMCacheEntry.input_hash,
+        ],
+        set_={"value": stmt.excluded.value, "last_used_at": stmt.excluded.last_used_at},
+    )
+
+
+def _may_exceed(stored: int, max_entries: int) -> bool:
+    """Track an upper bound of the table size; True once it passes the bound.
+
+    Refreshed keys are counted as new, so the estimate only errs high; the
+    first store in a process always checks.
+    """
+    global _rows_estimate
+    if max_entries <= 0:
+        return False
+    with _state_lock:
+        if _rows_estimate is None:
+            return True
+        _rows_estimate += stored
+        return _rows_estimate > max_entries
+
+
+def _add_hits(keys: Iterable[tuple[str, str, str]]) -> bool:
+    """Buffer one hit per key; True when the buffer is due for a flush."""
+    global _pending_since
+    with _state_lock:
+        if not _pending_hits:
+            _pending_since = time.monotonic()
+        for key in keys:
+            _pending_hits[key] = _pending_hits.get(key, 0) + 1
+        return (
+            len(_pending_hits) >= HIT_FLUSH_SIZE
+            or time.monotonic() - _pending_since >= HIT_FLUSH_SECONDS
+        )
+
+
+def flush_hits(db: Session) -> int:
+    """Write buffered hit counts and ``last_used_at``; returns keys flushed.
+
+    Keys are grouped by model, prompt version and hit count so each group is
+    one ``UPDATE ... WHERE input_hash IN (...)`` per chunk. Commits *db*.
+    """
+    with _state_lock:
+        pending = dict(_pending_hits)
+        _pending_hits.clear()
+    if not pending:
+        return 0
+    groups: dict[tuple[str, str, int], list[str]] = defaultdict(list)
+    for (model, prompt_version, digest), hits in pending.items():
+        groups[(model, prompt_version, hits)].append(digest)
+    now = datetime.now(tz=UTC)
+    for (model, prompt_version, hits), digests in groups.items():
+        for start in range(0, len(digests), LOOKUP_CHUNK):
+            db.execute(
+                update(LLMCacheEntry)
+                .where(
+                    LLMCacheEntry.model == model,
+                    LLMCacheEntry.prompt_version == prompt_version,
+                    LLMCacheEntry.input_hash.in_(digests[start : start + LOOKUP_CHUNK]),
+                )
+                .values(hits=LLMCacheEntry.hits + hits, last_used_at=now)
+            )
+    db.commit()
+    return len(pending)
+
+
+def evict(db: Session, max_entries: int) -> int:
+    """Delete least recently used rows once more than *max_entries* remain.
+
+    Trims to ``LOW_WATER`` of the bound in a single ``DELETE``. The victims
+    are picked by key so ties on ``last_used_at`` cannot over-delete; the
+    ordered subquery is wrapped in a derived table because MySQL rejects
+    ``LIMIT`` directly inside ``IN`` and reading the table being deleted from.
+    """
+    global _rows_estimate
+    if max_entries <= 0:
+        return 0
+    total = db.execute(select(func.count()).select_from(LLMCacheEntry)).scalar() or 0
+    excess = total - math.ceil(max_entries * LOW_WATER) if total > max_entries else 0
+    evicted = 0
+    if excess > 0:
+        victims = (
+            select(
+                LLMCacheEntry.model,
+                LLMCacheEntry.prompt_version,
+                LLMCacheEntry.input_hash,
+            )
+            .order_by(LLMCacheEntry.last_used_at, LLMCacheEntry.created_at)
+            .limit(excess)
+            .subquery()
+        )
+        result = db.execute(
+            delete(LLMCacheEntry).where(
+                tuple_(
+                    LLMCacheEntry.model,
+                    LLMCacheEntry.prompt_version,
+                    LLMCacheEntry.input_hash,
+                ).in_(
+                    select(
+                        victims.c.model, victims.c.prompt_version, victims.c.input_hash
+                    )
+                )
+            )
+        )
+        evicted = max(result.rowcount or 0, 0)
+    with _state_lock:
+        _rows_estimate = total - evicted
+    return evicted
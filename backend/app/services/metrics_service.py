@@ -1,69 +1,336 @@
 import logging
-
-import redis
+import threading
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 
 from app.core.config import Settings
+from app.core.redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+PV_TTL = 86400 * 365  # Retain PV for 1 year
+
+# Unique visitors are HyperLogLogs (~12 KB at most) per UTC day; windows are
+# answered by merging day keys, so a day key must outlive the widest window.
+UV_MAX_WINDOW_DAYS = 30
+UV_DAY_TTL = 86400 * (UV_MAX_WINDOW_DAYS + 1)
+# Merged past days of a window never change, so the rollup is cached a day.
+UV_ROLLUP_TTL = 86400
+
 PV_KEY = "metrics:pv"
-UV_KEY = "metrics:uv"
+UV_KEY = "metrics:uv:{day}"
+UV_ROLLUP_KEY = "metrics:uv:rollup:{days}d:{day}"
 SKILL_PV_KEY = "metrics:skill:{skill_id}:pv"
-SKILL_UV_KEY = "metrics:skill:{skill_id}:uv"
+SKILL_UV_KEY = "metrics:skill:{skill_id}:uv:{day}"
+SKILL_UV_ROLLUP_KEY = "metrics:skill:{skill_id}:uv:rollup:{days}d:{day}"
 
 
-def _get_client(settings: Settings) -> redis.Redis | None:
-    try:
-        return redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("redis init failed: %s", exc)
-        return None
+# Skill views per hour/day bucket (member = skill id) for trending reads.
+SKILL_VIEWS_HOUR_KEY = "metrics:skills:views:h:{hour}"
+SKILL_VIEWS_DAY_KEY = "metrics:skills:views:d:{day}"
+SKILL_VIEWS_HOUR_TTL = 86400 * 2
+SKILL_VIEWS_DAY_TTL = 86400 * 31
+TRENDING_KEY = "metrics:skills:trending:{window}:{bucket}"
+TRENDING_CACHE_TTL = 60
+
+
+@dataclass(frozen=True)
+class TrendingWindow:
+    buckets: int
+    bucket_hours: int
+    # Bucket weight halves every *half_life* buckets of age.
+    half_life: float
+
+
+TRENDING_WINDOWS = {
+    "24h": TrendingWindow(buckets=24, bucket_hours=1, half_life=6),
+    "7d": TrendingWindow(buckets=7, bucket_hours=24, half_life=2),
+}
+
+
+def _day(value: date) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def _hour(value: datetime) -> str:
+    return value.strftime("%Y%m%d%H")
+
+
+def _now() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+def _today() -> date:
+    return _now().date()
 
 
 def track_visit(settings: Settings, visitor_id: str | None) -> None:
-    client = _get_client(settings)
-    if not client:
-        return
-    try:
-        pipe = client.pipeline()
-        pipe.incr(PV_KEY, 1)
-        pipe.expire(PV_KEY, 86400 * 365)  # Retain PV for 1 year
-        if visitor_id:
-            pipe.sadd(UV_KEY, visitor_id)
-            pipe.expire(UV_KEY, 86400 * 30)  # Retain UV for 30 days
-        pipe.execute()
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("track visit failed: %s", exc)
+    _record(settings, PV_KEY, UV_KEY.format(day=_day(_today())), visitor_id)
 
 
 def get_metrics(settings: Settings) -> tuple[int, int]:
-    client = _get_client(settings)
+    client = get_redis_client(settings)
     if not client:
         return 0, 0
     try:
         pv = int(client.get(PV_KEY) or 0)
-        uv = int(client.scard(UV_KEY))
-        return pv, uv
     except Exception as exc:  # noqa: BLE001
         logger.warning("get metrics failed: %s", exc)
         return 0, 0
+    return pv, get_uv(settings, UV_MAX_WINDOW_DAYS)
+
+
+def get_uv(settings: Settings, days: int, skill_id: int | None = None) -> int:
+    """Unique visitors over the last *days* UTC days, today included."""
+    client = get_redis_client(settings)
+    if not client:
+        return 0
+    days = max(1, min(days, UV_MAX_WINDOW_DAYS))
+    today = _today()
+    if skill_id is None:
+        day_key, rollup_key = UV_KEY, UV_ROLLUP_KEY
+    else:
+        day_key = SKILL_UV_KEY.replace("{skill_id}", str(skill_id))
+        rollup_key = SKILL_UV_ROLLUP_KEY.replace("{skill_id}", str(skill_id))
+    today_key = day_key.format(day=_day(today))
+    try:
+        if days == 1:
+            return int(client.pfcount(today_key))
+        rollup = rollup_key.format(days=days, day=_day(today))
+        if not client.exists(rollup):
+            past = [
+                day_key.format(day=_day(today - timedelta(days=offset)))
+                for offset in range(1, days)
+            ]
+            pipe = client.pipeline()
+            pipe.pfmerge(rollup, *past)
+            pipe.expire(rollup, UV_ROLLUP_TTL)
+            pipe.execute()
+        # PFCOUNT over several keys counts their union without storing it.
+        return int(client.pfcount(rollup, today_key))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("get uv failed: %s", exc)
+        return 0
 
 
 def track_skill_visit(
     settings: Settings, skill_id: int, visitor_id: str | None
 ) -> None:
-    client = _get_client(settings)
+    now = _now()
+    _record(
+        settings,
+        SKILL_PV_KEY.format(skill_id=skill_id),
+        SKILL_UV_KEY.format(skill_id=skill_id, day=_day(now.date())),
+        visitor_id,
+        rank_member=str(skill_id),
+        rank_keys=(
+            (SKILL_VIEWS_HOUR_KEY.format(hour=_hour(now)), SKILL_VIEWS_HOUR_TTL),
+            (SKILL_VIEWS_DAY_KEY.format(day=_day(now.date())), SKILL_VIEWS_DAY_TTL),
+        ),
+    )
+
+
+def get_trending_skills(
+    settings: Settings, window: str = "24h", limit: int = 10
+) -> list[tuple[int, float]]:
+    """Top ``(skill_id, score)`` pairs by exponentially decayed view counts.
+
+    The weighted union of the window's buckets is cached for
+    ``TRENDING_CACHE_TTL`` seconds, so most reads are a single ZREVRANGE.
+    """
+    spec = TRENDING_WINDOWS.get(window)
+    client = get_redis_client(settings)
+    if spec is None or not client:
+        return []
+    now = _now()
+    step = timedelta(hours=spec.bucket_hours)
+    weights: dict[str, float] = {}
+    for age in range(spec.buckets):
+        moment = now - step * age
+        key = (
+            SKILL_VIEWS_HOUR_KEY.format(hour=_hour(moment))
+            if spec.bucket_hours == 1
+            else SKILL_VIEWS_DAY_KEY.format(day=_day(moment.date()))
+        )
+        weights[key] = 0.5 ** (age / spec.half_life)
+    dest = TRENDING_KEY.format(window=window, bucket=_hour(now))
+    try:
+        if not client.exists(dest):
+            pipe = client.pipeline()
+            pipe.zunionstore(dest, weights)
+            pipe.expire(dest, TRENDING_CACHE_TTL)
+            pipe.execute()
+        rows = client.zrevrange(dest, 0, max(0, limit - 1), withscores=True)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("get trending skills failed: %s", exc)
+        return []
+    return [(int(member), round(float(score), 3)) for member, score in rows]
+
+
+def _record(
+    settings: Settings,
+    pv_key: str,
+    uv_key: str,
+    visitor_id: str | None,
+    *,
+    rank_member: str | None = None,
+    rank_keys: tuple[tuple[str, int], ...] = (),
+) -> None:
+    if settings.metrics_buffer_enabled:
+        metrics_buffer.add(
+            settings,
+            pv_key,
+            uv_key,
+            visitor_id,
+            rank_member=rank_member,
+            rank_keys=rank_keys,
+        )
+        return
+    client = get_redis_client(settings)
     if not client:
         return
     try:
         pipe = client.pipeline()
-        pv_key = SKILL_PV_KEY.format(skill_id=skill_id)
-        uv_key = SKILL_UV_KEY.format(skill_id=skill_id)
         pipe.incr(pv_key, 1)
-        pipe.expire(pv_key, 86400 * 365)  # Retain skill PV for 1 year
+        pipe.expire(pv_key, PV_TTL)
         if visitor_id:
-            pipe.sadd(uv_key, visitor_id)
-            pipe.expire(uv_key, 86400 * 30)  # Retain skill UV for 30 days
+            pipe.pfadd(uv_key, visitor_id)
+            pipe.expire(uv_key, UV_DAY_TTL)
+        if rank_member is not None:
+            for key, ttl in rank_keys:
+                pipe.zincrby(key, 1, rank_member)
+                pipe.expire(key, ttl)
         pipe.execute()
     except Exception as exc:  # noqa: BLE001
-        logger.warning("track skill visit failed: %s", exc)
+        logger.warning("track visit failed: %s", exc)
+
+
+class MetricsBuffer:
+    """Write-behind aggregation of PV, UV and skill-view increments per key.
+
+    Beacons only touch in-memory dicts; a background thread flushes them to
+    Redis in one pipeline every ``metrics_flush_interval`` seconds, or sooner
+    once ``metrics_flush_size`` events are pending. Events beyond
+    ``metrics_buffer_max_events`` (e.g. while Redis is down) are dropped and
+    counted rather than growing memory without bound.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._settings: Settings | None = None
+        self._pv: dict[str, int] = {}
+        self._uv: dict[str, set[str]] = {}
+        self._ranks: dict[str, dict[str, int]] = {}
+        self._rank_ttls: dict[str, int] = {}
+        self._pending = 0
+        self._stats = {"buffered": 0, "flushed": 0, "dropped": 0, "flushes": 0}
+
+    def add(
+        self,
+        settings: Settings,
+        pv_key: str,
+        uv_key: str,
+        visitor_id: str | None,
+        *,
+        rank_member: str | None = None,
+        rank_keys: tuple[tuple[str, int], ...] = (),
+    ) -> None:
+        with self._lock:
+            if self._pending >= settings.metrics_buffer_max_events:
+                self._stats["dropped"] += 1
+                return
+            self._settings = settings
+            self._pv[pv_key] = self._pv.get(pv_key, 0) + 1
+            if visitor_id:
+                self._uv.setdefault(uv_key, set()).add(visitor_id)
+            if rank_member is not None:
+                for key, ttl in rank_keys:
+                    members = self._ranks.setdefault(key, {})
+                    members[rank_member] = members.get(rank_member, 0) + 1
+                    self._rank_ttls[key] = ttl
+            self._pending += 1
+            self._stats["buffered"] += 1
+            full = self._pending >= settings.metrics_flush_size
+            if self._thread is None:
+                self._start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the events flushed."""
+        with self._lock:
+            pv, uv, pending = self._pv, self._uv, self._pending
+            ranks, rank_ttls = self._ranks, self._rank_ttls
+            self._pv, self._uv, self._pending = {}, {}, 0
+            self._ranks, self._rank_ttls = {}, {}
+            settings = self._settings
+        if not pending or settings is None:
+            return 0
+
+        client = get_redis_client(settings)
+        if not client:
+            self._count(dropped=pending)
+            return 0
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, count in pv.items():
+                pipe.incrby(key, count)
+                pipe.expire(key, PV_TTL)
+            for key, members in uv.items():
+                pipe.pfadd(key, *members)
+                pipe.expire(key, UV_DAY_TTL)
+            for key, counts in ranks.items():
+                for member, count in counts.items():
+                    pipe.zincrby(key, count, member)
+                pipe.expire(key, rank_ttls[key])
+            pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("metrics flush failed (%s events): %s", pending, exc)
+            self._count(dropped=pending)
+            return 0
+        self._count(flushed=pending, flushes=1)
+        return pending
+
+    def stop(self) -> None:
+        """Stop the flusher and drain what is still buffered."""
+        thread = self._thread
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout=5)
+        self.flush()
+        with self._lock:
+            self._thread = None
+            self._stopping.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "pending": self._pending}
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for key, delta in deltas.items():
+                self._stats[key] += delta
+
+    def _start(self) -> None:
+        # Called with the lock held on the first buffered event.
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            settings = self._settings
+            interval = settings.metrics_flush_interval if settings else 1.0
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                return
+            self.flush()
+
+
+metrics_buffer = MetricsBuffer()
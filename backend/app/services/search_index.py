@@ -0,0 +1,345 @@
+"""
+In-process inverted index behind free-text skill search.
+
+The index covers the same columns ``search_skills`` matches with ``LIKE``
+(name, full_name, description, description_zh, topics). Every field is
+split into character trigrams; CJK runs additionally contribute bigrams so
+two-character Chinese words resolve through the posting lists as well.
+Candidates from the posting-list intersection are verified with a substring
+check, so results are identical to the SQL path, which escapes ``%``/``_`` in
+the query and matches ``LIKE '%q%'`` literally.
+
+The index is per process. It is built lazily on the first search, refreshed
+incrementally after sync/enrich commits in the same process, and polls the
+``skills`` table (row count, sum of ids and ``max(updated_at)``) every
+``search_index_refresh_seconds`` to pick up writes from other processes.
+Async routes do the build/poll through ``warm_search_index`` in a worker
+thread, so the event loop only ever reads the current snapshot.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+
+logger = logging.getLogger(__name__)
+
+GRAM_SIZE = 3
+CJK_GRAM_SIZE = 2
+
+# Hiragana/Katakana, CJK Extension A, CJK Unified Ideographs, Hangul,
+# CJK Compatibility Ideographs.
+_CJK_RUN = re.compile(
+    "[\\u3040-\\u30ff\\u3400-\\u4dbf\\u4e00-\\u9fff\\uac00-\\ud7af\\uf900-\\ufaff]+"
+)
+
+# updated_at has second resolution on MySQL/SQLite; re-read a small window so
+# rows written in the same second as the watermark are not missed.
+_WATERMARK_SLACK = timedelta(seconds=1)
+
+_COLUMNS = (
+    Skill.id,
+    Skill.name,
+    Skill.full_name,
+    Skill.description,
+    Skill.description_zh,
+    Skill.topics,
+    Skill.stars,
+    Skill.language,
+    Skill.repo_created_at,
+    Skill.created_at,
+)
+
+
+def _grams(text: str) -> set[str]:
+    grams = {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+    for run in _CJK_RUN.findall(text):
+        grams.update(
+            run[i : i + CJK_GRAM_SIZE] for i in range(len(run) - CJK_GRAM_SIZE + 1)
+        )
+    return grams
+
+
+def _query_grams(query: str) -> set[str] | None:
+    """Return the grams every match must contain, or None to scan all docs."""
+    if len(query) >= GRAM_SIZE:
+        return {query[i : i + GRAM_SIZE] for i in range(len(query) - GRAM_SIZE + 1)}
+    if len(query) == CJK_GRAM_SIZE and _CJK_RUN.fullmatch(query):
+        return {query}
+    return None
+
+
+def _timestamp(value: datetime | None) -> float:
+    if value is None:
+        return float("-inf")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+@dataclass(slots=True, frozen=True)
+class _Doc:
+    id: int
+    fields: tuple[str, ...]
+    stars: int
+    created_key: float
+    language: str
+    full_name: str
+    topics: frozenset[str]
+
+    @classmethod
+    def from_row(cls, row) -> _Doc:  # type: ignore[no-untyped-def]
+        topics_lc = (row.topics or "").lower()
+        return cls(
+            id=row.id,
+            fields=(
+                (row.name or "").lower(),
+                (row.full_name or "").lower(),
+                (row.description or "").lower(),
+                (row.description_zh or "").lower(),
+                topics_lc,
+            ),
+            stars=int(row.stars or 0),
+            created_key=_timestamp(row.repo_created_at or row.created_at),
+            language=(row.language or "").lower(),
+            full_name=(row.full_name or "").lower(),
+            topics=frozenset(t for t in topics_lc.split(",") if t),
+        )
+
+    def grams(self) -> set[str]:
+        grams: set[str] = set()
+        for field in self.fields:
+            grams |= _grams(field)
+        return grams
+
+    def matches(self, query: str) -> bool:
+        return any(query in field for field in self.fields)
+
+
+class SkillSearchIndex:
+    """Trigram inverted index over the searchable ``skills`` columns."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._docs: dict[int, _Doc] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._built = False
+        self._watermark: datetime | None = None
+        self._checked_at = 0.0
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, db: Session) -> None:
+        rows = db.execute(select(*_COLUMNS)).all()
+        watermark = db.execute(select(func.max(Skill.updated_at))).scalar()
+        docs: dict[int, _Doc] = {}
+        postings: dict[str, set[int]] = {}
+        for row in rows:
+            doc = _Doc.from_row(row)
+            docs[doc.id] = doc
+            for gram in doc.grams():
+                postings.setdefault(gram, set()).add(doc.id)
+        with self._lock:
+            self._docs = docs
+            self._postings = postings
+            self._watermark = watermark
+            self._built = True
+            self._checked_at = time.monotonic()
+        logger.info("search index built: %s skills, %s grams", len(docs), len(postings))
+
+    def refresh(self, db: Session, skill_ids: Iterable[int] | None = None) -> None:
+        """Re-index *skill_ids*, or every row changed since the last refresh."""
+        if not self._built:
+            return
+        if skill_ids is None:
+            self._poll(db)
+            return
+        ids = list(skill_ids)
+        if not ids:
+            return
+        rows = db.execute(select(*_COLUMNS).where(Skill.id.in_(ids))).all()
+        self._upsert(rows)
+
+    def needs_refresh(self, settings: Settings) -> bool:
+        if not self._built:
+            return True
+        elapsed = time.monotonic() - self._checked_at
+        return elapsed >= settings.search_index_refresh_seconds
+
+    def ensure_fresh(self, db: Session, settings: Settings) -> bool:
+        """Build or poll the index; False if it is not built yet.
+
+        Never blocks on the refresh lock: async routes run this in greenlets
+        on the event loop thread, where waiting for another request's build
+        would deadlock the loop. Callers fall back to SQL while it is False.
+        """
+        if not self.needs_refresh(settings):
+            return True
+        # Another request is already building or polling; serve from the
+        # current snapshot, if there is one.
+        if not self._refresh_lock.acquire(blocking=False):
+            return self._built
+        try:
+            if self._built:
+                self._poll(db)
+            else:
+                self.build(db)
+        finally:
+            self._refresh_lock.release()
+        return True
+
+    def search(
+        self,
+        query: str,
+        *,
+        topic: str | None = None,
+        language: str | None = None,
+        owner: str | None = None,
+        sort: str = "stars",
+        limit: int = 20,
+        offset: int = 0,
+        after: tuple[Any, int] | None = None,
+    ) -> tuple[int, list[int]]:
+        """Return ``(total, page_ids)`` with the same semantics as the SQL path.
+
+        *after* is a decoded keyset cursor ``(sort_value, id)``; only documents
+        ordered strictly after it are paged, while *total* still counts every
+        match.
+        """
+        needle = query.lower()
+        topic_value = (topic or "").strip().lower()
+        language_value = (language or "").strip().lower()
+        owner_prefix = f"{owner.strip().lower()}/" if owner and owner.strip() else ""
+
+        with self._lock:
+            docs = self._docs
+            candidates = self._candidates(needle)
+            matched = [
+                doc
+                for doc in (docs[doc_id] for doc_id in candidates if doc_id in docs)
+                if doc.matches(needle)
+                and (not topic_value or topic_value in doc.topics)
+                and (not language_value or doc.language == language_value)
+                and (not owner_prefix or doc.full_name.startswith(owner_prefix))
+            ]
+
+        if sort == "newest":
+            key = lambda doc: (-doc.created_key, -doc.id)  # noqa: E731
+        else:
+            key = lambda doc: (-doc.stars, -doc.id)  # noqa: E731
+        remaining: Iterable[_Doc] = matched
+        if after is not None:
+            value, last_id = after
+            if sort == "newest":
+                after_key = (-_timestamp(value), -last_id)
+            else:
+                after_key = (-int(value), -last_id)
+            remaining = (doc for doc in matched if key(doc) > after_key)
+        page = heapq.nsmallest(offset + limit, remaining, key=key)[offset:]
+        return len(matched), [doc.id for doc in page]
+
+    def _candidates(self, needle: str) -> Iterable[int]:
+        grams = _query_grams(needle)
+        if grams is None:
+            return self._docs.keys()
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def _poll(self, db: Session) -> None:
+        count, id_sum, latest = db.execute(
+            select(func.count(Skill.id), func.sum(Skill.id), func.max(Skill.updated_at))
+        ).one()
+        self._checked_at = time.monotonic()
+        with self._lock:
+            indexed = (len(self._docs), sum(self._docs))
+        # A delete plus an insert keeps the count but changes the id sum.
+        if (count, id_sum or 0) != indexed:
+            self.build(db)
+            return
+        if latest is None or latest == self._watermark:
+            return
+        stmt = select(*_COLUMNS)
+        if self._watermark is not None:
+            stmt = stmt.where(Skill.updated_at >= self._watermark - _WATERMARK_SLACK)
+        self._upsert(db.execute(stmt).all())
+        with self._lock:
+            self._watermark = latest
+
+    def _upsert(self, rows: Iterable) -> None:
+        with self._lock:
+            for row in rows:
+                doc = _Doc.from_row(row)
+                previous = self._docs.get(doc.id)
+                if previous is not None:
+                    for gram in previous.grams():
+                        posting = self._postings.get(gram)
+                        if posting is not None:
+                            posting.discard(doc.id)
+                            if not posting:
+                                del self._postings[gram]
+                self._docs[doc.id] = doc
+                for gram in doc.grams():
+                    self._postings.setdefault(gram, set()).add(doc.id)
+
+
+_index = SkillSearchIndex()
+
+
+def get_search_engine(settings: Settings | None = None) -> SkillSearchIndex | None:
+    """Return the configured search engine, or None to use the SQL path."""
+    settings = settings or get_settings()
+    if settings.search_engine != "index":
+        return None
+    return _index
+
+
+def warm_search_index(settings: Settings | None = None) -> None:
+    """Build or poll the index when due, on a session of its own.
+
+    Blocking (CPU and sync queries); async callers run it in a worker thread.
+    """
+    settings = settings or get_settings()
+    engine = get_search_engine(settings)
+    if engine is None or not engine.needs_refresh(settings):
+        return
+    try:
+        with SessionLocal() as db:
+            engine.ensure_fresh(db, settings)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("search index warm-up failed: %s", exc)
+
+
+def refresh_search_index(db: Session, skill_ids: Iterable[int]) -> None:
+    """Re-index *skill_ids* after a commit; no-op until the index is built."""
+    try:
+        _index.refresh(db, skill_ids)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("search index refresh failed: %s", exc)
+
+
+def reset_search_index() -> None:
+    """Drop the index so the next search rebuilds it (tests, benchmarks)."""
+    global _index
+    _index = SkillSearchIndex()
@@ -1,42 +1,189 @@
-from sqlalchemy import func, select
+import base64
+import binascii
+import json
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.models.skill import Skill
+from app.core.config import get_settings
+from app.models.skill import Skill, SkillRelated, SkillTopic
+from app.services.count_cache import (
+    count_cache_field,
+    get_cached_count,
+    set_cached_count,
+)
+from app.services.search_index import get_search_engine, warm_search_index
+from app.services.topic_service import parse_topics
 
+logger = logging.getLogger(__name__)
 
-def search_skills(
+# Sort key + id of the last row on the previous page, see encode_cursor().
+SeekKey = tuple[Any, int]
+
+# Related-skill scoring weights.
+TOPIC_WEIGHT = 3
+LANGUAGE_WEIGHT = 2
+OWNER_WEIGHT = 1
+
+
+# How search_skills_page() computes ``total``:
+#   exact  - COUNT(*) over the filtered set on every call
+#   cached - shared cache keyed by the normalized filters, cleared on commit
+#   none   - skip counting; callers rely on ``has_more`` instead
+COUNT_STRATEGIES = ("exact", "cached", "none")
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so *value* matches literally (with LIKE_ESCAPE)."""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", f"{LIKE_ESCAPE}%")
+        .replace("_", f"{LIKE_ESCAPE}_")
+    )
+
+
+@dataclass
+class SkillPage:
+    total: int | None
+    items: list[Skill]
+    has_more: bool = False
+    next_cursor: str | None = None
+
+
+def _sort_value(skill: Skill, sort: str) -> Any:
+    if sort == "newest":
+        return skill.repo_created_at or skill.created_at
+    return skill.stars
+
+
+def encode_cursor(skill: Skill, sort: str) -> str:
+    """Encode an opaque keyset cursor pointing just after *skill*."""
+    value = _sort_value(skill, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, skill.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> SeekKey:
+    """Decode a cursor produced by encode_cursor() for the same *sort*.
+
+    Raises ValueError if the cursor is malformed or was issued for a
+    different sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, skill_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if cursor_sort != sort or not isinstance(skill_id, int):
+        raise ValueError("invalid cursor")
+    if sort == "newest":
+        if not isinstance(value, str):
+            raise ValueError("invalid cursor")
+        return datetime.fromisoformat(value), skill_id
+    if not isinstance(value, int):
+        raise ValueError("invalid cursor")
+    return value, skill_id
+
+
+def _skill_ids_with_topics(topics: list[str]):  # type: ignore[no-untyped-def]
+    """Subquery over the indexed skill_topics table."""
+    return select(SkillTopic.skill_id).where(SkillTopic.topic.in_(topics))
+
+
+def load_skills_in_order(db: Session, ids: list[int]) -> list[Skill]:
+    if not ids:
+        return []
+    rows = db.execute(select(Skill).where(Skill.id.in_(ids))).scalars().all()
+    by_id = {skill.id: skill for skill in rows}
+    return [by_id[skill_id] for skill_id in ids if skill_id in by_id]
+
+
+def _search_with_engine(
+    db: Session,
+    query: str,
+    topic: str | None,
+    language: str | None,
+    owner: str | None,
+    sort: str,
+    limit: int,
+    offset: int,
+    after: SeekKey | None,
+    refresh_index: bool = True,
+) -> tuple[int, list[Skill]] | None:
+    settings = get_settings()
+    engine = get_search_engine(settings)
+    if engine is None:
+        return None
+    try:
+        fresh = engine.ensure_fresh(db, settings) if refresh_index else engine.built
+        if not fresh:
+            return None
+        total, ids = engine.search(
+            query,
+            topic=topic,
+            language=language,
+            owner=owner,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+            after=after,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("search index unavailable, falling back to sql: %s", exc)
+        return None
+    return total, load_skills_in_order(db, ids)
+
+
+def _search_with_sql(
     db: Session,
     query: str | None,
-    topic: str | None = None,
-    language: str | None = None,
-    owner: str | None = None,
-    sort: str = "stars",
-    limit: int = 20,
-    offset: int = 0,
-) -> tuple[int, list[Skill]]:
+    topic: str | None,
+    language: str | None,
+    owner: str | None,
+    sort: str,
+    limit: int,
+    offset: int,
+    after: SeekKey | None,
+    count: str,
+    cached_total: int | None = None,
+) -> tuple[int | None, list[Skill]]:
     stmt = select(Skill)
 
     full_name_lc = func.lower(Skill.full_name)
     language_lc = func.lower(func.coalesce(Skill.language, ""))
-    topics_lc = func.lower(func.coalesce(Skill.topics, ""))
 
     if query:
-        q = f"%{query.lower()}%"
+        # Literal substring match, same as the search index.
+        q = f"%{escape_like(query.lower())}%"
         name_lc = func.lower(Skill.name)
+        topics_lc = func.lower(func.coalesce(Skill.topics, ""))
         desc_lc = func.lower(func.coalesce(Skill.description, ""))
         desc_zh_lc = func.lower(func.coalesce(Skill.description_zh, ""))
         stmt = stmt.where(
-            name_lc.like(q)
-            | full_name_lc.like(q)
-            | desc_lc.like(q)
-            | desc_zh_lc.like(q)
-            | topics_lc.like(q)
+            name_lc.like(q, escape=LIKE_ESCAPE)
+            | full_name_lc.like(q, escape=LIKE_ESCAPE)
+            | desc_lc.like(q, escape=LIKE_ESCAPE)
+            | desc_zh_lc.like(q, escape=LIKE_ESCAPE)
+            | topics_lc.like(q, escape=LIKE_ESCAPE)
         )
 
     if owner:
         owner_value = owner.strip().lower()
         if owner_value:
-            stmt = stmt.where(full_name_lc.like(f"{owner_value}/%"))
+            stmt = stmt.where(
+                full_name_lc.like(f"{escape_like(owner_value)}/%", escape=LIKE_ESCAPE)
+            )
 
     if language:
         language_value = language.strip().lower()
@@ -46,28 +193,141 @@ def search_skills(
     if topic:
         topic_value = topic.strip().lower()
         if topic_value:
-            # Topics are stored as a comma-separated string without spaces.
-            stmt = stmt.where(
-                (topics_lc == topic_value)
-                | (topics_lc.like(f"{topic_value},%"))
-                | (topics_lc.like(f"%,{topic_value}"))
-                | (topics_lc.like(f"%,{topic_value},%"))
-            )
+            stmt = stmt.where(Skill.id.in_(_skill_ids_with_topics([topic_value])))
 
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = db.execute(count_stmt).scalar_one()
+    total = None
+    if count != "none":
+        settings = get_settings()
+        field = count_cache_field(query, topic, language, owner)
+        total = cached_total
+        if total is None and count == "cached":
+            total = get_cached_count(settings, field)
+        if total is None:
+            count_stmt = select(func.count()).select_from(stmt.subquery())
+            total = db.execute(count_stmt).scalar_one()
+            if count == "cached":
+                set_cached_count(settings, field, total)
 
-    order_by = Skill.stars.desc()
+    sort_column = Skill.stars
     if sort == "newest":
-        order_by = func.coalesce(Skill.repo_created_at, Skill.created_at).desc()
+        sort_column = func.coalesce(Skill.repo_created_at, Skill.created_at)
+
+    if after is not None:
+        value, last_id = after
+        stmt = stmt.where(
+            (sort_column < value) | ((sort_column == value) & (Skill.id < last_id))
+        )
 
     items = (
-        db.execute(stmt.order_by(order_by, Skill.id.desc()).offset(offset).limit(limit))
+        db.execute(
+            stmt.order_by(sort_column.desc(), Skill.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
         .scalars()
         .all()
     )
 
-    return total, items
+    return total, list(items)
+
+
+def search_skills_page(
+    db: Session,
+    query: str | None,
+    topic: str | None = None,
+    language: str | None = None,
+    owner: str | None = None,
+    sort: str = "stars",
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+    count: str = "exact",
+    refresh_index: bool = True,
+    cached_total: int | None = None,
+) -> SkillPage:
+    """Search skills and return one page plus the cursor for the next one.
+
+    With *cursor* the page seeks on ``(stars, id)`` or
+    ``(coalesce(repo_created_at, created_at), id)`` instead of skipping rows,
+    so every page costs the same regardless of depth. *offset* is still
+    applied after the seek.
+
+    *count* selects one of COUNT_STRATEGIES; with ``"none"`` the returned
+    ``total`` is None.
+
+    ``search_skills_page_async`` does the blocking work up front in the
+    threadpool and then passes ``refresh_index=False`` (search the current
+    index snapshot) and the count-cache value it read as *cached_total*.
+    """
+    after = decode_cursor(cursor, sort) if cursor else None
+
+    # Fetch one extra row to know whether another page exists.
+    result = None
+    if query:
+        result = _search_with_engine(
+            db,
+            query,
+            topic,
+            language,
+            owner,
+            sort,
+            limit + 1,
+            offset,
+            after,
+            refresh_index,
+        )
+    if result is None:
+        result = _search_with_sql(
+            db,
+            query,
+            topic,
+            language,
+            owner,
+            sort,
+            limit + 1,
+            offset,
+            after,
+            count,
+            cached_total,
+        )
+
+    total, items = result
+    if count == "none":
+        # The index computes totals for free, but keep the contract uniform.
+        total = None
+    has_more = len(items) > limit
+    next_cursor = None
+    if has_more:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1], sort)
+    return SkillPage(
+        total=total, items=items, has_more=has_more, next_cursor=next_cursor
+    )
+
+
+def search_skills(
+    db: Session,
+    query: str | None,
+    topic: str | None = None,
+    language: str | None = None,
+    owner: str | None = None,
+    sort: str = "stars",
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> tuple[int, list[Skill]]:
+    page = search_skills_page(
+        db,
+        query,
+        topic=topic,
+        language=language,
+        owner=owner,
+        sort=sort,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    return page.total or 0, page.items
 
 
 def get_skill_by_full_name(db: Session, full_name: str) -> Skill | None:
@@ -76,6 +336,21 @@ def get_skill_by_full_name(db: Session, full_name: str) -> Skill | None:
     )
 
 
+def get_skill_version(db: Session, full_name: str) -> str | None:
+    """Cheap change token for one skill, read without loading the row."""
+    row = db.execute(
+        select(Skill.id, Skill.updated_at, Skill.content_updated_at).where(
+            func.lower(Skill.full_name) == full_name.lower()
+        )
+    ).first()
+    if row is None:
+        return None
+    parts = [str(row.id)]
+    for value in (row.updated_at, row.content_updated_at):
+        parts.append(value.isoformat() if value else "-")
+    return "|".join(parts)
+
+
 def get_related_skills(db: Session, skill: Skill, limit: int = 6) -> list[Skill]:
     """Return skills related to *skill* using a weighted scoring algorithm.
 
@@ -94,26 +369,20 @@ def get_related_skills(db: Session, skill: Skill, limit: int = 6) -> list[Skill]
     # Build SQL pre-filter: must share at least one dimension with the source.
     full_name_lc = func.lower(Skill.full_name)
     language_lc = func.lower(func.coalesce(Skill.language, ""))
-    topics_lc = func.lower(func.coalesce(Skill.topics, ""))
 
     conditions = []
-    for topic in topics:
-        conditions.append(
-            (topics_lc == topic)
-            | (topics_lc.like(f"{topic},%"))
-            | (topics_lc.like(f"%,{topic}"))
-            | (topics_lc.like(f"%,{topic},%"))
-        )
+    if topics:
+        conditions.append(Skill.id.in_(_skill_ids_with_topics(sorted(topics))))
     if language:
         conditions.append(language_lc == language)
     if owner:
-        conditions.append(full_name_lc.like(f"{owner}/%"))
+        conditions.append(
+            full_name_lc.like(f"{escape_like(owner)}/%", escape=LIKE_ESCAPE)
+        )
 
     if not conditions:
         return []
 
-    from sqlalchemy import or_
-
     stmt = (
         select(Skill)
         .where(Skill.id != skill.id)
@@ -130,18 +399,273 @@ def get_related_skills(db: Session, skill: Skill, limit: int = 6) -> list[Skill]
         c_topics = {
             t.strip().lower() for t in (candidate.topics or "").split(",") if t.strip()
         }
-        score += len(topics & c_topics) * 3
+        score += len(topics & c_topics) * TOPIC_WEIGHT
         if language and (candidate.language or "").strip().lower() == language:
-            score += 2
+            score += LANGUAGE_WEIGHT
         c_owner = (
             candidate.full_name.split("/")[0].lower()
             if "/" in candidate.full_name
             else ""
         )
         if owner and c_owner == owner:
-            score += 1
+            score += OWNER_WEIGHT
         if score > 0:
             scored.append((score, candidate.stars, candidate))
 
     scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
     return [item[2] for item in scored[:limit]]
+
+
+def _owner_of(full_name: str) -> str:
+    return full_name.split("/")[0].lower() if "/" in full_name else ""
+
+
+def compute_related_graph(
+    skills: Iterable[Any], top_n: int
+) -> dict[int, list[tuple[int, int]]]:
+    """Score related skills for the whole catalog in one pass.
+
+    *skills* are rows exposing ``id``, ``full_name``, ``language``, ``topics``
+    and ``stars``. Returns ``{skill_id: [(related_id, score), ...]}`` ordered
+    by score, then stars, then id (all descending), using the same weights as
+    get_related_skills().
+
+    Topic and owner overlaps are accumulated through inverted buckets. A
+    language match alone is worth the same for every candidate, so those are
+    taken from a per-language list pre-sorted by stars instead of scoring the
+    whole (often huge) language bucket for every skill.
+    """
+    rows = list(skills)
+    stars = {row.id: int(row.stars or 0) for row in rows}
+    topics_of: dict[int, list[str]] = {}
+    language_of: dict[int, str] = {}
+    owner_of: dict[int, str] = {}
+    by_topic: dict[str, list[int]] = {}
+    by_owner: dict[str, list[int]] = {}
+    by_language: dict[str, list[int]] = {}
+    for row in rows:
+        topics_of[row.id] = parse_topics(row.topics)
+        language_of[row.id] = (row.language or "").strip().lower()
+        owner_of[row.id] = _owner_of(row.full_name or "")
+        for topic in topics_of[row.id]:
+            by_topic.setdefault(topic, []).append(row.id)
+        if owner_of[row.id]:
+            by_owner.setdefault(owner_of[row.id], []).append(row.id)
+        if language_of[row.id]:
+            by_language.setdefault(language_of[row.id], []).append(row.id)
+
+    def rank_key(item: tuple[int, int]) -> tuple[int, int, int]:
+        candidate, score = item
+        return score, stars[candidate], candidate
+
+    for ids in by_language.values():
+        ids.sort(key=lambda candidate: (stars[candidate], candidate), reverse=True)
+
+    graph: dict[int, list[tuple[int, int]]] = {}
+    for row in rows:
+        skill_id = row.id
+        language = language_of[skill_id]
+        scores: dict[int, int] = {}
+        for topic in topics_of[skill_id]:
+            for candidate in by_topic[topic]:
+                scores[candidate] = scores.get(candidate, 0) + TOPIC_WEIGHT
+        for candidate in by_owner.get(owner_of[skill_id], ()):
+            scores[candidate] = scores.get(candidate, 0) + OWNER_WEIGHT
+        scores.pop(skill_id, None)
+        if language:
+            for candidate in scores:
+                if language_of[candidate] == language:
+                    scores[candidate] += LANGUAGE_WEIGHT
+            extra = 0
+            for candidate in by_language[language]:
+                if extra >= top_n:
+                    break
+                if candidate == skill_id or candidate in scores:
+                    continue
+                scores[candidate] = LANGUAGE_WEIGHT
+                extra += 1
+        ranked = sorted(scores.items(), key=rank_key, reverse=True)[:top_n]
+        if ranked:
+            graph[skill_id] = ranked
+    return graph
+
+
+def score_related_matrix(
+    skills: Iterable[Any], top_n: int, block_cells: int = 1 << 23
+) -> dict[int, list[tuple[int, int]]]:
+    """Vectorized equivalent of compute_related_graph() using NumPy/SciPy.
+
+    Builds a sparse incidence matrix ``X = [topics | language | owner]`` (the
+    last two one-hot) and a diagonal weight matrix ``W``, so all pairwise
+    scores are ``(X W) X^T``. Rows are processed in blocks of roughly
+    *block_cells* dense cells to bound memory. Ties break on stars, then id,
+    by folding a stars rank into a single int64 sort key.
+
+    Requires numpy and scipy; raises ImportError when they are missing.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    rows = list(skills)
+    n = len(rows)
+    if n == 0 or top_n <= 0:
+        return {}
+
+    ids = np.array([row.id for row in rows], dtype=np.int64)
+    columns: dict[tuple[str, str], int] = {}
+    weights: list[int] = []
+    indptr = [0]
+    indices: list[int] = []
+
+    def column(kind: str, value: str, weight: int) -> int:
+        key = (kind, value)
+        if key not in columns:
+            columns[key] = len(weights)
+            weights.append(weight)
+        return columns[key]
+
+    for row in rows:
+        cols = [column("t", topic, TOPIC_WEIGHT) for topic in parse_topics(row.topics)]
+        language = (row.language or "").strip().lower()
+        if language:
+            cols.append(column("l", language, LANGUAGE_WEIGHT))
+        owner = _owner_of(row.full_name or "")
+        if owner:
+            cols.append(column("o", owner, OWNER_WEIGHT))
+        indices.extend(cols)
+        indptr.append(len(indices))
+
+    if not weights:
+        return {}
+    data = np.ones(len(indices), dtype=np.int32)
+    x = sparse.csr_matrix((data, indices, indptr), shape=(n, len(weights)))
+    xw = x @ sparse.diags(np.array(weights, dtype=np.int32), dtype=np.int32)
+    xt = x.T.tocsc()
+
+    # rank[i] orders skills by (stars, id) ascending; folded into the score.
+    stars = np.array([int(row.stars or 0) for row in rows], dtype=np.int64)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((ids, stars))] = np.arange(n, dtype=np.int64)
+
+    k = min(top_n, n)
+    block = max(1, block_cells // n)
+    graph: dict[int, list[tuple[int, int]]] = {}
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        scores = (xw[start:stop] @ xt).toarray().astype(np.int64)
+        keys = scores * n + rank
+        keys[scores <= 0] = -1
+        keys[np.arange(stop - start), np.arange(start, stop)] = -1
+        top = np.argpartition(keys, n - k, axis=1)[:, n - k :]
+        top_keys = np.take_along_axis(keys, top, axis=1)
+        order = np.argsort(-top_keys, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_keys = np.take_along_axis(top_keys, order, axis=1)
+        for offset in range(stop - start):
+            related = [
+                (int(ids[col]), int(key // n))
+                for col, key in zip(top[offset], top_keys[offset], strict=True)
+                if key >= 0
+            ]
+            if related:
+                graph[int(ids[start + offset])] = related
+    return graph
+
+
+def store_related_graph(db: Session, graph: dict[int, list[tuple[int, int]]]) -> int:
+    """Replace the ``skill_related`` table with *graph*. Does not commit."""
+    db.execute(delete(SkillRelated))
+    rows = [
+        {"skill_id": skill_id, "rank": rank, "related_id": related_id, "score": score}
+        for skill_id, related in graph.items()
+        for rank, (related_id, score) in enumerate(related)
+    ]
+    if rows:
+        db.execute(insert(SkillRelated), rows)
+    return len(rows)
+
+
+def lookup_related_skills(db: Session, skill: Skill, limit: int = 6) -> list[Skill]:
+    """Serve related skills from ``skill_related``, scoring live if missing."""
+    stmt = (
+        select(Skill)
+        .join(SkillRelated, SkillRelated.related_id == Skill.id)
+        .where(SkillRelated.skill_id == skill.id)
+        .order_by(SkillRelated.rank)
+        .limit(limit)
+    )
+    items = list(db.execute(stmt).scalars().all())
+    if items:
+        return items
+    return get_related_skills(db, skill, limit=limit)
+
+
+# ---------------------------------------------------------------------------
+# Async variants for routes running on the event loop. Single-row lookups are
+# native async queries; the search and related paths reuse the sync
+# implementations through ``AsyncSession.run_sync``, which drives them on the
+# loop via greenlets (no threadpool) so both paths stay identical. Anything
+# that would block the loop inside them (Redis round trips, the search index
+# build) is done in the threadpool before or after the run_sync call.
+# ---------------------------------------------------------------------------
+
+
+async def search_skills_page_async(
+    db: AsyncSession, query: str | None, **kwargs: Any
+) -> SkillPage:
+    settings = get_settings()
+    if query:
+        await run_in_threadpool(warm_search_index, settings)
+    field = None
+    cached_total = None
+    if kwargs.get("count") == "cached":
+        field = count_cache_field(
+            query, kwargs.get("topic"), kwargs.get("language"), kwargs.get("owner")
+        )
+        cached_total = await run_in_threadpool(get_cached_count, settings, field)
+        # The sync path must not touch Redis; it counts on a miss.
+        kwargs["count"] = "exact"
+    page = await db.run_sync(
+        lambda sync_db: search_skills_page(
+            sync_db,
+            query,
+            refresh_index=False,
+            cached_total=cached_total,
+            **kwargs,
+        )
+    )
+    if field is not None and cached_total is None and page.total is not None:
+        await run_in_threadpool(set_cached_count, settings, field, page.total)
+    return page
+
+
+async def search_skills_async(
+    db: AsyncSession, query: str | None, **kwargs: Any
+) -> tuple[int, list[Skill]]:
+    page = await search_skills_page_async(db, query, **kwargs)
+    return page.total or 0, page.items
+
+
+async def get_skill_by_full_name_async(
+    db: AsyncSession, full_name: str
+) -> Skill | None:
+    result = await db.execute(
+        select(Skill).where(func.lower(Skill.full_name) == full_name.lower()).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def get_skill_version_async(db: AsyncSession, full_name: str) -> str | None:
+    return await db.run_sync(get_skill_version, full_name)
+
+
+async def get_related_skills_async(
+    db: AsyncSession, skill: Skill, limit: int = 6
+) -> list[Skill]:
+    return await db.run_sync(get_related_skills, skill, limit)
+
+
+async def lookup_related_skills_async(
+    db: AsyncSession, skill: Skill, limit: int = 6
+) -> list[Skill]:
+    return await db.run_sync(lookup_related_skills, skill, limit)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models.skill import Skill, SkillTopic
+
+
+def parse_topics(value: str | None) -> list[str]:
+    """Split a comma-separated ``Skill.topics`` string into normalized topics."""
+    seen: dict[str, None] = {}
+    for item in (value or "").split(","):
+        topic = item.strip().lower()
+        if topic:
+            seen[topic] = None
+    return list(seen)
+
+
+def replace_skill_topics(db: Session, skills: Iterable[Skill]) -> None:
+    """Rewrite ``skill_topics`` rows for *skills* from their ``topics`` string.
+
+    The skills must already have ids (flush first). Does not commit.
+    """
+    skills = list(skills)
+    if not skills:
+        return
+    db.execute(
+        delete(SkillTopic).where(SkillTopic.skill_id.in_([s.id for s in skills]))
+    )
+    rows = [
+        {"skill_id": skill.id, "topic": topic}
+        for skill in skills
+        for topic in parse_topics(skill.topics)
+    ]
+    if rows:
+        db.execute(insert(SkillTopic), rows)
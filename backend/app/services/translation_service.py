@@ -1,21 +1,54 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
 
 import httpx
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
 
 from app.core.config import Settings
+from app.models.skill import Skill
+from app.services import llm_cache
 
 logger = logging.getLogger(__name__)
 
+# LLM cache versions, one per prompt; bump a version when its prompt changes.
+TRANSLATION_PROMPT_VERSION = "zh-v1"
+BATCH_TRANSLATION_PROMPT_VERSION = "zh-batch-v1"
 
-def translate_to_zh(text: str, settings: Settings) -> str | None:
+# Rows that keep failing (refusals, unparseable batch slots) wait
+# 1h, 2h, 4h, ... up to a week before they are tried again.
+TRANSLATION_RETRY_BASE = timedelta(hours=1)
+TRANSLATION_RETRY_MAX = timedelta(days=7)
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a translation engine. The user sends a JSON object whose keys "
+    "are numbers and whose values are English texts. Translate every value to "
+    "Simplified Chinese. "
+    'Do not translate the term "Claude Skill"; keep it as "Claude Skill". '
+    "Return only a JSON object with exactly the same keys mapped to the "
+    "translated texts."
+)
+
+
+def translate_to_zh(
+    text: str, settings: Settings, db: Session | None = None
+) -> str | None:
     if not settings.enable_translation:
         return None
     if not settings.deepseek_api_key:
         return None
     if not text.strip():
         return None
+    if db is not None:
+        cached = llm_cache.get_cached(db, settings, TRANSLATION_PROMPT_VERSION, text)
+        if cached is not None:
+            return cached
 
     url = f"{settings.deepseek_api_url.rstrip('/')}/v1/chat/completions"
     headers = {
@@ -54,5 +87,244 @@ def translate_to_zh(text: str, settings: Settings) -> str | None:
         return None
 
     message = choices[0].get("message", {})
-    content = message.get("content", "")
-    return content.strip() or None
+    content = message.get("content", "").strip()
+    if content and db is not None:
+        llm_cache.store(db, settings, TRANSLATION_PROMPT_VERSION, text, content)
+    return content or None
+
+
+class _RateLimiter:
+    """Space request starts so at most *per_minute* begin each minute."""
+
+    def __init__(self, per_minute: int) -> None:
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _parse_numbered(content: str, size: int) -> dict[int, str]:
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    parsed: dict[int, str] = {}
+    for key, value in data.items():
+        try:
+            index = int(key)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= index <= size and isinstance(value, str) and value.strip():
+            parsed[index] = value.strip()
+    return parsed
+
+
+async def _translate_chunk(
+    client: httpx.AsyncClient,
+    limiter: _RateLimiter,
+    semaphore: asyncio.Semaphore,
+    settings: Settings,
+    chunk: list[str],
+) -> tuple[dict[str, str], bool]:
+    """Translate one chunk; the flag is False when the API gave no answer.
+
+    Transport errors, 429 and 5xx are transient and leave the chunk's rows
+    eligible for the next run; any other outcome counts as an attempt.
+    """
+    numbered = {str(i): text for i, text in enumerate(chunk, start=1)}
+    payload = {
+        "model": settings.deepseek_model,
+        "messages": [
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(numbered, ensure_ascii=False)},
+        ],
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+    }
+    async with semaphore:
+        await limiter.wait()
+        try:
+            response = await client.post("/v1/chat/completions", json=payload)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPStatusError as exc:
+            logger.warning("batch translation failed (%s texts): %s", len(chunk), exc)
+            status = exc.response.status_code
+            return {}, status != 429 and status < 500
+        except httpx.HTTPError as exc:
+            logger.warning("batch translation failed (%s texts): %s", len(chunk), exc)
+            return {}, False
+        except ValueError as exc:
+            logger.warning("batch translation failed (%s texts): %s", len(chunk), exc)
+            return {}, True
+
+    choices = data.get("choices", [])
+    if not choices:
+        return {}, True
+    content = choices[0].get("message", {}).get("content", "")
+    parsed = _parse_numbered(content, len(chunk))
+    if len(parsed) < len(chunk):
+        logger.warning(
+            "batch translation returned %s/%s items", len(parsed), len(chunk)
+        )
+    return {chunk[index - 1]: value for index, value in parsed.items()}, True
+
+
+async def _translate_many(
+    texts: list[str],
+    settings: Settings,
+    transport: httpx.AsyncBaseTransport | None,
+) -> tuple[dict[str, str], set[str]]:
+    """Return the translations and the texts the API answered without one."""
+    size = max(1, settings.translation_batch_size)
+    chunks = [texts[i : i + size] for i in range(0, len(texts), size)]
+    limiter = _RateLimiter(settings.translation_requests_per_minute)
+    semaphore = asyncio.Semaphore(max(1, settings.translation_concurrency))
+    headers = {
+        "Authorization": f"Bearer {settings.deepseek_api_key}",
+        "Content-Type": "application/json",
+    }
+    async with httpx.AsyncClient(
+        base_url=settings.deepseek_api_url.rstrip("/"),
+        headers=headers,
+        timeout=60,
+        transport=transport,
+    ) as client:
+        results = await asyncio.gather(
+            *(
+                _translate_chunk(client, limiter, semaphore, settings, chunk)
+                for chunk in chunks
+            )
+        )
+    merged: dict[str, str] = {}
+    refused: set[str] = set()
+    for chunk, (result, answered) in zip(chunks, results, strict=True):
+        merged.update(result)
+        if answered:
+            refused.update(text for text in chunk if text not in result)
+    return merged, refused
+
+
+def translate_many_to_zh(
+    texts: Iterable[str],
+    settings: Settings,
+    *,
+    db: Session | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, str]:
+    """Translate *texts* in numbered batches; returns ``{source: translation}``.
+
+    Identical sources are sent once and, when *db* is given, previously
+    translated ones are served from the LLM cache. Texts that fail to
+    translate are omitted.
+    """
+    return _translate_many_to_zh(texts, settings, db, transport)[0]
+
+
+def _translate_many_to_zh(
+    texts: Iterable[str],
+    settings: Settings,
+    db: Session | None,
+    transport: httpx.AsyncBaseTransport | None,
+) -> tuple[dict[str, str], set[str]]:
+    if not settings.enable_translation or not settings.deepseek_api_key:
+        return {}, set()
+
+    unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    translated: dict[str, str] = {}
+    if db is not None:
+        translated = llm_cache.get_cached_many(
+            db, settings, BATCH_TRANSLATION_PROMPT_VERSION, unique
+        )
+    missing = [text for text in unique if text not in translated]
+
+    refused: set[str] = set()
+    if missing:
+        fresh, refused = asyncio.run(_translate_many(missing, settings, transport))
+        if db is not None:
+            llm_cache.store_many(db, settings, BATCH_TRANSLATION_PROMPT_VERSION, fresh)
+        translated.update(fresh)
+    return translated, refused
+
+
+def translate_pending_descriptions(
+    db: Session,
+    settings: Settings,
+    *,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> list[int]:
+    """Fill ``description_zh`` for the most-starred untranslated skills.
+
+    Runs after sync as its own stage; returns the ids that were updated.
+    Skills the API answered without a translation (refusals, unparseable
+    batch slots, other 4xx) are backed off exponentially so they cannot hold
+    the head of the window; outages (transport errors, 429, 5xx) mark nobody.
+    """
+    if not settings.enable_translation or not settings.deepseek_api_key:
+        return []
+
+    now = datetime.now(tz=UTC)
+    skills = (
+        db.query(Skill)
+        .filter(
+            Skill.description.isnot(None),
+            Skill.description != "",
+            or_(Skill.description_zh.is_(None), Skill.description_zh == ""),
+            or_(
+                Skill.translation_retry_at.is_(None),
+                Skill.translation_retry_at <= now,
+            ),
+        )
+        .order_by(Skill.stars.desc(), Skill.id.desc())
+        .limit(settings.translation_backlog_limit)
+        .all()
+    )
+    if not skills:
+        return []
+
+    translations, refused = _translate_many_to_zh(
+        (skill.description for skill in skills), settings, db, transport
+    )
+    updated: list[int] = []
+    failed = 0
+    for skill in skills:
+        value = translations.get(skill.description or "")
+        if value:
+            skill.description_zh = value
+            skill.translation_failures = 0
+            skill.translation_retry_at = None
+            updated.append(skill.id)
+        elif skill.description in refused:
+            skill.translation_failures = (skill.translation_failures or 0) + 1
+            skill.translation_retry_at = _translation_retry_at(
+                skill.translation_failures, now
+            )
+            failed += 1
+    if updated or failed:
+        db.commit()
+    logger.info(
+        "translated %s/%s descriptions (%s backed off)",
+        len(updated),
+        len(skills),
+        failed,
+    )
+    return updated
+
+
+def _translation_retry_at(failures: int, now: datetime) -> datetime:
+    delay = TRANSLATION_RETRY_BASE * 2 ** min(max(failures - 1, 0), 16)
+    return now + min(delay, TRANSLATION_RETRY_MAX)
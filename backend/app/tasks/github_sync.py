@@ -1,25 +1,34 @@
 from celery.utils.log import get_task_logger
 
 from app.core.celery_app import celery_app
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 from app.core.database import SessionLocal
-from app.services.github_service import sync_github_skills
+from app.services.github_service import SyncReport, sync_github_skills
 
 logger = get_task_logger(__name__)
 
 
+def send_post_sync_tasks(report: SyncReport, settings: Settings) -> None:
+    """Queue the stages that follow every sync, however it was started."""
+    if report.changed_skill_ids:
+        celery_app.send_task("tasks.related_refresh")
+    if settings.enable_translation:
+        celery_app.send_task("tasks.translate_descriptions")
+
+
 @celery_app.task(name="tasks.github_sync")
-def github_sync() -> int:
+def github_sync() -> dict:
     settings = get_settings()
     if not settings.enable_scheduler:
         logger.info("scheduler disabled; skip github sync")
-        return 0
+        return {}
 
     try:
         with SessionLocal() as db:
-            count = sync_github_skills(db, settings)
-        logger.info("github sync completed: %s repos", count)
-        return count
+            report = sync_github_skills(db, settings)
+        logger.info("github sync completed: %s", report.as_dict())
+        send_post_sync_tasks(report, settings)
+        return report.as_dict()
     except Exception as exc:  # noqa: BLE001
         logger.exception("github sync failed: %s", exc)
-        return 0
+        return {}
@@ -0,0 +1,41 @@
+from celery.utils.log import get_task_logger
+from sqlalchemy import select
+
+from app.core.cache import bump_catalog_version
+from app.core.celery_app import celery_app
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+from app.services.skill_service import (
+    compute_related_graph,
+    score_related_matrix,
+    store_related_graph,
+)
+
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(name="tasks.related_refresh")
+def related_refresh() -> int:
+    settings = get_settings()
+    try:
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(
+                    Skill.id, Skill.full_name, Skill.language, Skill.topics, Skill.stars
+                )
+            ).all()
+            try:
+                graph = score_related_matrix(rows, settings.related_top_n)
+            except ImportError:
+                graph = compute_related_graph(rows, settings.related_top_n)
+            stored = store_related_graph(db, graph)
+            db.commit()
+        bump_catalog_version(settings)
+        logger.info(
+            "related refresh completed: %s skills, %s edges", len(graph), stored
+        )
+        return stored
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("related refresh failed: %s", exc)
+        return 0
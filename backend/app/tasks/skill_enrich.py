@@ -2,121 +2,315 @@ from __future__ import annotations
 
 import logging
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
+import httpx
 import redis
 from celery.utils.log import get_task_logger
 from sqlalchemy import and_, or_
 
-from app.core.celery_app import celery_app
+from app.core.cache import bump_catalog_version
+from app.core.celery_app import ENRICH_QUEUE, celery_app
 from app.core.config import Settings, get_settings
 from app.core.database import SessionLocal
+from app.core.redis_client import get_redis_client
 from app.models.skill import Skill
+from app.services.count_cache import invalidate_counts
 from app.services.enrichment_service import generate_enrichment
+from app.services.search_index import refresh_search_index
 
 logger = get_task_logger(__name__)
 py_logger = logging.getLogger(__name__)
 
+# Held only while the dispatcher selects and enqueues candidates.
 LOCK_KEY = "locks:skill_enrich"
+DISPATCH_LOCK_TTL_SECONDS = 60
 
+# Held by enrich_one for a single skill; covers one 60 s LLM call with margin.
+SKILL_LOCK_KEY = "locks:enrich:{skill_id}"
+SKILL_LOCK_TTL_SECONDS = 5 * 60
 
-def _get_redis(settings: Settings) -> redis.Redis | None:
-    try:
-        return redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    except Exception as exc:  # noqa: BLE001
-        py_logger.warning("redis init failed: %s", exc)
-        return None
+# Set by the dispatcher for every enqueued id and cleared when enrich_one
+# finishes, so a backlog larger than one interval's throughput is not queued
+# again on every run. Expires in case a message is lost.
+QUEUED_KEY = "enrich:queued:{skill_id}"
+QUEUED_TTL_SECONDS = 24 * 60 * 60
+
+# Enriched skills invalidate cached reads at most once per this delay.
+PUBLISH_KEY = "enrich:publish_pending"
+PUBLISH_DELAY_SECONDS = 30
+
+ENRICH_MAX_RETRIES = 5
+ENRICH_RETRY_BACKOFF_MAX = 10 * 60
+
+# Skills the LLM answers without a usable payload (or with a non-retryable
+# status) wait 1h, 2h, 4h, ... up to a week before the next attempt.
+ENRICH_FAILURE_BACKOFF = timedelta(hours=1)
+ENRICH_FAILURE_BACKOFF_MAX = timedelta(days=7)
 
 
 def _acquire_lock(
-    settings: Settings, ttl_seconds: int
+    settings: Settings, key: str, ttl_seconds: int
 ) -> tuple[redis.Redis, str] | None:
-    client = _get_redis(settings)
+    client = get_redis_client(settings)
     if not client:
         return None
     token = uuid.uuid4().hex
-    ok = client.set(LOCK_KEY, token, nx=True, ex=ttl_seconds)
+    ok = client.set(key, token, nx=True, ex=ttl_seconds)
     if not ok:
         return None
     return client, token
 
 
-def _release_lock(client: redis.Redis, token: str) -> None:
+def _release_lock(client: redis.Redis, key: str, token: str) -> None:
     try:
-        current = client.get(LOCK_KEY)
+        current = client.get(key)
         if current == token:
-            client.delete(LOCK_KEY)
+            client.delete(key)
     except Exception as exc:  # noqa: BLE001
         py_logger.warning("redis lock release failed: %s", exc)
 
 
-@celery_app.task(name="tasks.skill_enrich")
-def skill_enrich() -> int:
-    settings = get_settings()
+def _needs_enrichment(now: datetime):  # type: ignore[no-untyped-def]
+    return and_(
+        or_(
+            Skill.content_updated_at.is_(None),
+            and_(
+                Skill.last_pushed_at.isnot(None),
+                Skill.content_updated_at.isnot(None),
+                Skill.content_updated_at < Skill.last_pushed_at,
+            ),
+        ),
+        or_(Skill.enrich_retry_at.is_(None), Skill.enrich_retry_at <= now),
+    )
+
+
+def _is_transient(exc: httpx.HTTPError) -> bool:
+    """Transport errors, 429 and 5xx are worth retrying; other 4xx are not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _back_off(skill: Skill, now: datetime) -> None:
+    skill.enrich_failures = (skill.enrich_failures or 0) + 1
+    delay = ENRICH_FAILURE_BACKOFF * 2 ** min(skill.enrich_failures - 1, 16)
+    skill.enrich_retry_at = now + min(delay, ENRICH_FAILURE_BACKOFF_MAX)
+
+
+def _apply_enrichment(skill: Skill, payload: dict[str, Any], now: datetime) -> None:
+    skill.summary_en = payload["summary_en"]
+    skill.summary_zh = payload["summary_zh"]
+    skill.key_features_en = payload["key_features_en"]
+    skill.key_features_zh = payload["key_features_zh"]
+    skill.use_cases_en = payload["use_cases_en"]
+    skill.use_cases_zh = payload["use_cases_zh"]
+    skill.seo_title_en = payload["seo_title_en"]
+    skill.seo_title_zh = payload["seo_title_zh"]
+    skill.seo_description_en = payload["seo_description_en"]
+    skill.seo_description_zh = payload["seo_description_zh"]
+    skill.content_updated_at = now
+    skill.enrich_failures = 0
+    skill.enrich_retry_at = None
+
+
+def _enrichment_enabled(settings: Settings) -> bool:
     if not settings.enable_scheduler or not settings.enable_enrichment:
         logger.info("enrichment disabled; skip")
-        return 0
+        return False
     if not settings.deepseek_api_key:
         logger.info("DEEPSEEK_API_KEY missing; skip enrichment")
+        return False
+    return True
+
+
+def _mark_queued(client: redis.Redis | None, skill_ids: list[int]) -> list[int]:
+    """Return the ids not already queued, marking them queued."""
+    if client is None or not skill_ids:
+        return skill_ids
+    pipe = client.pipeline(transaction=False)
+    for skill_id in skill_ids:
+        pipe.set(
+            QUEUED_KEY.format(skill_id=skill_id), "1", nx=True, ex=QUEUED_TTL_SECONDS
+        )
+    return [
+        skill_id
+        for skill_id, marked in zip(skill_ids, pipe.execute(), strict=True)
+        if marked
+    ]
+
+
+def _clear_queued(settings: Settings, skill_id: int) -> None:
+    client = get_redis_client(settings)
+    if not client:
+        return
+    try:
+        client.delete(QUEUED_KEY.format(skill_id=skill_id))
+    except Exception as exc:  # noqa: BLE001
+        py_logger.warning("enrich queued marker release failed: %s", exc)
+
+
+@celery_app.task(name="tasks.skill_enrich")
+def skill_enrich() -> int:
+    """Enqueue one ``tasks.enrich_one`` per candidate on the enrich queue.
+
+    Candidates still queued from an earlier run are skipped (``QUEUED_KEY``),
+    and at most ``enrich_batch_size`` new ones are added per run, so the
+    queue stays bounded when the backlog outgrows worker throughput.
+    """
+    settings = get_settings()
+    if not _enrichment_enabled(settings):
         return 0
 
-    lock = _acquire_lock(settings, ttl_seconds=30 * 60)
+    lock = _acquire_lock(settings, LOCK_KEY, DISPATCH_LOCK_TTL_SECONDS)
     if not lock:
-        logger.info("enrichment lock busy; skip")
+        logger.info("enrichment dispatch lock busy; skip")
         return 0
 
     client, token = lock
+    limit = max(settings.enrich_batch_size, 1)
+    candidate_ids: list[int] = []
     try:
         with SessionLocal() as db:
-            candidates = (
-                db.query(Skill)
-                .filter(
-                    or_(
-                        Skill.content_updated_at.is_(None),
-                        and_(
-                            Skill.last_pushed_at.isnot(None),
-                            Skill.content_updated_at.isnot(None),
-                            Skill.content_updated_at < Skill.last_pushed_at,
-                        ),
-                    )
-                )
+            query = (
+                db.query(Skill.id)
+                .filter(_needs_enrichment(datetime.now(tz=UTC)))
                 .order_by(Skill.content_updated_at.isnot(None), Skill.stars.desc())
-                .limit(settings.enrich_batch_size)
-                .all()
             )
+            # Walk the candidates until the cap is filled with ids that are
+            # not queued yet; only ids that will be enqueued get marked.
+            offset = 0
+            while len(candidate_ids) < limit:
+                chunk = [
+                    skill_id
+                    for (skill_id,) in query.offset(offset).limit(
+                        limit - len(candidate_ids)
+                    )
+                ]
+                if not chunk:
+                    break
+                offset += len(chunk)
+                candidate_ids.extend(_mark_queued(client, chunk))
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("skill enrich dispatch failed: %s", exc)
+        return 0
+    finally:
+        _release_lock(client, LOCK_KEY, token)
+
+    if not candidate_ids:
+        logger.info("no skills to enrich")
+        return 0
+    for skill_id in candidate_ids:
+        enrich_one.apply_async(args=[skill_id], queue=ENRICH_QUEUE)
+    logger.info("skill enrich dispatched: %s skills", len(candidate_ids))
+    return len(candidate_ids)
 
-            if not candidates:
-                logger.info("no skills to enrich")
-                return 0
 
+def _enrich_skill(skill_id: int, settings: Settings) -> bool:
+    """Enrich one skill under its lock; False if busy, done already or failed.
+
+    Transient HTTP errors propagate so Celery retries them. Anything else the
+    LLM cannot answer backs the skill off via ``enrich_retry_at`` instead, so
+    it stops heading the candidate list.
+    """
+    key = SKILL_LOCK_KEY.format(skill_id=skill_id)
+    lock = _acquire_lock(settings, key, SKILL_LOCK_TTL_SECONDS)
+    if not lock:
+        logger.info("enrich lock busy for skill %s; skip", skill_id)
+        return False
+
+    client, token = lock
+    try:
+        with SessionLocal() as db:
             now = datetime.now(tz=UTC)
-            updated = 0
-            for skill in candidates:
-                payload = generate_enrichment(skill, settings)
-                if not payload:
-                    continue
-
-                skill.summary_en = payload["summary_en"]
-                skill.summary_zh = payload["summary_zh"]
-                skill.key_features_en = payload["key_features_en"]
-                skill.key_features_zh = payload["key_features_zh"]
-                skill.use_cases_en = payload["use_cases_en"]
-                skill.use_cases_zh = payload["use_cases_zh"]
-                skill.seo_title_en = payload["seo_title_en"]
-                skill.seo_title_zh = payload["seo_title_zh"]
-                skill.seo_description_en = payload["seo_description_en"]
-                skill.seo_description_zh = payload["seo_description_zh"]
-                skill.content_updated_at = now
-                updated += 1
-
-            if updated:
-                db.commit()
-            logger.info(
-                "skill enrich completed: %s/%s updated", updated, len(candidates)
+            # Re-check under the lock; a duplicate message may already be done.
+            skill = (
+                db.query(Skill)
+                .filter(Skill.id == skill_id, _needs_enrichment(now))
+                .one_or_none()
             )
-            return updated
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("skill enrich failed: %s", exc)
-        return 0
+            if skill is None:
+                return False
+
+            try:
+                payload = generate_enrichment(
+                    skill, settings, db, raise_http_errors=True
+                )
+            except httpx.HTTPError as exc:
+                if _is_transient(exc):
+                    raise
+                logger.warning("enrichment rejected for skill %s: %s", skill_id, exc)
+                payload = None
+
+            if not payload:
+                _back_off(skill, now)
+                db.commit()
+                return False
+
+            _apply_enrichment(skill, payload, now)
+            db.commit()
+            refresh_search_index(db, [skill_id])
+        logger.info("enriched skill %s", skill_id)
+        return True
     finally:
-        _release_lock(client, token)
+        _release_lock(client, key, token)
+
+
+def _schedule_publish(settings: Settings) -> None:
+    """Invalidate cached reads once per ``PUBLISH_DELAY_SECONDS`` of enrichment."""
+    client = get_redis_client(settings)
+    if client:
+        try:
+            if not client.set(PUBLISH_KEY, "1", nx=True, ex=PUBLISH_DELAY_SECONDS * 10):
+                return
+            enrich_publish.apply_async(
+                countdown=PUBLISH_DELAY_SECONDS, queue=ENRICH_QUEUE
+            )
+            return
+        except Exception as exc:  # noqa: BLE001
+            py_logger.warning("enrich publish scheduling failed: %s", exc)
+    _publish(settings)
+
+
+def _publish(settings: Settings) -> None:
+    invalidate_counts(settings)
+    bump_catalog_version(settings)
+
+
+@celery_app.task(name="tasks.enrich_publish")
+def enrich_publish() -> None:
+    """Publish skills enriched since the last run to cached reads."""
+    settings = get_settings()
+    client = get_redis_client(settings)
+    if client:
+        try:
+            # Cleared first so skills enriched from now on schedule another run.
+            client.delete(PUBLISH_KEY)
+        except Exception as exc:  # noqa: BLE001
+            py_logger.warning("enrich publish marker release failed: %s", exc)
+    _publish(settings)
+
+
+@celery_app.task(
+    name="tasks.enrich_one",
+    autoretry_for=(httpx.TransportError, httpx.HTTPStatusError),
+    retry_backoff=True,
+    retry_backoff_max=ENRICH_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=ENRICH_MAX_RETRIES,
+)
+def enrich_one(skill_id: int) -> bool:
+    """Enrich a single skill; safe to run twice for the same id."""
+    settings = get_settings()
+    if not _enrichment_enabled(settings):
+        _clear_queued(settings, skill_id)
+        return False
+    enriched = _enrich_skill(skill_id, settings)
+    # Left in place while a transient error is retried (the raise above
+    # skips this), so the dispatcher does not queue the id a second time.
+    _clear_queued(settings, skill_id)
+    if enriched:
+        _schedule_publish(settings)
+    return enriched
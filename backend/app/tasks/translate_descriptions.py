@@ -0,0 +1,32 @@
+from celery.utils.log import get_task_logger
+
+from app.core.cache import bump_catalog_version
+from app.core.celery_app import celery_app
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services.count_cache import invalidate_counts
+from app.services.search_index import refresh_search_index
+from app.services.translation_service import translate_pending_descriptions
+
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(name="tasks.translate_descriptions")
+def translate_descriptions() -> int:
+    settings = get_settings()
+    if not settings.enable_translation or not settings.deepseek_api_key:
+        logger.info("translation disabled; skip")
+        return 0
+
+    try:
+        with SessionLocal() as db:
+            updated = translate_pending_descriptions(db, settings)
+            if updated:
+                refresh_search_index(db, updated)
+                invalidate_counts(settings)
+                bump_catalog_version(settings)
+        logger.info("translate descriptions completed: %s updated", len(updated))
+        return len(updated)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("translate descriptions failed: %s", exc)
+        return 0
@@ -0,0 +1,386 @@
+# ruff: noqa: E402
+"""Benchmark search, related and facet queries against synthetic catalogs.
+
+Builds SQLite ``skills`` catalogs of 1k to 1M rows with skewed owner, topic,
+language and star distributions (cached under ``--catalog-dir``, keyed by
+size, seed and generator version), times each case, and compares medians
+against a JSON baseline. A case regresses when its median is more than
+``--tolerance`` slower than the baseline *and* at least ``--min-delta-ms``
+slower, so sub-millisecond noise never fails a run.
+
+    python scripts/benchmark_catalog.py --sizes 1k,10k --save   # record
+    python scripts/benchmark_catalog.py --sizes 1k,10k          # compare
+
+Baselines are only comparable on the machine that recorded them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.models.skill import Skill, SkillTopic
+from app.services.facets_service import (
+    list_top_languages,
+    list_top_owners,
+    list_top_topics,
+)
+from app.services.search_index import reset_search_index
+from app.services.skill_service import get_related_skills, search_skills
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+GENERATOR_VERSION = 1
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = "1k,10k"
+DEFAULT_DIR = ROOT / ".benchmarks"
+INSERT_CHUNK = 10_000
+
+_HEAD_TOPICS = (
+    "claude",
+    "agent-skills",
+    "claude-code",
+    "mcp",
+    "llm",
+    "ai-agents",
+    "openclaw",
+    "automation",
+    "prompt-engineering",
+    "python",
+    "typescript",
+    "cli",
+    "rag",
+    "productivity",
+    "developer-tools",
+)
+_LANGUAGES = (
+    ("Python", 30),
+    ("TypeScript", 22),
+    ("JavaScript", 12),
+    ("Go", 6),
+    ("Rust", 5),
+    ("Shell", 5),
+    ("Java", 3),
+    ("C#", 2),
+    ("Ruby", 1),
+    ("Swift", 1),
+    (None, 13),
+)
+_WORDS = (
+    "agent skill claude workflow automation prompt context memory tool server "
+    "plugin template toolkit assistant coding review test docs search browser "
+    "git github deploy cloud data pipeline notebook sql api client sdk schema "
+    "scraper crawler summarize translate chat voice image video pdf markdown "
+    "calendar email slack notion jira figma design security audit lint format "
+    "refactor debug monitor metrics logging tracing kubernetes docker terraform "
+    "finance research knowledge graph vector embedding retrieval evaluation"
+).split()
+
+
+@dataclass(slots=True)
+class CaseResult:
+    runs: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+
+
+def _zipf_cum_weights(n: int, exponent: float) -> list[float]:
+    return list(itertools.accumulate(1.0 / (rank + 1) ** exponent for rank in range(n)))
+
+
+def _pick(rng: random.Random, values: list, cum_weights: list[float]):  # type: ignore[no-untyped-def]
+    return values[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+
+def generate_rows(rows: int, seed: int) -> Iterator[tuple[dict, list[str]]]:
+    """Yield ``(skill_row, topics)`` with Zipf-skewed owners and topics."""
+    rng = random.Random(seed)
+    owners = [f"owner{index}" for index in range(max(50, rows // 8))]
+    owner_weights = _zipf_cum_weights(len(owners), 1.1)
+    topics = list(_HEAD_TOPICS) + [
+        f"{rng.choice(_WORDS)}-{index}" for index in range(max(200, rows // 50))
+    ]
+    topic_weights = _zipf_cum_weights(len(topics), 1.0)
+    languages = [language for language, _ in _LANGUAGES]
+    language_weights = list(itertools.accumulate(weight for _, weight in _LANGUAGES))
+    epoch = datetime(2023, 1, 1, tzinfo=UTC)
+
+    for index in range(rows):
+        owner = _pick(rng, owners, owner_weights)
+        name = f"{rng.choice(_WORDS)}-{rng.choice(_WORDS)}-{index}"
+        skill_topics = sorted(
+            {_pick(rng, topics, topic_weights) for _ in range(rng.randint(0, 8))}
+        )
+        created = epoch + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        description = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 20)))
+        yield (
+            {
+                "repo_id": index + 1,
+                "name": name,
+                "full_name": f"{owner}/{name}",
+                "description": description,
+                "html_url": f"https://github.com/{owner}/{name}",
+                "stars": min(int(rng.paretovariate(1.1)) - 1, 200_000),
+                "forks": 0,
+                "language": _pick(rng, languages, language_weights),
+                "topics": ",".join(skill_topics) or None,
+                "repo_created_at": created,
+                "created_at": created,
+                "updated_at": created,
+                "fetched_at": created,
+            },
+            skill_topics,
+        )
+
+
+def build_catalog(path: Path, rows: int, seed: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+    engine = create_engine(f"sqlite+pysqlite:///{partial}")
+    Base.metadata.create_all(engine)
+    generated = generate_rows(rows, seed)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=OFF")
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        skill_id = 0
+        while chunk := list(itertools.islice(generated, INSERT_CHUNK)):
+            conn.execute(insert(Skill.__table__), [row for row, _ in chunk])
+            topic_rows = []
+            for _, topics in chunk:
+                skill_id += 1
+                topic_rows.extend(
+                    {"skill_id": skill_id, "topic": topic} for topic in topics
+                )
+            if topic_rows:
+                conn.execute(insert(SkillTopic.__table__), topic_rows)
+    engine.dispose()
+    partial.replace(path)
+
+
+def catalog_path(catalog_dir: Path, label: str, seed: int) -> Path:
+    return catalog_dir / f"skills-{label}-s{seed}-g{GENERATOR_VERSION}.db"
+
+
+def open_catalog(path: Path) -> Engine:
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _read_only(dbapi_connection, _record):  # type: ignore[no-untyped-def]
+        dbapi_connection.execute("PRAGMA query_only=ON")
+
+    return engine
+
+
+def time_case(fn: Callable[[], object], budget: float, min_runs: int = 3) -> CaseResult:
+    fn()  # warm caches, build the search index
+    samples: list[float] = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < min_runs or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+        if len(samples) >= 10_000:
+            break
+    samples.sort()
+    return CaseResult(
+        runs=len(samples),
+        min_ms=round(samples[0], 4),
+        median_ms=round(statistics.median(samples), 4),
+        p95_ms=round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+    )
+
+
+@contextmanager
+def search_engine(name: str) -> Iterator[None]:
+    previous = os.environ.get("SEARCH_ENGINE")
+    os.environ["SEARCH_ENGINE"] = name
+    get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("SEARCH_ENGINE", None)
+        else:
+            os.environ["SEARCH_ENGINE"] = previous
+        get_settings.cache_clear()
+
+
+def _cases(db: Session, rows: int) -> dict[str, Callable[[], object]]:
+    topic, _ = list_top_topics(db, 1)[0]
+    owner, _ = list_top_owners(db, 1)[0]
+    samples = list(
+        db.execute(
+            select(Skill).where(Skill.topics.isnot(None)).order_by(Skill.id).limit(20)
+        )
+        .scalars()
+        .all()
+    )
+    related = itertools.cycle(samples)
+    deep = rows // 2
+    return {
+        "search[empty]": lambda: search_skills(db, None),
+        "search[q]": lambda: search_skills(db, "workflow"),
+        "search[q-rare]": lambda: search_skills(db, "figma calendar"),
+        "search[topic]": lambda: search_skills(db, None, topic=topic),
+        "search[owner]": lambda: search_skills(db, None, owner=owner),
+        "search[q+language]": lambda: search_skills(db, "agent", language="python"),
+        "search[deep-offset]": lambda: search_skills(db, None, offset=deep),
+        "search[newest]": lambda: search_skills(db, None, sort="newest"),
+        "related": lambda: get_related_skills(db, next(related)),
+        "facets[topics]": lambda: list_top_topics(db, 20),
+        "facets[owners]": lambda: list_top_owners(db, 20),
+        "facets[languages]": lambda: list_top_languages(db, 20),
+    }
+
+
+def run_catalog(
+    path: Path, rows: int, budget: float, engines: tuple[str, ...] = ("index", "sql")
+) -> dict[str, CaseResult]:
+    engine = open_catalog(path)
+    results: dict[str, CaseResult] = {}
+    try:
+        for name in engines:
+            with search_engine(name), Session(engine) as db:
+                reset_search_index()
+                for case, fn in _cases(db, rows).items():
+                    # Only free-text search differs between the engines.
+                    if name != engines[0] and "[q" not in case:
+                        continue
+                    label = f"{case}|{name}" if "[q" in case else case
+                    results[label] = time_case(fn, budget)
+                    print(f"  {label:<28} {results[label].median_ms:>10.3f} ms")
+    finally:
+        reset_search_index()
+        engine.dispose()
+    return results
+
+
+def compare(
+    current: dict[str, dict[str, CaseResult]],
+    baseline: dict[str, dict[str, dict]],
+    tolerance: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """Return a line per regressed case (empty when none regressed)."""
+    regressions = []
+    for size, cases in current.items():
+        for case, result in cases.items():
+            base = baseline.get(size, {}).get(case)
+            if base is None:
+                continue
+            limit = base["median_ms"] * (1 + tolerance)
+            delta = result.median_ms - base["median_ms"]
+            if result.median_ms > limit and delta >= min_delta_ms:
+                regressions.append(
+                    f"{size} {case}: {result.median_ms:.3f} ms vs "
+                    f"{base['median_ms']:.3f} ms baseline "
+                    f"(+{delta / base['median_ms']:.0%})"
+                )
+    return regressions
+
+
+def _environment() -> dict:
+    return {
+        "generator": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="e.g. 1k,10k,100k,1m")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--catalog-dir", type=Path, default=DEFAULT_DIR / "catalogs")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_DIR / "baseline.json")
+    parser.add_argument("--save", action="store_true", help="record as baseline")
+    parser.add_argument("--output", type=Path, help="also write results here")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per case")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    labels = [label.strip().lower() for label in args.sizes.split(",") if label]
+    unknown = [label for label in labels if label not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)} (choose from {SIZES})")
+
+    current: dict[str, dict[str, CaseResult]] = {}
+    for label in labels:
+        path = catalog_path(args.catalog_dir, label, args.seed)
+        if not path.exists():
+            print(f"building {label} catalog at {path} ...")
+            started = time.perf_counter()
+            build_catalog(path, SIZES[label], args.seed)
+            print(f"  built in {time.perf_counter() - started:.1f}s")
+        print(f"{label} ({SIZES[label]} skills)")
+        current[label] = run_catalog(path, SIZES[label], args.budget)
+
+    payload = {
+        "environment": _environment(),
+        "results": {
+            size: {case: asdict(result) for case, result in cases.items()}
+            for size, cases in current.items()
+        },
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(payload, indent=2) + "\n")
+
+    if args.save:
+        existing = {}
+        if args.baseline.exists():
+            existing = json.loads(args.baseline.read_text()).get("results", {})
+        payload["results"] = {**existing, **payload["results"]}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save to record one")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("environment") != _environment():
+        print(
+            "warning: baseline recorded under "
+            f"{baseline.get('environment')}, now {_environment()}"
+        )
+    regressions = compare(
+        current, baseline.get("results", {}), args.tolerance, args.min_delta_ms
+    )
+    if regressions:
+        print("regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+# ruff: noqa: E402
+"""Replay a frontend-shaped traffic mix against the API and report per route.
+
+By default the app runs in process (httpx ``ASGITransport``) on a copy of a
+synthetic SQLite catalog from ``benchmark_catalog.py`` with related skills
+precomputed, and Redis replaced by fakeredis. ``--base-url`` drives a real
+server instead, which is what sizing uvicorn workers and ``DB_POOL_SIZE``
+needs; the in-process mode shares one event loop between driver and app, so
+use it to compare changes, not to read off absolute capacity.
+
+    python scripts/load_test.py --size 10k --concurrency 50 --duration 30
+    python scripts/load_test.py --base-url http://localhost:8000 --duration 60
+
+Errors are transport failures and any status other than 2xx/304.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+PAGE_SIZE = 24  # frontend list pages
+RELATED_LIMIT = 6
+SEARCH_TERMS = ("agent", "workflow", "claude", "review", "mcp", "browser", "pdf")
+
+
+@dataclass(slots=True)
+class RouteStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict:
+        samples = sorted(self.latencies_ms)
+        count = len(samples)
+
+        def pct(q: float) -> float:
+            return round(samples[min(count - 1, int(count * q))], 2) if count else 0.0
+
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 1) if elapsed else 0.0,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(samples[-1], 2) if count else 0.0,
+            "mean_ms": round(statistics.fmean(samples), 2) if count else 0.0,
+        }
+
+
+@dataclass(slots=True)
+class Targets:
+    """Values the scenarios draw from, read from the catalog being served."""
+
+    skills: list[tuple[int, str]]  # (id, full_name), most starred first
+    topics: list[str]
+    languages: list[str]
+    owners: list[str]
+
+
+class LoadDriver:
+    def __init__(
+        self, client: httpx.AsyncClient, targets: Targets, seed: int, think: float
+    ) -> None:
+        self.client = client
+        self.targets = targets
+        self.rng = random.Random(seed)
+        self.think = think
+        self.stats: dict[str, RouteStats] = {}
+        self._visitor = itertools.count()
+        # Detail views concentrate on popular skills (Zipf over star rank).
+        self._skill_weights = list(
+            itertools.accumulate(
+                1.0 / (rank + 1) for rank in range(len(targets.skills))
+            )
+        )
+        self.scenarios: list[tuple[Callable[[], Awaitable[None]], int]] = [
+            (self.home, 30),
+            (self.detail, 30),
+            (self.search, 20),
+            (self.facet_page, 10),
+            (self.latest, 5),
+            (self.facet_index, 5),
+        ]
+
+    async def request(
+        self, route: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        stats = self.stats.setdefault(f"{method} {route}", RouteStats())
+        start = time.perf_counter_ns()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        stats.latencies_ms.append((time.perf_counter_ns() - start) / 1e6)
+        if response is None or not (
+            200 <= response.status_code < 300 or response.status_code == 304
+        ):
+            stats.errors += 1
+            return None
+        return response
+
+    def visitor(self) -> dict[str, str]:
+        return {"X-Visitor-Id": f"load-{next(self._visitor) % 5000}"}
+
+    async def list_page(self, **params) -> httpx.Response | None:
+        params = {"limit": PAGE_SIZE, **params}
+        return await self.request("/api/skills", "GET", "/api/skills", params=params)
+
+    async def home(self) -> None:
+        await self.request(
+            "/api/metrics/track", "POST", "/api/metrics/track", headers=self.visitor()
+        )
+        await self.list_page(offset=0)
+        # "Load more" appends pages with a cached count, as the home page does.
+        offset = 0
+        while self.rng.random() < 0.4 and offset < PAGE_SIZE * 5:
+            offset += PAGE_SIZE
+            await self.list_page(offset=offset, count="cached")
+
+    async def search(self) -> None:
+        await self.list_page(q=self.rng.choice(SEARCH_TERMS), offset=0)
+
+    async def facet_page(self) -> None:
+        kind = self.rng.choice(("topic", "language", "owner"))
+        values = getattr(self.targets, f"{kind}s")
+        await self.list_page(**{kind: self.rng.choice(values[:20]), "offset": 0})
+
+    async def latest(self) -> None:
+        await self.list_page(sort="newest", offset=0)
+
+    async def facet_index(self) -> None:
+        kind = self.rng.choice(("topics", "languages", "owners"))
+        await self.request(
+            f"/api/facets/{kind}", "GET", f"/api/facets/{kind}", params={"limit": 50}
+        )
+
+    async def detail(self) -> None:
+        skill_id, full_name = self.targets.skills[self._pick_skill()]
+        await self.request(
+            "/api/skills/{owner}/{repo}", "GET", f"/api/skills/{full_name}"
+        )
+        await self.request(
+            "/api/skills/{owner}/{repo}/related",
+            "GET",
+            f"/api/skills/{full_name}/related",
+            params={"limit": RELATED_LIMIT},
+        )
+        await self.request(
+            "/api/metrics/skills/{skill_id}/track",
+            "POST",
+            f"/api/metrics/skills/{skill_id}/track",
+            headers=self.visitor(),
+        )
+
+    def _pick_skill(self) -> int:
+        point = self.rng.random() * self._skill_weights[-1]
+        index = bisect.bisect(self._skill_weights, point)
+        return min(index, len(self._skill_weights) - 1)
+
+    async def user(self, deadline: float) -> None:
+        scenarios, weights = zip(*self.scenarios, strict=True)
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(scenarios, weights=weights)[0]
+            await scenario()
+            if self.think:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think))
+
+    async def run(self, concurrency: int, duration: float, warmup: float) -> float:
+        if warmup:
+            await asyncio.gather(
+                *(self.user(time.monotonic() + warmup) for _ in range(concurrency))
+            )
+            self.stats.clear()
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(*(self.user(deadline) for _ in range(concurrency)))
+        return time.monotonic() - started
+
+
+def load_targets_from_db(database_url: str) -> Targets:
+    from app.models.skill import Skill
+    from app.services.facets_service import (
+        list_top_languages,
+        list_top_owners,
+        list_top_topics,
+    )
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(database_url)
+    try:
+        with Session(engine) as db:
+            skills = db.execute(
+                select(Skill.id, Skill.full_name)
+                .order_by(Skill.stars.desc(), Skill.id.desc())
+                .limit(2000)
+            ).all()
+            return Targets(
+                skills=[(row.id, row.full_name) for row in skills],
+                topics=[name for name, _ in list_top_topics(db, 50)],
+                languages=[name for name, _ in list_top_languages(db, 20)],
+                owners=[name for name, _ in list_top_owners(db, 50)],
+            )
+    finally:
+        engine.dispose()
+
+
+async def load_targets_from_api(client: httpx.AsyncClient) -> Targets:
+    async def facet(kind: str, limit: int) -> list[str]:
+        response = await client.get(f"/api/facets/{kind}", params={"limit": limit})
+        response.raise_for_status()
+        return [item["value"] for item in response.json()["items"]]
+
+    skills: list[tuple[int, str]] = []
+    cursor = None
+    while len(skills) < 500:
+        params: dict = {"limit": 100, "count": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/skills", params=params)
+        response.raise_for_status()
+        page = response.json()
+        skills.extend((item["id"], item["full_name"]) for item in page["items"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    return Targets(
+        skills=skills,
+        topics=await facet("topics", 50),
+        languages=await facet("languages", 20),
+        owners=await facet("owners", 50),
+    )
+
+
+def prepare_catalog(size: str, seed: int, workdir: Path) -> Path:
+    """Copy a cached benchmark catalog into *workdir* with related precomputed."""
+    from scripts.benchmark_catalog import (
+        DEFAULT_DIR,
+        SIZES,
+        build_catalog,
+        catalog_path,
+    )
+
+    source = catalog_path(DEFAULT_DIR / "catalogs", size, seed)
+    if not source.exists():
+        print(f"building {size} catalog at {source} ...")
+        build_catalog(source, SIZES[size], seed)
+    target = workdir / "catalog.db"
+    shutil.copyfile(source, target)
+
+    from app.models.skill import Skill
+    from app.services.skill_service import (
+        compute_related_graph,
+        score_related_matrix,
+        store_related_graph,
+    )
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(f"sqlite+pysqlite:///{target}")
+    with Session(engine) as db:
+        rows = db.execute(
+            select(Skill.id, Skill.full_name, Skill.language, Skill.topics, Skill.stars)
+        ).all()
+        try:
+            graph = score_related_matrix(rows, 20)
+        except ImportError:
+            graph = compute_related_graph(rows, 20)
+        store_related_graph(db, graph)
+        db.commit()
+    engine.dispose()
+    return target
+
+
+async def run(args: argparse.Namespace) -> dict:
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+            )
+            targets = await load_targets_from_api(client)
+        else:
+            import fakeredis
+            from app.core.redis_client import use_redis_client
+            from app.main import create_app
+
+            use_redis_client(fakeredis.FakeRedis(decode_responses=True))
+            app = create_app()
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app),
+                    base_url="http://loadtest",
+                    timeout=args.timeout,
+                )
+            )
+            targets = load_targets_from_db(os.environ["DATABASE_URL"])
+
+        driver = LoadDriver(client, targets, args.seed, args.think_ms / 1000)
+        elapsed = await driver.run(args.concurrency, args.duration, args.warmup)
+
+    total = RouteStats()
+    for stats in driver.stats.values():
+        total.latencies_ms.extend(stats.latencies_ms)
+        total.errors += stats.errors
+    return {
+        "target": args.base_url or f"asgi:{args.size}",
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "routes": {
+            route: stats.summary(elapsed)
+            for route, stats in sorted(driver.stats.items())
+        },
+        "total": total.summary(elapsed),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['target']}: {report['concurrency']} users, {report['duration_s']}s")
+    header = f"{'route':<46}{'reqs':>8}{'rps':>9}{'err%':>7}"
+    header += f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    rows = [*report["routes"].items(), ("TOTAL", report["total"])]
+    for route, summary in rows:
+        print(
+            f"{route:<46}{summary['requests']:>8}{summary['rps']:>9}"
+            f"{summary['error_rate'] * 100:>7.2f}{summary['p50_ms']:>9}"
+            f"{summary['p95_ms']:>9}{summary['p99_ms']:>9}{summary['max_ms']:>9}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="drive a running server instead")
+    parser.add_argument("--size", default="10k", help="in-process catalog size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds")
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    workdir = None
+    if not args.base_url:
+        # Settings and engines read the environment on import.
+        workdir = Path(tempfile.mkdtemp(prefix="agentskill-load-"))
+        os.environ["DATABASE_URL"] = f"sqlite+pysqlite:///{workdir}/catalog.db"
+        os.environ.setdefault("ENABLE_SCHEDULER", "false")
+        os.environ.setdefault("SYNC_ON_START", "false")
+        prepare_catalog(args.size.lower(), args.seed, workdir)
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,13 +10,25 @@ if str(ROOT) not in sys.path:
 from app.core.config import get_settings
 from app.core.database import SessionLocal
 from app.services.github_service import sync_github_skills
+from app.tasks.related_refresh import related_refresh
+from app.tasks.translate_descriptions import translate_descriptions
 
 
 def main() -> None:
     settings = get_settings()
     with SessionLocal() as db:
-        count = sync_github_skills(db, settings)
-    print(f"synced {count} repos")
+        report = sync_github_skills(db, settings)
+    print(
+        f"synced {report.total} repos "
+        f"(inserted={report.inserted}, updated={report.updated}, "
+        f"unchanged={report.unchanged})"
+    )
+    # Run the follow-up stages inline (no worker needed), with the same
+    # conditions as tasks.github_sync.
+    if report.changed_skill_ids:
+        print(f"stored {related_refresh()} related-skill edges")
+    if settings.enable_translation:
+        print(f"translated {translate_descriptions()} descriptions")
 
 
 if __name__ == "__main__":
@@ -2,21 +2,29 @@
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+# A file (not :memory:) so the sync engine and the async route engine share it.
+_DB_DIR = tempfile.mkdtemp(prefix="agentskill-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+pysqlite:///{_DB_DIR}/test.db")
 os.environ.setdefault("ENABLE_SCHEDULER", "false")
 os.environ.setdefault("SYNC_ON_START", "false")
+os.environ.setdefault("SEARCH_INDEX_REFRESH_SECONDS", "0")
+os.environ.setdefault("INTERNAL_METRICS_TOKEN", "test-token")
+# Tests seed rows directly, bypassing the catalog version bump.
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
 
 import pytest
 from app.core.database import SessionLocal, engine
 from app.db.base import Base
 from app.main import create_app
-from app.models.skill import Skill
+from app.models.llm_cache import LLMCacheEntry
+from app.models.skill import Skill, SkillRelated, SkillTopic
 from fastapi.testclient import TestClient
 
 
@@ -33,11 +41,20 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture()
+def internal_headers():
+    """Authorization for endpoints behind ``require_internal_token``."""
+    return {"Authorization": f"Bearer {os.environ['INTERNAL_METRICS_TOKEN']}"}
+
+
 @pytest.fixture(autouse=True)
 def clear_database():
     """Keep tests isolated with a predictable database state."""
     db = SessionLocal()
     try:
+        db.query(LLMCacheEntry).delete()
+        db.query(SkillRelated).delete()
+        db.query(SkillTopic).delete()
         db.query(Skill).delete()
         db.commit()
     finally:
@@ -0,0 +1,43 @@
+from scripts.benchmark_catalog import (
+    CaseResult,
+    build_catalog,
+    compare,
+    generate_rows,
+    run_catalog,
+)
+
+
+def test_generator_is_deterministic_and_skewed():
+    first = [row for row, _ in generate_rows(500, seed=7)]
+    second = [row for row, _ in generate_rows(500, seed=7)]
+    assert first == second
+    owners = [row["full_name"].split("/")[0] for row in first]
+    # Zipf-distributed owners: the top owner holds far more than an even share.
+    assert owners.count("owner0") > 500 / len(set(owners)) * 5
+
+
+def test_run_catalog_times_every_case(tmp_path):
+    path = tmp_path / "catalog.db"
+    build_catalog(path, 300, seed=1)
+    results = run_catalog(path, 300, budget=0.0)
+
+    assert {"search[empty]", "search[q]|index", "search[q]|sql", "related"} <= set(
+        results
+    )
+    assert "facets[owners]" in results
+    assert all(result.runs >= 3 for result in results.values())
+
+
+def test_compare_flags_only_meaningful_regressions():
+    baseline = {"10k": {"related": {"median_ms": 10.0}, "facets": {"median_ms": 0.1}}}
+    current = {
+        "10k": {
+            "related": CaseResult(runs=3, min_ms=14, median_ms=15.0, p95_ms=16),
+            # +100% but below the absolute floor: noise, not a regression.
+            "facets": CaseResult(runs=3, min_ms=0.2, median_ms=0.2, p95_ms=0.2),
+        }
+    }
+    assert compare(current, baseline, tolerance=0.25, min_delta_ms=0.5) == [
+        "10k related: 15.000 ms vs 10.000 ms baseline (+50%)"
+    ]
+    assert compare(current, baseline, tolerance=0.6, min_delta_ms=0.5) == []
@@ -0,0 +1,27 @@
+import pytest
+from app.core.database import _is_sqlite_memory, async_database_url
+
+
+@pytest.mark.parametrize(
+    ("url", "memory"),
+    [
+        ("sqlite://", True),
+        ("sqlite:///:memory:", True),
+        ("sqlite+aiosqlite:///:memory:", True),
+        ("sqlite:///file:skills?mode=memory&cache=shared&uri=true", True),
+        ("sqlite:///./skills.db", False),
+        ("mysql+pymysql://user:pw@db/skills", False),
+    ],
+)
+def test_in_memory_sqlite_is_detected(url, memory):
+    assert _is_sqlite_memory(url) is memory
+
+
+def test_async_url_uses_async_driver():
+    assert (
+        async_database_url("sqlite:///./skills.db") == "sqlite+aiosqlite:///./skills.db"
+    )
+    assert (
+        async_database_url("mysql+pymysql://user:pw@db/skills")
+        == "mysql+aiomysql://user:pw@db/skills"
+    )
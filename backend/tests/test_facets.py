@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.models.skill import Skill
+from app.services import facets_service
+from app.services.topic_service import replace_skill_topics
+
+
+def seed_skills():
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=i,
+                name=f"skill-{i}",
+                full_name=f"owner/skill-{i}",
+                html_url=f"https://github.com/owner/skill-{i}",
+                stars=i,
+                forks=0,
+                language="Python",
+                topics=topics,
+            )
+            for i, topics in enumerate(["mcp,cli", "mcp", "MCP,web, cli", ""], 1)
+        ]
+        db.add_all(skills)
+        db.flush()
+        replace_skill_topics(db, skills)
+        db.commit()
+
+
+def test_topics_facet(client):
+    seed_skills()
+
+    response = client.get("/api/facets/topics")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items == [
+        {"value": "mcp", "count": 3},
+        {"value": "cli", "count": 2},
+        {"value": "web", "count": 1},
+    ]
+
+
+def test_owners_fallback_counts_off_the_event_loop(client, monkeypatch):
+    seed_skills()
+    threads: list[int] = []
+    real = facets_service.list_top_owners
+
+    def recording(db, limit):
+        threads.append(threading.get_ident())
+        return real(db, limit)
+
+    monkeypatch.setattr(facets_service, "list_top_owners", recording)
+
+    response = client.get("/api/facets/owners")
+    assert response.status_code == 200
+    assert response.json()["items"][0] == {"value": "owner", "count": 4}
+
+    async def loop_thread() -> int:
+        return threading.get_ident()
+
+    async def run() -> tuple[int, list[tuple[str, int]]]:
+        async with AsyncSessionLocal() as db:
+            owners = await facets_service.list_top_owners_async(db, 5)
+        return await loop_thread(), owners
+
+    threads.clear()
+    loop_ident, owners = asyncio.run(run())
+    assert owners == [("owner", 4)]
+    assert threads and loop_ident not in threads
@@ -0,0 +1,268 @@
+import asyncio
+
+import fakeredis
+import httpx
+from app.core import redis_client
+from app.core.config import get_settings
+from app.core.database import SessionLocal, engine
+from app.models.skill import Skill, SkillTopic
+from app.services import github_service
+from sqlalchemy import event
+
+
+def make_repo(repo_id: int, topics: list[str], stars: int = 1) -> dict:
+    return {
+        "id": repo_id,
+        "name": f"repo-{repo_id}",
+        "full_name": f"owner/repo-{repo_id}",
+        "description": "A Claude Skill",
+        "html_url": f"https://github.com/owner/repo-{repo_id}",
+        "stargazers_count": stars,
+        "forks_count": 0,
+        "language": "Python",
+        "topics": topics,
+        "created_at": "2026-01-01T00:00:00Z",
+        "updated_at": "2026-01-02T00:00:00Z",
+        "pushed_at": "2026-01-03T00:00:00Z",
+    }
+
+
+def run_sync(monkeypatch, repos: list[dict]):
+    monkeypatch.setattr(github_service, "fetch_sync_repos", lambda _s: (repos, []))
+    with SessionLocal() as db:
+        return github_service.sync_github_skills(db, get_settings())
+
+
+def topic_rows() -> set[tuple[str, str]]:
+    with SessionLocal() as db:
+        rows = (
+            db.query(Skill.full_name, SkillTopic.topic)
+            .join(SkillTopic, SkillTopic.skill_id == Skill.id)
+            .all()
+        )
+    return {(row.full_name, row.topic) for row in rows}
+
+
+def test_sync_keeps_skill_topics_in_sync(monkeypatch):
+    run_sync(monkeypatch, [make_repo(1, ["mcp", "cli"]), make_repo(2, ["mcp"])])
+    assert topic_rows() == {
+        ("owner/repo-1", "mcp"),
+        ("owner/repo-1", "cli"),
+        ("owner/repo-2", "mcp"),
+    }
+
+    run_sync(monkeypatch, [make_repo(1, ["web"]), make_repo(2, ["mcp"])])
+    assert topic_rows() == {("owner/repo-1", "web"), ("owner/repo-2", "mcp")}
+
+
+def capture_statements(monkeypatch, repos: list[dict]) -> list[str]:
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run_sync(monkeypatch, repos)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def test_sync_skips_unchanged_repos(monkeypatch):
+    repos = [make_repo(i, ["mcp"], stars=i) for i in range(1, 6)]
+    report = run_sync(monkeypatch, repos)
+    assert (report.inserted, report.updated, report.unchanged) == (5, 0, 0)
+
+    statements = capture_statements(monkeypatch, repos)
+    # A single batched lookup and no writes for an unchanged catalog.
+    assert statements.count("SELECT") == 1
+    assert "UPDATE" not in statements
+    assert "INSERT" not in statements
+
+    repos[0] = make_repo(1, ["mcp"], stars=100)
+    statements = capture_statements(monkeypatch, repos)
+    assert statements.count("UPDATE") == 1
+
+    repos.append(make_repo(6, ["web"]))
+    report = run_sync(monkeypatch, repos)
+    assert report.as_dict() == {
+        "synced": 6,
+        "inserted": 1,
+        "updated": 0,
+        "unchanged": 5,
+    }
+    assert len(report.changed_skill_ids) == 1
+
+
+def search_transport(total: int, calls: list[dict], remaining: int = 5000):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        calls.append(params)
+        page, per_page = int(params["page"]), int(params["per_page"])
+        offset = 1000 if "created:>=" in params["q"] else 0
+        first = (page - 1) * per_page
+        items = [
+            make_repo(offset + i, [])
+            for i in range(first, min(total, first + per_page))
+        ]
+        return httpx.Response(
+            200,
+            json={"total_count": total, "items": items},
+            headers={"X-RateLimit-Remaining": str(remaining - len(calls))},
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_fetch_streams_concurrently():
+    settings = get_settings().model_copy(
+        update={
+            "github_search_per_page": 10,
+            "github_max_pages": 5,
+            "github_max_results": 35,
+            "github_newest_max_pages": 2,
+            "github_newest_max_results": 100,
+        }
+    )
+    calls: list[dict] = []
+    by_stars, by_newest = asyncio.run(
+        github_service._fetch_sync_streams(
+            settings, transport=search_transport(42, calls)
+        )
+    )
+
+    assert [repo["id"] for repo in by_stars] == list(range(35))
+    assert [repo["id"] for repo in by_newest] == list(range(1000, 1020))
+    # 4 pages cover max_results=35; the newest stream is capped at 2 pages.
+    assert len(calls) == 6
+
+
+def test_fetch_stops_at_rate_limit_buffer():
+    settings = get_settings().model_copy(
+        update={
+            "github_search_per_page": 10,
+            "github_max_pages": 10,
+            "github_max_results": 100,
+            "github_rate_limit_buffer": 2,
+            "github_sync_concurrency": 1,
+        }
+    )
+    calls: list[dict] = []
+    by_stars, _ = asyncio.run(
+        github_service._fetch_sync_streams(
+            settings,
+            include_newest=False,
+            transport=search_transport(100, calls, remaining=6),
+        )
+    )
+
+    # Remaining drops 5, 4, 3, 2; once it reaches the buffer the run stops.
+    assert len(calls) == 4
+    assert len(by_stars) == 40
+
+
+class MemoryPageCache:
+    def __init__(self):
+        self.entries: dict[str, tuple[str, dict]] = {}
+
+    async def get(self, params):
+        return self.entries.get(str(sorted(params.items())))
+
+    async def set(self, params, etag, payload):
+        self.entries[str(sorted(params.items()))] = (etag, payload)
+
+
+def test_search_page_cache_uses_shared_redis_client(monkeypatch):
+    cache = github_service.SearchPageCache(get_settings())
+    params = {"q": "skill", "page": 1}
+
+    redis_client.use_redis_client(fakeredis.FakeRedis(decode_responses=True))
+    try:
+        asyncio.run(cache.set(params, 'W/"1"', {"items": [{"id": 1}]}))
+        assert asyncio.run(cache.get(params)) == ('W/"1"', {"items": [{"id": 1}]})
+
+        # Breaker open: the cache reads as a miss instead of reconnecting.
+        monkeypatch.setattr(github_service, "get_redis_client", lambda _s=None: None)
+        assert asyncio.run(cache.get(params)) is None
+    finally:
+        redis_client.reset_redis_client()
+
+
+def test_fetch_reuses_cached_pages_on_304():
+    settings = get_settings().model_copy(
+        update={"github_search_per_page": 10, "github_max_results": 20}
+    )
+    statuses: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        etag = f'W/"page-{page}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = httpx.Response(304, headers={"ETag": etag})
+        else:
+            items = [make_repo((page - 1) * 10 + i, ["mcp"]) for i in range(10)]
+            response = httpx.Response(
+                200, json={"total_count": 20, "items": items}, headers={"ETag": etag}
+            )
+        statuses.append(response.status_code)
+        return response
+
+    cache = MemoryPageCache()
+
+    def fetch():
+        repos, _ = asyncio.run(
+            github_service._fetch_sync_streams(
+                settings,
+                include_newest=False,
+                transport=httpx.MockTransport(handler),
+                cache=cache,
+            )
+        )
+        return repos
+
+    first = fetch()
+    second = fetch()
+    assert statuses == [200, 200, 304, 304]
+    assert second == first
+    assert len(second) == 20
+    assert set(second[0]) == set(github_service.SYNC_REPO_FIELDS)
+
+
+def test_sync_selects_do_not_scale_with_updated_rows(monkeypatch):
+    repos = [make_repo(i, ["mcp"], stars=i) for i in range(1, 21)]
+    run_sync(monkeypatch, repos)
+
+    one = capture_statements(
+        monkeypatch, [make_repo(1, ["mcp"], stars=500), *repos[1:]]
+    )
+    every = capture_statements(
+        monkeypatch, [make_repo(i, ["mcp"], stars=1000 + i) for i in range(1, 21)]
+    )
+    assert "UPDATE" in every
+    # Batched lookup + batched load; no per-row reload after commit.
+    assert every.count("SELECT") == one.count("SELECT")
+
+
+def test_sync_endpoint_queues_the_post_sync_tasks(client, monkeypatch):
+    from app.api.routes import skills as skills_routes
+    from app.core import config
+    from app.core.celery_app import celery_app
+
+    settings = config.get_settings().model_copy(
+        update={"sync_api_enabled": True, "enable_translation": True}
+    )
+    sent: list[str] = []
+    monkeypatch.setattr(skills_routes, "get_settings", lambda: settings)
+    monkeypatch.setattr(
+        skills_routes,
+        "sync_github_skills",
+        lambda _db, _s: github_service.SyncReport(inserted=1, changed_skill_ids=[1]),
+    )
+    monkeypatch.setattr(
+        celery_app, "send_task", lambda name, *a, **k: sent.append(name)
+    )
+
+    response = client.post("/api/skills/sync")
+    assert response.status_code == 200
+    assert sent == ["tasks.related_refresh", "tasks.translate_descriptions"]
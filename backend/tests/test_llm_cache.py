@@ -0,0 +1,55 @@
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.llm_cache import LLMCacheEntry
+from app.services import llm_cache
+
+
+def test_llm_cache_hits_misses_and_versions():
+    settings = get_settings()
+    before = llm_cache.cache_stats()
+    with SessionLocal() as db:
+        assert llm_cache.get_cached(db, settings, "v1", "hello") is None
+        llm_cache.store(db, settings, "v1", "hello", "你好")
+
+        assert llm_cache.get_cached(db, settings, "v1", "hello") == "你好"
+        # A new prompt version is a separate key space.
+        assert llm_cache.get_cached(db, settings, "v2", "hello") is None
+        # Hit counts are buffered in process until flushed.
+        assert db.query(LLMCacheEntry).one().hits == 0
+        llm_cache.flush_hits(db)
+        assert db.query(LLMCacheEntry).one().hits == 1
+
+    after = llm_cache.cache_stats()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 2
+
+
+def test_llm_cache_evicts_least_recently_used():
+    settings = get_settings().model_copy(update={"llm_cache_max_entries": 2})
+    with SessionLocal() as db:
+        llm_cache.store(db, settings, "v1", "a", "A")
+        llm_cache.store(db, settings, "v1", "b", "B")
+        # Touch "a" so "b" becomes the least recently used entry.
+        assert llm_cache.get_cached(db, settings, "v1", "a") == "A"
+        llm_cache.store(db, settings, "v1", "c", "C")
+
+        cached = llm_cache.get_cached_many(db, settings, "v1", ["a", "b", "c"])
+    assert cached == {"a": "A", "c": "C"}
+
+
+def test_llm_cache_refresh_keeps_hits():
+    settings = get_settings()
+    with SessionLocal() as db:
+        llm_cache.store(db, settings, "v1", "hello", "hi")
+        assert llm_cache.get_cached(db, settings, "v1", "hello") == "hi"
+        llm_cache.flush_hits(db)
+        llm_cache.store(db, settings, "v1", "hello", "你好")
+
+        entry = db.query(LLMCacheEntry).one()
+        assert (entry.value, entry.hits) == ("你好", 1)
+
+
+def test_llm_cache_stats_requires_internal_token(client, internal_headers):
+    assert client.get("/api/stats/llm-cache").status_code == 403
+    response = client.get("/api/stats/llm-cache", headers=internal_headers)
+    assert response.status_code == 200
@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+from app.core.database import SessionLocal
+from app.main import create_app
+from app.models.skill import Skill
+from scripts.load_test import LoadDriver, Targets
+
+
+def test_driver_replays_mix_without_errors():
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=i,
+                name=f"skill-{i}",
+                full_name=f"owner{i % 2}/skill-{i}",
+                description="agent workflow",
+                html_url=f"https://github.com/owner{i % 2}/skill-{i}",
+                stars=i,
+                language="Python",
+                topics="mcp",
+            )
+            for i in range(1, 6)
+        ]
+        db.add_all(skills)
+        db.commit()
+        targets = Targets(
+            skills=[(skill.id, skill.full_name) for skill in skills],
+            topics=["mcp"],
+            languages=["python"],
+            owners=["owner0", "owner1"],
+        )
+
+    async def drive() -> LoadDriver:
+        transport = httpx.ASGITransport(app=create_app())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest"
+        ) as client:
+            driver = LoadDriver(client, targets, seed=1, think=0)
+            await driver.run(concurrency=2, duration=0.3, warmup=0)
+        return driver
+
+    driver = asyncio.run(drive())
+
+    assert "GET /api/skills" in driver.stats
+    assert "GET /api/skills/{owner}/{repo}/related" in driver.stats
+    assert all(stats.errors == 0 for stats in driver.stats.values())
+    summary = driver.stats["GET /api/skills"].summary(0.3)
+    assert summary["requests"] > 0
+    assert summary["p50_ms"] <= summary["p99_ms"]
@@ -0,0 +1,228 @@
+from datetime import UTC, date, datetime
+
+from app.core.config import get_settings
+from app.services import metrics_service
+
+
+class RecordingPipeline:
+    def __init__(self, commands: list[tuple]):
+        self.commands = commands
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, *args))
+
+    def execute(self):
+        self.commands.append(("execute",))
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.commands: list[tuple] = []
+
+    def pipeline(self, transaction=True):
+        return RecordingPipeline(self.commands)
+
+
+def test_buffer_aggregates_beacons_into_one_pipeline(monkeypatch):
+    fake = RecordingRedis()
+    monkeypatch.setattr(metrics_service, "get_redis_client", lambda _s: fake)
+    settings = get_settings().model_copy(
+        update={"metrics_flush_interval": 3600, "metrics_buffer_max_events": 4}
+    )
+    buffer = metrics_service.MetricsBuffer()
+
+    buffer.add(settings, "pv", "uv", "a")
+    buffer.add(settings, "pv", "uv", "a")
+    buffer.add(settings, "pv", "uv", "b")
+    buffer.add(settings, "skill:pv", "skill:uv", None)
+    buffer.add(settings, "pv", "uv", "c")  # over the cap: dropped
+    assert fake.commands == []
+
+    buffer.stop()
+    assert fake.commands.count(("execute",)) == 1
+    assert ("incrby", "pv", 3) in fake.commands
+    assert ("incrby", "skill:pv", 1) in fake.commands
+    pfadd = next(cmd for cmd in fake.commands if cmd[0] == "pfadd")
+    assert pfadd[1] == "uv" and set(pfadd[2:]) == {"a", "b"}
+    assert buffer.stats() == {
+        "buffered": 4,
+        "flushed": 4,
+        "dropped": 1,
+        "flushes": 1,
+        "pending": 0,
+    }
+
+
+def test_buffer_counts_events_lost_when_redis_is_down(monkeypatch):
+    monkeypatch.setattr(metrics_service, "get_redis_client", lambda _s: None)
+    settings = get_settings().model_copy(update={"metrics_flush_interval": 3600})
+    buffer = metrics_service.MetricsBuffer()
+
+    buffer.add(settings, "pv", "uv", "a")
+    buffer.stop()
+    assert buffer.stats()["dropped"] == 1
+
+
+class SetBackedHLL:
+    """Exact stand-in for the HyperLogLog commands get_uv uses."""
+
+    def __init__(self):
+        self.keys: dict[str, set[str]] = {}
+        self.merges = 0
+
+    def pfadd(self, key, *members):
+        self.keys.setdefault(key, set()).update(members)
+
+    def pfcount(self, *keys):
+        return len(set().union(*(self.keys.get(key, set()) for key in keys)))
+
+    def pfmerge(self, dest, *keys):
+        self.merges += 1
+        self.keys[dest] = set().union(*(self.keys.get(key, set()) for key in keys))
+
+    def exists(self, key):
+        return int(key in self.keys)
+
+    def expire(self, *_args):
+        pass
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+def test_uv_windows_merge_day_keys(monkeypatch):
+    fake = SetBackedHLL()
+    monkeypatch.setattr(metrics_service, "get_redis_client", lambda _s: fake)
+    monkeypatch.setattr(metrics_service, "_today", lambda: date(2026, 10, 17))
+    fake.pfadd("metrics:uv:20261017", "a", "b")
+    fake.pfadd("metrics:uv:20261015", "b", "c")
+    fake.pfadd("metrics:uv:20261001", "d")
+    fake.pfadd("metrics:skill:7:uv:20261016", "a")
+    settings = get_settings()
+
+    assert metrics_service.get_uv(settings, 1) == 2
+    assert metrics_service.get_uv(settings, 7) == 3
+    assert metrics_service.get_uv(settings, 30) == 4
+    assert metrics_service.get_uv(settings, 7, skill_id=7) == 1
+
+    # The merged past days are reused until the day changes.
+    merges = fake.merges
+    fake.pfadd("metrics:uv:20261017", "e")
+    assert metrics_service.get_uv(settings, 7) == 4
+    assert fake.merges == merges
+
+
+class ZSetRedis:
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0) + amount
+
+    def zunionstore(self, dest, weights):
+        merged: dict[str, float] = {}
+        for key, weight in weights.items():
+            for member, score in self.zsets.get(key, {}).items():
+                merged[member] = merged.get(member, 0) + score * weight
+        self.zsets[dest] = merged
+
+    def zrevrange(self, key, start, end, withscores=False):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda item: -item[1])
+        return ranked[start : end + 1]
+
+    def exists(self, key):
+        return int(key in self.zsets)
+
+    def expire(self, *_args):
+        pass
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+def test_trending_skills_decay_older_buckets(monkeypatch):
+    fake = ZSetRedis()
+    monkeypatch.setattr(metrics_service, "get_redis_client", lambda _s: fake)
+    now = datetime(2026, 10, 17, 12, tzinfo=UTC)
+    monkeypatch.setattr(metrics_service, "_now", lambda: now)
+    # Skill 1: 10 views six hours ago; skill 2: 6 views this hour.
+    fake.zincrby("metrics:skills:views:h:2026101706", 10, "1")
+    fake.zincrby("metrics:skills:views:h:2026101712", 6, "2")
+    fake.zincrby("metrics:skills:views:h:2026101612", 50, "3")  # outside 24h
+
+    ranked = metrics_service.get_trending_skills(get_settings(), "24h", 5)
+    assert ranked == [(2, 6.0), (1, 5.0)]
+    assert metrics_service.get_trending_skills(get_settings(), "bogus", 5) == []
+
+
+def test_skill_views_are_bucketed_through_the_buffer(monkeypatch):
+    fake = RecordingRedis()
+    monkeypatch.setattr(metrics_service, "get_redis_client", lambda _s: fake)
+    now = datetime(2026, 10, 17, 12, tzinfo=UTC)
+    monkeypatch.setattr(metrics_service, "_now", lambda: now)
+    monkeypatch.setattr(
+        metrics_service, "metrics_buffer", metrics_service.MetricsBuffer()
+    )
+    settings = get_settings().model_copy(update={"metrics_flush_interval": 3600})
+
+    metrics_service.track_skill_visit(settings, 7, "a")
+    metrics_service.track_skill_visit(settings, 7, "b")
+    metrics_service.metrics_buffer.stop()
+    assert ("zincrby", "metrics:skills:views:h:2026101712", 2, "7") in fake.commands
+    assert ("zincrby", "metrics:skills:views:d:20261017", 2, "7") in fake.commands
+
+
+def test_top_skills_endpoint_loads_ranked_skills(client, monkeypatch):
+    from app.api.routes import metrics as metrics_routes
+    from app.core.database import SessionLocal
+    from app.models.skill import Skill
+
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=i,
+                name=f"skill-{i}",
+                full_name=f"owner/skill-{i}",
+                html_url=f"https://github.com/owner/skill-{i}",
+            )
+            for i in (1, 2)
+        ]
+        db.add_all(skills)
+        db.commit()
+        ids = [skill.id for skill in skills]
+
+    ranked = [(ids[1], 4.0), (ids[0], 1.5)]
+    monkeypatch.setattr(
+        metrics_routes, "get_trending_skills", lambda _s, _w, _l: ranked
+    )
+    response = client.get("/api/metrics/skills/top?window=7d&limit=2")
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["window"] == "7d"
+    assert [(i["skill"]["full_name"], i["score"]) for i in payload["items"]] == [
+        ("owner/skill-2", 4.0),
+        ("owner/skill-1", 1.5),
+    ]
+
+
+def test_unbuffered_beacons_write_redis_from_the_threadpool(client, monkeypatch):
+    from app.api.routes import metrics as metrics_routes
+
+    settings = get_settings().model_copy(update={"metrics_buffer_enabled": False})
+    offloaded: list[str] = []
+
+    async def fake_run_in_threadpool(func, *args):
+        offloaded.append(func.__name__)
+
+    monkeypatch.setattr(metrics_routes, "get_settings", lambda: settings)
+    monkeypatch.setattr(metrics_routes, "run_in_threadpool", fake_run_in_threadpool)
+    assert client.post("/api/metrics/track").status_code == 200
+    assert client.post("/api/metrics/skills/1/track").status_code == 200
+    assert offloaded == ["track_visit", "track_skill_visit"]
@@ -0,0 +1,79 @@
+import logging
+
+from app.core import config
+from app.core.database import SessionLocal
+from app.core.query_stats import (
+    query_registry,
+    statement_fingerprint,
+    track_queries,
+)
+from app.main import create_app
+from app.models.skill import Skill
+from app.tasks.related_refresh import related_refresh
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    first = statement_fingerprint("SELECT * FROM skills WHERE id IN (1, 2, 3)")
+    second = statement_fingerprint("select *  from skills\nwhere id in (?)")
+    other = statement_fingerprint("SELECT * FROM skills WHERE name = 'x'")
+    assert first == second
+    assert first != other
+
+
+def test_track_queries_counts_statements():
+    with track_queries() as stats, SessionLocal() as db:
+        db.execute(select(func.count(Skill.id))).scalar()
+        db.execute(select(Skill.id).limit(1)).all()
+    assert stats.queries == 2
+    assert stats.total_ns > 0
+
+
+def test_request_headers_and_route_aggregate(monkeypatch, internal_headers):
+    monkeypatch.setenv("QUERY_STATS_HEADERS", "true")
+    config.get_settings.cache_clear()
+    try:
+        client = TestClient(create_app())
+        query_registry.reset()
+        response = client.get("/api/skills")
+    finally:
+        monkeypatch.delenv("QUERY_STATS_HEADERS")
+        config.get_settings.cache_clear()
+
+    assert response.status_code == 200
+    queries = int(response.headers["X-DB-Queries"])
+    assert queries > 0
+    assert float(response.headers["X-DB-Time"]) >= 0
+    aggregate = query_registry.snapshot()[("http", "GET /api/skills")]
+    assert aggregate.runs == 1
+    assert aggregate.queries == queries
+
+    body = client.get("/api/internal/metrics", headers=internal_headers).text
+    assert 'db_queries_total{kind="http",name="GET /api/skills"}' in body
+
+
+def test_celery_task_aggregate():
+    query_registry.reset()
+    related_refresh.delay()
+    aggregate = query_registry.snapshot()[("task", "tasks.related_refresh")]
+    assert aggregate.runs == 1
+    assert aggregate.queries > 0
+
+
+def test_slow_query_logged_with_fingerprint(monkeypatch, caplog):
+    monkeypatch.setenv("SLOW_QUERY_SECONDS", "0.000000001")
+    config.get_settings.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+            with SessionLocal() as db:
+                db.execute(select(Skill.id).where(Skill.stars > 5)).all()
+    finally:
+        monkeypatch.delenv("SLOW_QUERY_SECONDS")
+        config.get_settings.cache_clear()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(
+        message.startswith("Slow query ") and "FROM skills" in message
+        for message in messages
+    )
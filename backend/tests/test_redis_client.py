@@ -0,0 +1,95 @@
+import socket
+import threading
+
+import pytest
+import redis
+from app.core import redis_client
+from app.core.config import get_settings
+
+
+@pytest.fixture()
+def unreachable_settings():
+    redis_client.reset_redis_client()
+    yield get_settings().model_copy(
+        update={
+            "redis_url": "redis://127.0.0.1:1/0",
+            "redis_breaker_threshold": 2,
+            "redis_breaker_cooldown": 60.0,
+        }
+    )
+    redis_client.reset_redis_client()
+
+
+def test_client_is_shared_per_process(unreachable_settings):
+    first = redis_client.get_redis_client(unreachable_settings)
+    assert first is not None
+    assert redis_client.get_redis_client(unreachable_settings) is first
+
+
+def test_breaker_opens_after_repeated_connect_failures(unreachable_settings):
+    for _ in range(2):
+        client = redis_client.get_redis_client(unreachable_settings)
+        assert client is not None
+        with pytest.raises(redis.ConnectionError):
+            client.ping()
+
+    # Open: callers skip Redis instead of paying the connect timeout again.
+    assert redis_client.get_redis_client(unreachable_settings) is None
+
+
+def _silent_redis_server() -> socket.socket:
+    """Complete the client handshake, then never answer a command."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+
+    def handle(conn: socket.socket) -> None:
+        with conn:
+            try:
+                while data := conn.recv(4096):
+                    # redis-py sends CLIENT SETINFO while connecting.
+                    conn.sendall(b"+OK\r\n" * data.count(b"SETINFO"))
+            except OSError:
+                pass
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+
+def test_breaker_opens_after_repeated_command_timeouts():
+    server = _silent_redis_server()
+    host, port = server.getsockname()
+    settings = get_settings().model_copy(
+        update={
+            "redis_url": f"redis://{host}:{port}/0",
+            "redis_socket_timeout": 0.2,
+            "redis_health_check_interval": 0,
+            "redis_breaker_threshold": 2,
+        }
+    )
+    client, breaker = redis_client._build(settings)
+    try:
+        for _ in range(2):
+            with pytest.raises(redis.TimeoutError):
+                client.ping()
+        assert breaker.is_open
+    finally:
+        client.close()
+        server.close()
+
+
+def test_breaker_half_opens_after_cooldown():
+    breaker = redis_client.CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert breaker.is_open
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
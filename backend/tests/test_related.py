@@ -0,0 +1,98 @@
+import pytest
+from app.core.database import SessionLocal
+from app.models.skill import Skill, SkillRelated
+from app.services.skill_service import (
+    compute_related_graph,
+    get_related_skills,
+    score_related_matrix,
+)
+from app.services.topic_service import replace_skill_topics
+from app.tasks.related_refresh import related_refresh
+
+CATALOG = [
+    ("anthropic/pdf", "Python", "pdf,claude-skill", 50),
+    ("anthropic/xlsx", "Python", "excel,claude-skill", 40),
+    ("anthropic/docs", "TypeScript", "pdf,docs,claude-skill", 30),
+    ("someone/pdf-kit", "Python", "pdf", 20),
+    ("someone/web", "Go", "web", 10),
+    ("other/tool", "Python", "", 5),
+    ("lonely/thing", None, "", 1),
+]
+
+
+def seed_skills() -> dict[str, int]:
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=i,
+                name=full_name.split("/")[1],
+                full_name=full_name,
+                html_url=f"https://github.com/{full_name}",
+                stars=stars,
+                forks=0,
+                language=language,
+                topics=topics,
+            )
+            for i, (full_name, language, topics, stars) in enumerate(CATALOG, 1)
+        ]
+        db.add_all(skills)
+        db.flush()
+        replace_skill_topics(db, skills)
+        db.commit()
+        return {skill.full_name: skill.id for skill in skills}
+
+
+def test_batch_scores_match_live_scoring():
+    seed_skills()
+    with SessionLocal() as db:
+        skills = db.query(Skill).all()
+        graph = compute_related_graph(skills, top_n=10)
+        for skill in skills:
+            live = [item.id for item in get_related_skills(db, skill, limit=10)]
+            assert [related_id for related_id, _ in graph.get(skill.id, [])] == live
+
+    names = {skill.id: skill.full_name for skill in skills}
+    pdf_id = next(i for i, name in names.items() if name == "anthropic/pdf")
+    assert [(names[i], score) for i, score in graph[pdf_id][:3]] == [
+        ("anthropic/docs", 3 + 3 + 1),
+        ("anthropic/xlsx", 3 + 2 + 1),
+        ("someone/pdf-kit", 3 + 2),
+    ]
+
+
+def test_related_endpoint_uses_precomputed_graph(client):
+    ids = seed_skills()
+
+    # Not computed yet: falls back to live scoring.
+    response = client.get("/api/skills/anthropic/pdf/related?limit=2")
+    assert response.status_code == 200
+    live = [item["full_name"] for item in response.json()["items"]]
+    assert live == ["anthropic/docs", "anthropic/xlsx"]
+
+    assert related_refresh() > 0
+    with SessionLocal() as db:
+        stored = (
+            db.query(SkillRelated)
+            .filter(SkillRelated.skill_id == ids["anthropic/pdf"])
+            .order_by(SkillRelated.rank)
+            .all()
+        )
+    assert [row.related_id for row in stored[:2]] == [
+        ids["anthropic/docs"],
+        ids["anthropic/xlsx"],
+    ]
+
+    response = client.get("/api/skills/anthropic/pdf/related?limit=2")
+    assert [item["full_name"] for item in response.json()["items"]] == live
+
+
+def test_matrix_scorer_matches_batch_scorer():
+    pytest.importorskip("scipy")
+    seed_skills()
+    with SessionLocal() as db:
+        skills = db.query(Skill).all()
+    for top_n in (1, 3, 20):
+        # A tiny block size forces several row blocks.
+        assert score_related_matrix(
+            skills, top_n, block_cells=16
+        ) == compute_related_graph(skills, top_n)
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime
+
+import fakeredis
+import pytest
+from app.core import cache, redis_client
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+from pydantic import BaseModel
+
+
+@pytest.fixture()
+def cache_enabled(monkeypatch):
+    settings = get_settings().model_copy(update={"response_cache_enabled": True})
+    monkeypatch.setattr(cache, "get_settings", lambda: settings)
+    cache.clear_response_cache()
+    yield
+    cache.clear_response_cache()
+
+
+@pytest.fixture()
+def shared_version(monkeypatch):
+    """Catalog version in (fake) Redis, as every worker would see it."""
+    redis_client.use_redis_client(fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(cache, "_version_cache", None)
+    yield
+    redis_client.reset_redis_client()
+    cache._version_cache = None
+
+
+def test_read_skill_is_served_from_cache_until_catalog_changes(client, cache_enabled):
+    with SessionLocal() as db:
+        db.add(
+            Skill(
+                repo_id=1,
+                name="pdf",
+                full_name="anthropic/pdf",
+                description="before",
+                html_url="https://github.com/anthropic/pdf",
+            )
+        )
+        db.commit()
+
+    assert client.get("/api/skills/anthropic/pdf").json()["description"] == "before"
+
+    with SessionLocal() as db:
+        db.query(Skill).update({Skill.description: "after"})
+        db.commit()
+    assert client.get("/api/skills/anthropic/pdf").json()["description"] == "before"
+
+    cache.bump_catalog_version()
+    assert client.get("/api/skills/anthropic/pdf").json()["description"] == "after"
+    # Misses that raise (404) are not cached.
+    assert client.get("/api/skills/anthropic/missing").status_code == 404
+
+
+class Echo(BaseModel):
+    value: int
+
+
+def test_concurrent_misses_share_one_computation(cache_enabled):
+    calls = 0
+
+    @cache.response_cache(60, Echo)
+    def endpoint(value: int) -> Echo:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return Echo(value=value)
+
+    results: list[dict] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(endpoint(value=3)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert results == [{"value": 3}] * 8
+    assert endpoint(value=4) == {"value": 4}
+    assert calls == 2
+
+
+def test_async_endpoints_reach_redis_off_the_event_loop(cache_enabled, monkeypatch):
+    redis_threads: set[int] = set()
+    fake = fakeredis.FakeRedis(decode_responses=True)
+
+    class RecordingRedis:
+        def __getattr__(self, name):
+            redis_threads.add(threading.get_ident())
+            return getattr(fake, name)
+
+    monkeypatch.setattr(cache, "get_redis_client", lambda _s=None: RecordingRedis())
+    monkeypatch.setattr(cache, "_version_cache", None)
+
+    @cache.response_cache(60, Echo)
+    async def endpoint(value: int) -> Echo:
+        return Echo(value=value)
+
+    async def run() -> list[dict]:
+        first = await endpoint(value=5)
+        cache.clear_response_cache()  # force the Redis tier
+        return [first, await endpoint(value=5)]
+
+    assert asyncio.run(run()) == [{"value": 5}] * 2
+    assert redis_threads
+    assert threading.get_ident() not in redis_threads
+
+
+def test_skill_etag_answers_304_until_the_row_changes(client):
+    with SessionLocal() as db:
+        db.add(
+            Skill(
+                repo_id=1,
+                name="pdf",
+                full_name="anthropic/pdf",
+                html_url="https://github.com/anthropic/pdf",
+            )
+        )
+        db.commit()
+
+    first = client.get("/api/skills/anthropic/pdf")
+    tag = first.headers["ETag"]
+    assert tag.startswith('W/"')
+
+    cached = client.get("/api/skills/anthropic/pdf", headers={"If-None-Match": tag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["Cache-Control"] == "public, max-age=86400"
+
+    with SessionLocal() as db:
+        skill = db.query(Skill).one()
+        skill.content_updated_at = datetime(2026, 10, 17, tzinfo=UTC)
+        db.commit()
+    fresh = client.get("/api/skills/anthropic/pdf", headers={"If-None-Match": tag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != tag
+
+
+def test_cached_skill_etag_skips_the_database(
+    client, cache_enabled, shared_version, monkeypatch
+):
+    from app.api.routes import skills as skills_routes
+
+    with SessionLocal() as db:
+        db.add(
+            Skill(
+                repo_id=1,
+                name="pdf",
+                full_name="anthropic/pdf",
+                html_url="https://github.com/anthropic/pdf",
+            )
+        )
+        db.commit()
+    monkeypatch.setattr(skills_routes, "get_settings", cache.get_settings)
+    loads: list[str] = []
+    real_load = skills_routes.get_skill_by_full_name_async
+
+    async def counting_load(db, full_name):
+        loads.append(full_name)
+        return await real_load(db, full_name)
+
+    async def no_version_query(*_args):
+        raise AssertionError("per-skill version queried")
+
+    monkeypatch.setattr(skills_routes, "get_skill_by_full_name_async", counting_load)
+    monkeypatch.setattr(skills_routes, "get_skill_version_async", no_version_query)
+
+    tag = client.get("/api/skills/anthropic/pdf").headers["ETag"]
+    headers = {"If-None-Match": tag}
+    assert client.get("/api/skills/anthropic/pdf", headers=headers).status_code == 304
+    assert client.get("/api/skills/anthropic/pdf").status_code == 200
+    assert loads == ["anthropic/pdf"]
+
+    cache.bump_catalog_version()
+    assert client.get("/api/skills/anthropic/pdf", headers=headers).status_code == 200
+
+
+def test_facets_etag_follows_catalog_version(client, shared_version):
+    tag = client.get("/api/facets/languages").headers["ETag"]
+    headers = {"If-None-Match": tag}
+    assert client.get("/api/facets/languages", headers=headers).status_code == 304
+    # Another query string is another representation.
+    assert (
+        client.get("/api/facets/languages?limit=5", headers=headers).status_code == 200
+    )
+
+    cache.bump_catalog_version()
+    assert client.get("/api/facets/languages", headers=headers).status_code == 200
+
+
+def test_no_catalog_etag_without_shared_version(client, monkeypatch):
+    monkeypatch.setattr(cache, "get_redis_client", lambda _s=None: None)
+    monkeypatch.setattr(cache, "_version_cache", None)
+    monkeypatch.setattr(cache, "_bump_pending", False)
+
+    assert "ETag" not in client.get("/api/facets/languages").headers
+    assert cache.get_catalog_version() is None
+
+
+def test_bump_during_outage_is_replayed(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    fake.set(cache.CATALOG_VERSION_KEY, 5)
+    available = False
+    monkeypatch.setattr(
+        cache, "get_redis_client", lambda _s=None: fake if available else None
+    )
+    monkeypatch.setattr(cache, "_version_cache", None)
+    monkeypatch.setattr(cache, "_bump_pending", False)
+
+    cache.bump_catalog_version()
+    assert cache.get_catalog_version() is None
+
+    # Validators issued before the outage must not match afterwards.
+    available = True
+    cache._version_cache = None
+    assert cache.get_catalog_version() == "6"
@@ -0,0 +1,206 @@
+from datetime import UTC, datetime
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+from app.services.search_index import SkillSearchIndex
+from app.services.topic_service import replace_skill_topics
+
+
+def seed_skills():
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=1,
+                name="pdf-skill",
+                full_name="foo/pdf-skill",
+                description="Extract tables from PDF files",
+                description_zh="从 PDF 文件中提取表格的技能",
+                html_url="https://github.com/foo/pdf-skill",
+                stars=30,
+                forks=1,
+                language="Python",
+                topics="pdf,claude-skill",
+                repo_created_at=datetime(2026, 1, 1, tzinfo=UTC),
+            ),
+            Skill(
+                repo_id=2,
+                name="web-search",
+                full_name="bar/web-search",
+                description="Search the web from Claude",
+                description_zh="网页搜索技能",
+                html_url="https://github.com/bar/web-search",
+                stars=20,
+                forks=2,
+                language="TypeScript",
+                topics="search,claude-skill",
+                repo_created_at=datetime(2026, 2, 1, tzinfo=UTC),
+            ),
+            Skill(
+                repo_id=3,
+                name="pdf-tools",
+                full_name="bar/pdf-tools",
+                description=None,
+                html_url="https://github.com/bar/pdf-tools",
+                stars=20,
+                forks=0,
+                language=None,
+                topics="",
+            ),
+        ]
+        db.add_all(skills)
+        db.flush()
+        replace_skill_topics(db, skills)
+        db.commit()
+
+
+def build_index() -> SkillSearchIndex:
+    index = SkillSearchIndex()
+    with SessionLocal() as db:
+        index.build(db)
+    return index
+
+
+def full_names(ids: list[int]) -> list[str]:
+    with SessionLocal() as db:
+        by_id = {s.id: s.full_name for s in db.query(Skill).all()}
+    return [by_id[i] for i in ids]
+
+
+def test_index_matches_substrings_and_cjk():
+    seed_skills()
+    index = build_index()
+
+    total, ids = index.search("pdf")
+    assert total == 2
+    # Ties on stars fall back to id desc, mirroring the SQL ordering.
+    assert full_names(ids) == ["foo/pdf-skill", "bar/pdf-tools"]
+
+    total, ids = index.search("技能")
+    assert total == 2
+
+    total, ids = index.search("提取表格")
+    assert full_names(ids) == ["foo/pdf-skill"]
+
+    total, ids = index.search("eb")
+    assert full_names(ids) == ["bar/web-search"]
+
+    total, ids = index.search("pdf", owner="bar")
+    assert full_names(ids) == ["bar/pdf-tools"]
+
+    total, ids = index.search("skill", topic="search", sort="newest")
+    assert full_names(ids) == ["bar/web-search"]
+
+
+def test_index_refresh_picks_up_changes():
+    seed_skills()
+    index = build_index()
+
+    with SessionLocal() as db:
+        skill = db.query(Skill).filter(Skill.repo_id == 3).one()
+        skill.description = "Merge PDF documents"
+        db.commit()
+        index.refresh(db, [skill.id])
+
+    total, _ = index.search("merge")
+    assert total == 1
+
+
+def test_like_wildcards_match_literally_on_both_paths():
+    from app.services.skill_service import _search_with_sql
+
+    seed_skills()
+    index = build_index()
+    with SessionLocal() as db:
+        for query, expected in (("b_s", []), ("b%s", []), ("b-s", ["bar/web-search"])):
+            total, ids = index.search(query)
+            sql_total, rows = _search_with_sql(
+                db, query, None, None, None, "stars", 10, 0, None, "exact"
+            )
+            assert full_names(ids) == [row.full_name for row in rows] == expected
+            assert total == sql_total == len(expected)
+
+
+def test_poll_rebuilds_after_delete_and_insert():
+    seed_skills()
+    index = build_index()
+
+    with SessionLocal() as db:
+        # Same row count afterwards, different ids.
+        db.add(
+            Skill(
+                repo_id=4,
+                name="csv-tools",
+                full_name="baz/csv-tools",
+                html_url="https://github.com/baz/csv-tools",
+            )
+        )
+        db.flush()
+        db.query(Skill).filter(Skill.repo_id == 3).delete()
+        db.commit()
+        index.refresh(db)
+
+    assert full_names(index.search("pdf")[1]) == ["foo/pdf-skill"]
+    assert full_names(index.search("csv")[1]) == ["baz/csv-tools"]
+
+
+def test_search_endpoint_uses_index(client):
+    seed_skills()
+
+    response = client.get("/api/skills?q=%E6%8A%80%E8%83%BD&limit=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert [item["full_name"] for item in data["items"]] == ["foo/pdf-skill"]
+
+
+def test_ensure_fresh_never_waits_for_another_build():
+    seed_skills()
+    index = SkillSearchIndex()
+    settings = get_settings()
+
+    with SessionLocal() as db:
+        # A concurrent request holds the lock while building (possibly on the
+        # same event loop thread): report not-ready instead of blocking.
+        with index._refresh_lock:
+            assert index.ensure_fresh(db, settings) is False
+        assert index.ensure_fresh(db, settings) is True
+    assert index.built
+
+
+def test_async_search_does_blocking_work_off_the_event_loop(client, monkeypatch):
+    import asyncio
+
+    from app.services import search_index, skill_service
+
+    seed_skills()
+    search_index.reset_search_index()
+    on_loop: dict[str, bool] = {}
+
+    def record(name, func):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop[name] = True
+            except RuntimeError:
+                on_loop.setdefault(name, False)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(
+        SkillSearchIndex, "build", record("build", SkillSearchIndex.build)
+    )
+    for name in ("get_cached_count", "set_cached_count"):
+        monkeypatch.setattr(
+            skill_service, name, record(name, getattr(skill_service, name))
+        )
+
+    response = client.get("/api/skills?q=pdf&count=cached")
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    assert on_loop == {
+        "build": False,
+        "get_cached_count": False,
+        "set_cached_count": False,
+    }
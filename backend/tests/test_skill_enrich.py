@@ -0,0 +1,191 @@
+import fakeredis
+import httpx
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+from app.tasks import skill_enrich as task_module
+
+PAYLOAD = {
+    "summary_en": "Summary",
+    "summary_zh": "摘要",
+    "key_features_en": ["a", "b", "c"],
+    "key_features_zh": ["甲", "乙", "丙"],
+    "use_cases_en": ["x", "y", "z"],
+    "use_cases_zh": ["一", "二", "三"],
+    "seo_title_en": "Title",
+    "seo_title_zh": "标题",
+    "seo_description_en": "Description",
+    "seo_description_zh": "描述",
+}
+
+
+def enable_enrichment(monkeypatch, busy: set[str] | None = None, client=None, **update):
+    settings = get_settings().model_copy(
+        update={
+            "enable_scheduler": True,
+            "enable_enrichment": True,
+            "deepseek_api_key": "test-key",
+            **update,
+        }
+    )
+
+    def fake_lock(_settings, key, _ttl):
+        return None if key in (busy or set()) else (client, "t")
+
+    monkeypatch.setattr(task_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(task_module, "get_redis_client", lambda _s=None: client)
+    monkeypatch.setattr(task_module, "_acquire_lock", fake_lock)
+    monkeypatch.setattr(task_module, "_release_lock", lambda *_a: None)
+
+
+def seed(count: int) -> list[int]:
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=i,
+                name=f"skill-{i}",
+                full_name=f"owner/skill-{i}",
+                html_url=f"https://github.com/owner/skill-{i}",
+                stars=i,
+            )
+            for i in range(1, count + 1)
+        ]
+        db.add_all(skills)
+        db.commit()
+        return [skill.id for skill in skills]
+
+
+def enriched_names() -> set[str]:
+    with SessionLocal() as db:
+        return {
+            skill.full_name
+            for skill in db.query(Skill).filter(Skill.content_updated_at.isnot(None))
+        }
+
+
+def test_dispatcher_fans_out_and_subtasks_are_idempotent(monkeypatch):
+    ids = seed(4)
+    busy = {task_module.SKILL_LOCK_KEY.format(skill_id=ids[1])}
+    enable_enrichment(monkeypatch, busy)
+    calls: list[str] = []
+
+    def fake_generate(skill, _settings, _db, raise_http_errors=False):
+        calls.append(skill.full_name)
+        return None if skill.full_name == "owner/skill-3" else PAYLOAD
+
+    monkeypatch.setattr(task_module, "generate_enrichment", fake_generate)
+
+    assert task_module.skill_enrich() == 4
+    # skill-2 is locked by another worker and skill-3 produced no payload.
+    assert enriched_names() == {"owner/skill-1", "owner/skill-4"}
+
+    calls.clear()
+    assert task_module.enrich_one(ids[0]) is False
+    # skill-3 is backed off rather than retried on the next dispatch.
+    assert task_module.enrich_one(ids[2]) is False
+    assert calls == []
+    with SessionLocal() as db:
+        failed = db.get(Skill, ids[2])
+        assert failed.enrich_failures == 1
+        assert failed.enrich_retry_at is not None
+
+
+def test_enrich_one_retries_http_errors(monkeypatch):
+    (skill_id,) = seed(1)
+    enable_enrichment(monkeypatch)
+    attempts = 0
+
+    def flaky_generate(_skill, _settings, _db, raise_http_errors=False):
+        nonlocal attempts
+        attempts += 1
+        assert raise_http_errors
+        if attempts < 3:
+            raise httpx.ConnectError("deepseek unreachable")
+        return PAYLOAD
+
+    monkeypatch.setattr(task_module, "generate_enrichment", flaky_generate)
+
+    task_module.enrich_one.apply(args=[skill_id])
+    assert attempts == 3
+    assert enriched_names() == {"owner/skill-1"}
+
+
+def test_enrich_one_backs_off_permanent_http_errors(monkeypatch):
+    (skill_id,) = seed(1)
+    enable_enrichment(monkeypatch)
+    attempts = 0
+
+    def rejecting_generate(_skill, _settings, _db, raise_http_errors=False):
+        nonlocal attempts
+        attempts += 1
+        request = httpx.Request("POST", "https://deepseek.invalid")
+        response = httpx.Response(400, request=request)
+        raise httpx.HTTPStatusError("bad request", request=request, response=response)
+
+    monkeypatch.setattr(task_module, "generate_enrichment", rejecting_generate)
+
+    assert task_module.enrich_one.apply(args=[skill_id]).get() is False
+    assert attempts == 1
+    with SessionLocal() as db:
+        assert db.get(Skill, skill_id).enrich_failures == 1
+
+    # Backed-off skills are not dispatched until enrich_retry_at passes.
+    enqueued: list[int] = []
+    monkeypatch.setattr(
+        task_module.enrich_one,
+        "apply_async",
+        lambda args, **_k: enqueued.extend(args),
+    )
+    assert task_module.skill_enrich() == 0
+    assert enqueued == []
+
+
+def test_dispatcher_skips_queued_ids_and_caps_each_run(monkeypatch):
+    ids = seed(3)
+    client = fakeredis.FakeRedis(decode_responses=True)
+    enable_enrichment(monkeypatch, client=client, enrich_batch_size=2)
+    enqueued: list[int] = []
+    monkeypatch.setattr(
+        task_module.enrich_one,
+        "apply_async",
+        lambda args, **_k: enqueued.extend(args),
+    )
+
+    # Highest stars first; the third candidate waits for the next run.
+    assert task_module.skill_enrich() == 2
+    assert enqueued == [ids[2], ids[1]]
+    assert task_module.skill_enrich() == 1
+    assert enqueued[2:] == [ids[0]]
+    assert task_module.skill_enrich() == 0
+
+    # Finishing a task clears its marker, so a skill that still needs
+    # enrichment can be dispatched again.
+    monkeypatch.setattr(task_module, "generate_enrichment", lambda *_a, **_k: None)
+    monkeypatch.setattr(
+        task_module, "_needs_enrichment", lambda _now: Skill.id == ids[1]
+    )
+    task_module.enrich_one(ids[1])
+    assert task_module.skill_enrich() == 1
+    assert enqueued[3:] == [ids[1]]
+
+
+def test_enriched_skills_publish_once_per_delay(monkeypatch):
+    ids = seed(2)
+    client = fakeredis.FakeRedis(decode_responses=True)
+    enable_enrichment(monkeypatch, client=client)
+    monkeypatch.setattr(task_module, "generate_enrichment", lambda *_a, **_k: PAYLOAD)
+    published: list[int] = []
+    monkeypatch.setattr(
+        task_module.enrich_publish, "apply_async", lambda **_k: published.append(1)
+    )
+
+    assert task_module.enrich_one(ids[0]) is True
+    assert task_module.enrich_one(ids[1]) is True
+    assert published == [1]
+
+    bumps: list[int] = []
+    monkeypatch.setattr(task_module, "invalidate_counts", lambda _s: None)
+    monkeypatch.setattr(task_module, "bump_catalog_version", lambda _s: bumps.append(1))
+    task_module.enrich_publish()
+    assert bumps == [1]
+    assert client.get(task_module.PUBLISH_KEY) is None
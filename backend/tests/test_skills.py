@@ -2,38 +2,40 @@ from datetime import UTC, datetime
 
 from app.core.database import SessionLocal
 from app.models.skill import Skill
+from app.services.topic_service import replace_skill_topics
 
 
 def seed_skills():
     with SessionLocal() as db:
-        db.add_all(
-            [
-                Skill(
-                    repo_id=1,
-                    name="bar",
-                    full_name="foo/bar",
-                    description="A CLI tool",
-                    html_url="https://github.com/foo/bar",
-                    stars=10,
-                    forks=1,
-                    language="Python",
-                    topics="cli,tools",
-                    last_pushed_at=datetime(2026, 1, 1, tzinfo=UTC),
-                ),
-                Skill(
-                    repo_id=2,
-                    name="qux",
-                    full_name="baz/qux",
-                    description="Another project",
-                    html_url="https://github.com/baz/qux",
-                    stars=5,
-                    forks=2,
-                    language="Go",
-                    topics="web,cli",
-                    last_pushed_at=datetime(2026, 1, 2, tzinfo=UTC),
-                ),
-            ]
-        )
+        skills = [
+            Skill(
+                repo_id=1,
+                name="bar",
+                full_name="foo/bar",
+                description="A CLI tool",
+                html_url="https://github.com/foo/bar",
+                stars=10,
+                forks=1,
+                language="Python",
+                topics="cli,tools",
+                last_pushed_at=datetime(2026, 1, 1, tzinfo=UTC),
+            ),
+            Skill(
+                repo_id=2,
+                name="qux",
+                full_name="baz/qux",
+                description="Another project",
+                html_url="https://github.com/baz/qux",
+                stars=5,
+                forks=2,
+                language="Go",
+                topics="web,cli",
+                last_pushed_at=datetime(2026, 1, 2, tzinfo=UTC),
+            ),
+        ]
+        db.add_all(skills)
+        db.flush()
+        replace_skill_topics(db, skills)
         db.commit()
 
 
@@ -77,3 +79,86 @@ def test_skills_filters(client):
     data = response.json()
     assert data["total"] == 1
     assert data["items"][0]["full_name"] == "foo/bar"
+
+
+def seed_many_skills(count: int):
+    with SessionLocal() as db:
+        skills = [
+            Skill(
+                repo_id=100 + i,
+                name=f"skill-{i}",
+                full_name=f"owner{i % 3}/skill-{i}",
+                description="Paginated skill",
+                html_url=f"https://github.com/owner{i % 3}/skill-{i}",
+                # Duplicate star counts exercise the id tie-break.
+                stars=i // 2,
+                forks=0,
+                language="Python",
+                topics="cli",
+                repo_created_at=datetime(2026, 1, 1 + i // 2, tzinfo=UTC),
+            )
+            for i in range(count)
+        ]
+        db.add_all(skills)
+        db.flush()
+        replace_skill_topics(db, skills)
+        db.commit()
+
+
+def walk_cursor(client, params: str) -> list[str]:
+    names: list[str] = []
+    cursor = None
+    while True:
+        url = f"/api/skills?{params}&limit=3"
+        if cursor:
+            url += f"&cursor={cursor}"
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        names.extend(item["full_name"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            return names
+
+
+def test_skills_cursor_pagination(client):
+    seed_many_skills(10)
+
+    for params in ("sort=stars", "sort=newest", "sort=stars&q=paginated"):
+        expected = client.get(f"/api/skills?{params}&limit=100").json()
+        assert expected["next_cursor"] is None
+        walked = walk_cursor(client, params)
+        assert walked == [item["full_name"] for item in expected["items"]]
+        assert len(walked) == 10
+
+
+def test_skills_invalid_cursor(client):
+    response = client.get("/api/skills?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+    # A cursor issued for one sort order is rejected for another.
+    seed_many_skills(3)
+    cursor = client.get("/api/skills?limit=1&sort=stars").json()["next_cursor"]
+    response = client.get(f"/api/skills?sort=newest&cursor={cursor}")
+    assert response.status_code == 400
+
+
+def test_skills_count_strategies(client):
+    seed_many_skills(5)
+
+    response = client.get("/api/skills?limit=2&count=none")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert data["has_more"] is True
+    assert len(data["items"]) == 2
+
+    response = client.get("/api/skills?limit=5&count=none")
+    assert response.json()["has_more"] is False
+
+    # Falls back to an exact count when the shared cache is unavailable.
+    response = client.get("/api/skills?limit=2&count=cached&topic=cli")
+    assert response.json()["total"] == 5
+
+    response = client.get("/api/skills?count=approximate")
+    assert response.status_code == 422
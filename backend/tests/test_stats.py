@@ -0,0 +1,32 @@
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+
+
+def test_coverage_counts_filled_columns(client):
+    with SessionLocal() as db:
+        db.add_all(
+            [
+                Skill(
+                    repo_id=i,
+                    name=f"skill-{i}",
+                    full_name=f"owner/skill-{i}",
+                    html_url=f"https://github.com/owner/skill-{i}",
+                    description_zh=zh,
+                    summary_zh="摘要" if i == 1 else None,
+                )
+                for i, zh in ((1, "描述"), (2, ""), (3, None), (4, "描述"))
+            ]
+        )
+        db.commit()
+
+    response = client.get("/api/stats/coverage")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 4,
+        "description_zh": 2,
+        "summary_zh": 1,
+        "seo_title_zh": 0,
+        "description_zh_pct": 50.0,
+        "summary_zh_pct": 25.0,
+        "seo_title_zh_pct": 0.0,
+    }
@@ -0,0 +1,49 @@
+from app.api import deps
+from app.core import config
+from app.middleware.timing import LatencyHistogram, latency_registry
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(3_000_000)  # 3 ms -> (2.5 ms, 5 ms] bucket
+    for _ in range(10):
+        histogram.observe(400_000_000)  # 400 ms -> (250 ms, 500 ms] bucket
+
+    assert histogram.count == 100
+    assert 0.0025 < histogram.quantile(0.5) <= 0.005
+    assert 0.25 < histogram.quantile(0.95) <= 0.5
+    assert 0.25 < histogram.quantile(0.99) <= 0.5
+    assert LatencyHistogram().quantile(0.99) == 0.0
+
+
+def test_requests_recorded_by_route_template(client, internal_headers):
+    latency_registry.reset()
+    response = client.get("/api/skills/acme/missing")
+    assert response.status_code == 404
+    assert "X-Process-Time" in response.headers
+    client.get("/api/no-such-route")
+
+    body = client.get("/api/internal/metrics", headers=internal_headers).text
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/api/skills/{owner}/{repo}"} 1'
+    ) in body
+    assert 'route="<unmatched>"' in body
+    assert 'quantile="0.99"' in body
+    assert "acme/missing" not in body
+
+
+def test_internal_metrics_token(client, internal_headers, monkeypatch):
+    assert client.get("/api/internal/metrics").status_code == 403
+    wrong = {"Authorization": "Bearer wrong"}
+    assert client.get("/api/internal/metrics", headers=wrong).status_code == 403
+    response = client.get("/api/internal/metrics", headers=internal_headers)
+    assert response.status_code == 200
+
+    # Unset token: denied rather than public.
+    unset = config.get_settings().model_copy(update={"internal_metrics_token": None})
+    monkeypatch.setattr(deps, "get_settings", lambda: unset)
+    assert (
+        client.get("/api/internal/metrics", headers=internal_headers).status_code == 403
+    )
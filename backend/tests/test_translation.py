@@ -0,0 +1,159 @@
+import json
+
+import httpx
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.skill import Skill
+from app.services import llm_cache, translation_service
+
+
+def translation_settings(**overrides):
+    return get_settings().model_copy(
+        update={
+            "enable_translation": True,
+            "deepseek_api_key": "test-key",
+            "translation_requests_per_minute": 0,
+            **overrides,
+        }
+    )
+
+
+def deepseek_transport(batches: list[dict]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        numbered = json.loads(body["messages"][1]["content"])
+        batches.append(numbered)
+        reply = {key: f"zh:{value}" for key, value in numbered.items()}
+        return httpx.Response(
+            200,
+            json={"choices": [{"message": {"content": json.dumps(reply)}}]},
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_translate_many_batches_dedupes_and_caches():
+    settings = translation_settings(translation_batch_size=2)
+    batches: list[dict] = []
+    transport = deepseek_transport(batches)
+
+    texts = ["alpha", "beta", "alpha", "gamma", ""]
+    with SessionLocal() as db:
+        result = translation_service.translate_many_to_zh(
+            texts, settings, db=db, transport=transport
+        )
+        assert result == {"alpha": "zh:alpha", "beta": "zh:beta", "gamma": "zh:gamma"}
+        # Three unique texts in batches of two, numbered from 1 in each request.
+        assert batches == [{"1": "alpha", "2": "beta"}, {"1": "gamma"}]
+
+        result = translation_service.translate_many_to_zh(
+            ["gamma", "delta"], settings, db=db, transport=transport
+        )
+    assert result == {"gamma": "zh:gamma", "delta": "zh:delta"}
+    assert batches[-1] == {"1": "delta"}
+
+
+def test_batch_and_single_prompts_use_separate_cache_versions():
+    settings = translation_settings()
+    with SessionLocal() as db:
+        translation_service.translate_many_to_zh(
+            ["alpha"], settings, db=db, transport=deepseek_transport([])
+        )
+        assert (
+            llm_cache.get_cached(
+                db,
+                settings,
+                translation_service.BATCH_TRANSLATION_PROMPT_VERSION,
+                "alpha",
+            )
+            == "zh:alpha"
+        )
+        assert (
+            llm_cache.get_cached(
+                db, settings, translation_service.TRANSLATION_PROMPT_VERSION, "alpha"
+            )
+            is None
+        )
+
+
+def make_skill(repo_id: int, description: str, description_zh: str | None = None):
+    return Skill(
+        repo_id=repo_id,
+        name=f"skill-{repo_id}",
+        full_name=f"owner/skill-{repo_id}",
+        description=description,
+        description_zh=description_zh,
+        html_url=f"https://github.com/owner/skill-{repo_id}",
+    )
+
+
+def test_translate_pending_descriptions_fills_missing_rows():
+    batches: list[dict] = []
+    with SessionLocal() as db:
+        db.add_all(
+            [
+                make_skill(1, "shared"),
+                make_skill(2, "shared"),
+                make_skill(3, "done", "已翻译"),
+            ]
+        )
+        db.commit()
+
+        updated = translation_service.translate_pending_descriptions(
+            db, translation_settings(), transport=deepseek_transport(batches)
+        )
+        assert len(updated) == 2
+        assert batches == [{"1": "shared"}]
+        values = {
+            skill.full_name: skill.description_zh for skill in db.query(Skill).all()
+        }
+    assert values == {
+        "owner/skill-1": "zh:shared",
+        "owner/skill-2": "zh:shared",
+        "owner/skill-3": "已翻译",
+    }
+
+
+def test_refused_descriptions_back_off_instead_of_starving_the_window():
+    def refusing_transport(requests: list[dict]):
+        def handler(request: httpx.Request) -> httpx.Response:
+            numbered = json.loads(json.loads(request.content)["messages"][1]["content"])
+            requests.append(numbered)
+            reply = {k: f"zh:{v}" for k, v in numbered.items() if v != "poison"}
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": json.dumps(reply)}}]}
+            )
+
+        return httpx.MockTransport(handler)
+
+    settings = translation_settings(translation_backlog_limit=1)
+    requests: list[dict] = []
+    with SessionLocal() as db:
+        poison, other = make_skill(1, "poison"), make_skill(2, "fine")
+        poison.stars, other.stars = 10, 1
+        db.add_all([poison, other])
+        db.commit()
+
+        for _ in range(2):
+            translation_service.translate_pending_descriptions(
+                db, settings, transport=refusing_transport(requests)
+            )
+        assert requests == [{"1": "poison"}, {"1": "fine"}]
+        db.refresh(poison)
+        assert poison.translation_failures == 1
+        assert poison.translation_retry_at is not None
+        assert other.description_zh == "zh:fine"
+
+
+def test_outages_do_not_back_off_rows():
+    def down(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    with SessionLocal() as db:
+        db.add(make_skill(1, "text"))
+        db.commit()
+        translation_service.translate_pending_descriptions(
+            db, translation_settings(), transport=httpx.MockTransport(down)
+        )
+        skill = db.query(Skill).one()
+        assert (skill.translation_failures, skill.translation_retry_at) == (0, None)
@@ -186,7 +186,7 @@ export default async function LanguageFacetPage({ params, searchParams }: PagePr
       filters={{ language }}
       initialQuery={initialQuery}
       initialSkills={data.items}
-      initialTotal={data.total}
+      initialTotal={data.total ?? data.items.length}
       initialOffset={initialOffset}
     />
   );
@@ -128,7 +128,7 @@ export default async function LatestPage({ params, searchParams }: PageProps) {
     <LatestPageClient
       lang={lang}
       initialSkills={data.items}
-      initialTotal={data.total}
+      initialTotal={data.total ?? data.items.length}
       initialOffset={offset}
     />
   );
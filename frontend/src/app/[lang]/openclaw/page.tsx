@@ -148,7 +148,7 @@ export default async function OpenClawPage({ params, searchParams }: PageProps)
       lang={lang}
       initialQuery={initialQuery}
       initialSkills={data.items}
-      initialTotal={data.total}
+      initialTotal={data.total ?? data.items.length}
       initialOffset={initialOffset}
     />
   );
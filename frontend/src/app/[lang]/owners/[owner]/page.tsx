@@ -167,7 +167,7 @@ export default async function OwnerPage({ params, searchParams }: PageProps) {
       filters={{ owner }}
       initialQuery={initialQuery}
       initialSkills={data.items}
-      initialTotal={data.total}
+      initialTotal={data.total ?? data.items.length}
       initialOffset={initialOffset}
     />
   );
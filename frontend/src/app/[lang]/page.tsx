@@ -140,7 +140,7 @@ export default async function LanguageHomePage({ params, searchParams }: PagePro
       lang={lang}
       initialQuery={initialQuery}
       initialSkills={data.items}
-      initialTotal={data.total}
+      initialTotal={data.total ?? data.items.length}
       initialOffset={initialOffset}
       hotTopics={topicsData.items.map((t) => t.value)}
       popularLanguages={languagesData.items.map((l) => l.value)}
@@ -167,7 +167,7 @@ export default async function TopicPage({ params, searchParams }: PageProps) {
       filters={{ topic }}
       initialQuery={initialQuery}
       initialSkills={data.items}
-      initialTotal={data.total}
+      initialTotal={data.total ?? data.items.length}
       initialOffset={initialOffset}
     />
   );
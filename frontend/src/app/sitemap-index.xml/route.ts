@@ -7,7 +7,7 @@ const REVALIDATE_SECONDS = 60 * 60;
 const SKILLS_PER_SITEMAP = 100;
 
 type SkillListResponse = {
-  total: number;
+  total: number | null;
   items: unknown[];
 };
 
@@ -15,17 +15,21 @@ function toDateStamp(value: Date): string {
   return value.toISOString().slice(0, 10);
 }
 
+// One cheap call for the total; the page routes resolve their own cursors,
+// so the published URLs are stable page numbers.
 async function fetchTotalSkills(): Promise<number> {
   const base = getApiBase();
   const trimmedBase = base.endsWith("/") ? base.slice(0, -1) : base;
-  const url = `${trimmedBase}/skills?limit=1&offset=0`;
+  const url = `${trimmedBase}/skills?limit=1&count=cached`;
 
   const res = await fetch(url, { next: { revalidate: REVALIDATE_SECONDS } });
   if (!res.ok) {
     return 0;
   }
   const data = (await res.json()) as SkillListResponse;
-  return Number.isFinite(data.total) ? data.total : 0;
+  return typeof data.total === "number" && Number.isFinite(data.total)
+    ? data.total
+    : 0;
 }
 
 
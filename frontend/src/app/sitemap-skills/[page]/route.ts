@@ -8,6 +8,26 @@ const REVALIDATE_SECONDS = 60 * 60;
 // Keep in sync with backend API max limit (FastAPI validation).
 const SKILLS_PER_SITEMAP = 100;
 const LANGS = ["zh", "en"] as const;
+// Creation order: unlike stars it never moves, so page boundaries only shift
+// when skills are added or removed.
+const SITEMAP_SORT = "newest";
+
+// Page number -> keyset cursor that starts it, learned from the previous
+// page's next_cursor. Crawlers walk the pages in order, so every page after
+// the first usually seeks instead of paying a deep offset.
+const pageCursors = new Map<number, { cursor: string; expiresAt: number }>();
+
+function knownCursor(page: number): string | null {
+  const entry = pageCursors.get(page);
+  if (!entry) {
+    return null;
+  }
+  if (entry.expiresAt < Date.now()) {
+    pageCursors.delete(page);
+    return null;
+  }
+  return entry.cursor;
+}
 
 function toDateStamp(value: Date): string {
   return value.toISOString().slice(0, 10);
@@ -65,10 +85,20 @@ export async function GET(
     return new Response("Not found", { status: 404 });
   }
 
-  const offset = (page - 1) * SKILLS_PER_SITEMAP;
+  const cursor = page > 1 ? knownCursor(page) : null;
+  const params = new URLSearchParams({
+    limit: String(SKILLS_PER_SITEMAP),
+    sort: SITEMAP_SORT,
+    count: "none",
+  });
+  if (cursor) {
+    params.set("cursor", cursor);
+  } else {
+    params.set("offset", String((page - 1) * SKILLS_PER_SITEMAP));
+  }
   const base = getApiBase();
   const trimmedBase = base.endsWith("/") ? base.slice(0, -1) : base;
-  const url = `${trimmedBase}/skills?limit=${SKILLS_PER_SITEMAP}&offset=${offset}`;
+  const url = `${trimmedBase}/skills?${params.toString()}`;
 
   const res = await fetch(url, { next: { revalidate: REVALIDATE_SECONDS } });
   if (!res.ok) {
@@ -80,6 +110,12 @@ export async function GET(
   if (items.length === 0) {
     return new Response("Not found", { status: 404 });
   }
+  if (data.next_cursor) {
+    pageCursors.set(page + 1, {
+      cursor: data.next_cursor,
+      expiresAt: Date.now() + REVALIDATE_SECONDS * 1000,
+    });
+  }
 
   const today = toDateStamp(new Date());
   const urls: UrlEntry[] = [];
@@ -9,7 +9,7 @@ const REVALIDATE_SECONDS = 60 * 60;
 const SKILLS_PER_SITEMAP = 100;
 
 type SkillListResponse = {
-  total: number;
+  total: number | null;
   items: unknown[];
 };
 
@@ -27,7 +27,9 @@ async function fetchTotalSkills(): Promise<number> {
     return 0;
   }
   const data = (await res.json()) as SkillListResponse;
-  return Number.isFinite(data.total) ? data.total : 0;
+  return typeof data.total === "number" && Number.isFinite(data.total)
+    ? data.total
+    : 0;
 }
 
 
@@ -17,6 +17,7 @@ import {
 import { getSiteOrigin } from "@/lib/site";
 import { toSnippet } from "@/lib/text";
 import { getVisitorId } from "@/lib/visitor";
+import { resolveTotal } from "@/lib/skills";
 import type { Skill } from "@/types/skill";
 
 const PAGE_SIZE = 24;
@@ -90,8 +91,9 @@ export function FacetPageClient({
         ...filters,
         limit: PAGE_SIZE,
         offset: nextOffset,
+        count: append ? "cached" : undefined,
       });
-      setTotal(data.total);
+      setTotal((prev) => resolveTotal(data, prev, nextOffset));
       setOffset(nextOffset);
       if (append) {
         setSkills((prev) => [...prev, ...data.items]);
@@ -19,6 +19,7 @@ import {
 import { normalizeClaudeSkill, toSnippet } from "@/lib/text";
 import { getVisitorId } from "@/lib/visitor";
 import { getSiteOrigin } from "@/lib/site";
+import { resolveTotal } from "@/lib/skills";
 import { Skill } from "@/types/skill";
 
 const PAGE_SIZE = 24;
@@ -91,8 +92,9 @@ export function HomePageClient({
         const data = await fetchSkills(value, {
           limit: PAGE_SIZE,
           offset: nextOffset,
+          count: append ? "cached" : undefined,
         });
-        setTotal(data.total);
+        setTotal((prev) => resolveTotal(data, prev, nextOffset));
         setOffset(nextOffset);
         if (append) {
           setSkills((prev) => [...prev, ...data.items]);
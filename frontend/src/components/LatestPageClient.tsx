@@ -17,6 +17,7 @@ import {
 import { normalizeClaudeSkill, toSnippet } from "@/lib/text";
 import { getVisitorId } from "@/lib/visitor";
 import { getSiteOrigin } from "@/lib/site";
+import { resolveTotal } from "@/lib/skills";
 import { Skill } from "@/types/skill";
 
 const PAGE_SIZE = 24;
@@ -75,8 +76,9 @@ export function LatestPageClient({
         limit: PAGE_SIZE,
         offset: nextOffset,
         sort: "newest",
+        count: "cached",
       });
-      setTotal(data.total);
+      setTotal((prev) => resolveTotal(data, prev, nextOffset));
       setOffset(nextOffset);
       setSkills((prev) => [...prev, ...data.items]);
     } catch (err) {
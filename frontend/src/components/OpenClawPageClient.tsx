@@ -17,6 +17,7 @@ import {
 import { toSnippet } from "@/lib/text";
 import { getVisitorId } from "@/lib/visitor";
 import { getSiteOrigin } from "@/lib/site";
+import { resolveTotal } from "@/lib/skills";
 import { Skill } from "@/types/skill";
 
 const PAGE_SIZE = 24;
@@ -86,8 +87,9 @@ export function OpenClawPageClient({
         const data = await fetchSkills(combinedQuery, {
           limit: PAGE_SIZE,
           offset: nextOffset,
+          count: append ? "cached" : undefined,
         });
-        setTotal(data.total);
+        setTotal((prev) => resolveTotal(data, prev, nextOffset));
         setOffset(nextOffset);
         if (append) {
           setSkills((prev) => [...prev, ...data.items]);
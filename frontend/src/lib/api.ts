@@ -6,6 +6,9 @@ export async function fetchSkills(
   options: {
     limit?: number;
     offset?: number;
+    cursor?: string;
+    // "cached" reuses a server-side total; appended pages already know it.
+    count?: "exact" | "cached" | "none";
     topic?: string;
     language?: string;
     owner?: string;
@@ -36,6 +39,12 @@ export async function fetchSkills(
   if (options.offset !== undefined) {
     params.set("offset", String(options.offset));
   }
+  if (options.cursor) {
+    params.set("cursor", options.cursor);
+  }
+  if (options.count) {
+    params.set("count", options.count);
+  }
   const qs = params.toString();
   const url = `${trimmedBase}/skills${qs ? `?${qs}` : ""}`;
 
@@ -1,4 +1,4 @@
-import { Skill } from "@/types/skill";
+import { Skill, SkillListResponse } from "@/types/skill";
 
 export function getSkillDetailPath(skill: Skill): string {
   if (!skill.full_name) {
@@ -10,3 +10,20 @@ export function getSkillDetailPath(skill: Skill): string {
   }
   return `/skills/${encodeURIComponent(owner)}/${encodeURIComponent(repo)}`;
 }
+
+/**
+ * Total to show after loading a page. Only `count=none` makes the API return
+ * `total: null` (`count=cached` counts on a miss); keep the last known total
+ * then, but never report fewer skills than are already loaded.
+ */
+export function resolveTotal(
+  data: SkillListResponse,
+  previous: number,
+  offset: number,
+): number {
+  if (data.total !== null) {
+    return data.total;
+  }
+  const loaded = offset + data.items.length;
+  return Math.max(previous, data.has_more ? loaded + 1 : loaded);
+}
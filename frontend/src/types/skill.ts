@@ -28,6 +28,9 @@ export interface Skill {
 }
 
 export interface SkillListResponse {
-  total: number;
+  // null only when the request used count=none.
+  total: number | null;
   items: Skill[];
+  has_more?: boolean;
+  next_cursor?: string | null;
 }